@@ -0,0 +1,5 @@
+"""
+Пакет, содержащий бенчмарки горячих
+участков кода. Запускаются из каталога backend,
+например: python -m benchmarks.bench_cache_codecs
+"""
@@ -0,0 +1,45 @@
+"""
+Бенчмарк кодеков кэша: время сериализации,
+десериализации и размер записи на страницах задач
+"""
+import timeit
+from functools import partial
+
+from benchmarks.pages import make_tasks_page
+from user.analytic.clients.cache_codecs import (
+    CacheSerializer, PickleCodec, JsonCodec, MsgpackCodec, ZstdCompressor,
+)
+
+SERIALIZERS = {
+    "pickle": CacheSerializer(PickleCodec()),
+    "json": CacheSerializer(JsonCodec()),
+    "msgpack": CacheSerializer(MsgpackCodec()),
+    "pickle+zstd": CacheSerializer(PickleCodec(), ZstdCompressor()),
+    "json+zstd": CacheSerializer(JsonCodec(), ZstdCompressor()),
+    "msgpack+zstd": CacheSerializer(MsgpackCodec(), ZstdCompressor()),
+}
+
+
+def run(page_sizes: tuple[int, ...] = (50, 1000), number: int = 200) -> None:
+    """
+    Функция запуска бенчмарка
+
+    Args:
+        page_sizes: Размеры страниц задач
+        number: Количество повторов каждого замера
+    """
+    for size in page_sizes:
+        # Запись кэша - пара из времени вычисления и страницы
+        entry = (1_700_000_000.0, make_tasks_page(size=size))
+        print(f"page of {size} tasks")
+        print(f"{'codec':<14}{'encode, us':>12}{'decode, us':>12}{'bytes':>10}")
+        for name, serializer in SERIALIZERS.items():
+            data = serializer.dumps(entry)
+            encode = timeit.timeit(partial(serializer.dumps, entry), number=number) / number
+            decode = timeit.timeit(partial(serializer.loads, data), number=number) / number
+            print(f"{name:<14}{encode * 1e6:>12.1f}{decode * 1e6:>12.1f}{len(data):>10}")
+        print()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,62 @@
+"""
+Бенчмарк разбора страниц задач YouGile API:
+создание схем на каждый вызов, закэшированные схемы,
+валидация из байт и облегченные записи
+"""
+import timeit
+from typing import Any, Callable
+
+import orjson
+from pydantic import BaseModel
+
+from benchmarks.pages import make_tasks_page
+from user.analytic.clients.yougile_client.schemas import (
+    Paging, Task, TaskRecord, paginated, parse_page, parse_trusted_page,
+)
+
+
+def paginated_per_call(schema: type) -> type:
+    """Функция, создающая схему страницы на каждый вызов, как до кэширования"""
+
+    class PaginatedSchema(BaseModel):
+        """Схема контейнера пагинации"""
+        paging: Paging
+        content: list[schema]
+
+    return PaginatedSchema
+
+
+def get_cases(raw: bytes) -> dict[str, Callable[[], Any]]:
+    """
+    Функция, собирающая замеры разбора одной страницы
+
+    Args:
+        raw: Тело ответа со страницей задач
+    """
+    return {
+        "schema per call": lambda: paginated_per_call(Task)(**orjson.loads(raw)),
+        "cached schema": lambda: paginated(Task)(**orjson.loads(raw)),
+        "validate json": lambda: parse_page(Task, raw),
+        "trusted records": lambda: parse_trusted_page(TaskRecord, orjson.loads(raw)),
+    }
+
+
+def run(page_sizes: tuple[int, ...] = (50, 1000), number: int = 100) -> None:
+    """
+    Функция запуска бенчмарка
+
+    Args:
+        page_sizes: Размеры страниц задач
+        number: Количество повторов каждого замера
+    """
+    for size in page_sizes:
+        raw = orjson.dumps(make_tasks_page(size=size))
+        print(f"page of {size} tasks")
+        for name, case in get_cases(raw).items():
+            elapsed = timeit.timeit(case, number=number) / number
+            print(f"{name:<18}{elapsed * 1e6:>12.1f} us")
+        print()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+"""
+Модуль, генерирующий правдоподобные
+страницы ответов YouGile API
+"""
+import random
+import uuid
+from typing import Any
+
+
+def make_task(rng: random.Random, employers: list[str]) -> dict[str, Any]:
+    """
+    Функция генерации задачи в формате YouGile API
+
+    Args:
+        rng: Генератор случайных чисел
+        employers: Идентификаторы сотрудников, которые могут быть подписаны на задачу
+    """
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "title": f"Задача #{rng.randint(1, 100_000)}: подготовить отчет по проекту",
+        "timestamp": rng.randint(1_600_000_000_000, 1_700_000_000_000),
+        "columnId": str(uuid.UUID(int=rng.getrandbits(128))),
+        "description": "<p>Описание задачи с разметкой и ссылками</p>" * rng.randint(0, 3),
+        "archived": rng.random() < 0.1,
+        "completed": rng.random() < 0.5,
+        "subtasks": [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(rng.randint(0, 3))],
+        "assigned": rng.sample(employers, rng.randint(0, 3)),
+        "createdBy": rng.choice(employers),
+        "deadline": {
+            "deadline": rng.randint(1_700_000_000_000, 1_800_000_000_000),
+            "withTime": True,
+        },
+        "stickers": {str(uuid.UUID(int=rng.getrandbits(128))): "empty"},
+    }
+
+
+def make_tasks_page(
+        size: int = 50,
+        offset: int = 0,
+        count: int = 1000,
+        seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Функция генерации страницы задач в формате YouGile API
+
+    Args:
+        size: Количество задач на странице
+        offset: Смещение страницы
+        count: Общее количество задач
+        seed: Зерно генератора случайных чисел
+    """
+    rng = random.Random(seed)
+    employers = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(50)]
+    return {
+        "paging": {"count": count, "limit": size, "offset": offset, "next": offset + size < count},
+        "content": [make_task(rng, employers) for _ in range(size)],
+    }
@@ -18,9 +18,65 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
-REDIS_HOST = os.getenv("REDIS_HOST")
-REDIS_PORT = os.getenv("REDIS_PORT")
-REDIS_DB = os.getenv("REDIS_DB")
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", "6379"))
+REDIS_DB = int(os.getenv("REDIS_DB", "0"))
+
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", "5"))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", "5"))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", "2"))
+REDIS_SOCKET_KEEPALIVE = os.getenv("REDIS_SOCKET_KEEPALIVE", "True") in ["True", "true", "1"]
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+
+REDIS_CACHE_LOCAL_MAX_ITEMS = int(os.getenv("REDIS_CACHE_LOCAL_MAX_ITEMS", "1024"))
+REDIS_CACHE_LOCAL_MAX_BYTES = int(os.getenv("REDIS_CACHE_LOCAL_MAX_BYTES", str(64 * 1024 * 1024)))
+REDIS_CACHE_REFRESH_WORKERS = int(os.getenv("REDIS_CACHE_REFRESH_WORKERS", "4"))
+REDIS_CACHE_CODEC = os.getenv("REDIS_CACHE_CODEC", "json")
+REDIS_CACHE_COMPRESSOR = os.getenv("REDIS_CACHE_COMPRESSOR", "zstd")
+REDIS_CACHE_COMPRESS_MIN_BYTES = int(os.getenv("REDIS_CACHE_COMPRESS_MIN_BYTES", "4096"))
+REDIS_CACHE_NAMESPACE_LOCAL_TTL = float(os.getenv("REDIS_CACHE_NAMESPACE_LOCAL_TTL", "1"))
+
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_RETRY_TOTAL = int(os.getenv("HTTP_RETRY_TOTAL", "3"))
+HTTP_RETRY_BACKOFF_FACTOR = float(os.getenv("HTTP_RETRY_BACKOFF_FACTOR", "0.5"))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "30"))
+
+YOUGILE_API_URL = os.getenv("YOUGILE_API_URL", "https://ru.yougile.com/api-v2")
+YOUGILE_CONNECT_TIMEOUT = float(os.getenv("YOUGILE_CONNECT_TIMEOUT", "3.05"))
+YOUGILE_READ_TIMEOUT = float(os.getenv("YOUGILE_READ_TIMEOUT", "10"))
+YOUGILE_ASYNC_CONCURRENCY = int(os.getenv("YOUGILE_ASYNC_CONCURRENCY", "4"))
+YOUGILE_ASYNC_PAGINATION = os.getenv("YOUGILE_ASYNC_PAGINATION") in ["True", "true", "1"]
+YOUGILE_RATE_LIMIT = float(os.getenv("YOUGILE_RATE_LIMIT", "5"))
+YOUGILE_RATE_BURST = int(os.getenv("YOUGILE_RATE_BURST", "20"))
+YOUGILE_RATE_LIMIT_WAIT = float(os.getenv("YOUGILE_RATE_LIMIT_WAIT", "5"))
+
+YOUGILE_CACHE_FALLBACK_TTL = int(os.getenv("YOUGILE_CACHE_FALLBACK_TTL", str(24 * 60 * 60)))
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "redis")
+
+CIRCUIT_BREAKER_FAILURE_RATE = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", "0.5"))
+CIRCUIT_BREAKER_MIN_CALLS = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", "10"))
+CIRCUIT_BREAKER_WINDOW = int(os.getenv("CIRCUIT_BREAKER_WINDOW", "50"))
+CIRCUIT_BREAKER_SLOW_CALL = float(os.getenv("CIRCUIT_BREAKER_SLOW_CALL", "5"))
+CIRCUIT_BREAKER_OPEN_TIMEOUT = float(os.getenv("CIRCUIT_BREAKER_OPEN_TIMEOUT", "30"))
+CIRCUIT_BREAKER_HALF_OPEN_CALLS = int(os.getenv("CIRCUIT_BREAKER_HALF_OPEN_CALLS", "1"))
+
+EMPLOYEES_SYNC_BATCH_SIZE = int(os.getenv("EMPLOYEES_SYNC_BATCH_SIZE", "500"))
+
+JOBS_BACKEND = os.getenv("JOBS_BACKEND", "redis")
+JOBS_QUEUE_KEY = os.getenv("JOBS_QUEUE_KEY", "jobs")
+JOBS_RESULT_TTL = int(os.getenv("JOBS_RESULT_TTL", str(24 * 60 * 60)))
+JOBS_COALESCE_TTL = int(os.getenv("JOBS_COALESCE_TTL", str(60 * 60)))
+
+PROJECT_ACCESS_RESOLUTION = int(os.getenv("PROJECT_ACCESS_RESOLUTION", "60"))
+SCHEDULER_TICK = float(os.getenv("SCHEDULER_TICK", "5"))
+SCHEDULER_ACTIVE_INTERVAL = int(os.getenv("SCHEDULER_ACTIVE_INTERVAL", str(5 * 60)))
+SCHEDULER_IDLE_INTERVAL = int(os.getenv("SCHEDULER_IDLE_INTERVAL", str(60 * 60)))
+SCHEDULER_ACTIVE_WINDOW = int(os.getenv("SCHEDULER_ACTIVE_WINDOW", str(24 * 60 * 60)))
+SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+SCHEDULER_MAX_CONCURRENCY = int(os.getenv("SCHEDULER_MAX_CONCURRENCY", "4"))
 
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("DJANGO_SECRET_KEY")
@@ -55,6 +111,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'user.middleware.StaleDataMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -79,9 +136,14 @@ TEMPLATES = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user.authentication.CachedTokenAuthentication',
     ],
+    'EXCEPTION_HANDLER': 'user.exception_handlers.exception_handler',
 }
+AUTH_TOKEN_CACHE_TTL = int(os.getenv("AUTH_TOKEN_CACHE_TTL", "60"))
+AUTH_TOKEN_LOCAL_TTL = float(os.getenv("AUTH_TOKEN_LOCAL_TTL", "1"))
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "100"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
 
 # REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
 #     'rest_framework.renderers.JSONRenderer'
@@ -0,0 +1,25 @@
+"""
+Настройки gunicorn для запуска ASGI приложения
+
+Запуск:
+    gunicorn core.asgi:application -c gunicorn_conf.py
+
+Note:
+    Каждый процесс обслуживает запросы в event loop uvicorn,
+    поэтому ожидание внешних сервисов в асинхронных
+    представлениях не занимает поток
+"""
+# pylint: disable=invalid-name
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("GUNICORN_WORKERS", str(multiprocessing.cpu_count() * 2 + 1)))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "1000"))
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+errorlog = "-"
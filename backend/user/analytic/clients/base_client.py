@@ -3,3 +3,28 @@
 
 class BaseClient:
     """Базовый класс клиента"""
+
+    def get_cache_identity(self) -> str:
+        """
+        Метод получения идентичности клиента,
+        подставляемой вместо self в ключи кэша
+
+        Note:
+            По умолчанию идентичность привязана к
+            конкретному экземпляру, поэтому кэш между
+            экземплярами не разделяется. Клиенты, чьи
+            ответы определяются только их учетными данными,
+            должны переопределять этот метод
+        """
+        return f"{type(self).__qualname__}-{id(self)}"
+
+    def get_cache_namespaces(self) -> tuple[str, ...]:
+        """
+        Метод получения пространств имен кэша клиента
+
+        Note:
+            Поколения пространств входят в ключи кэша
+            вместе с идентичностью, поэтому инвалидация
+            любого из них сбрасывает кэш клиента
+        """
+        return ()
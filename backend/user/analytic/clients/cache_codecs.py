@@ -0,0 +1,253 @@
+"""
+Модуль, содержащий кодеки, которыми
+сериализуются кэшированные данные
+
+Note:
+    Каждая запись начинается с байта заголовка:
+    младшие 4 бита - идентификатор кодека,
+    следующие 3 - идентификатор сжатия.
+    Старший бит всегда 0, поэтому записи старого
+    формата (pickle начинается с 0x80) читаются как раньше
+"""
+import pickle
+from abc import ABC, abstractmethod
+from typing import Any
+
+import msgpack
+import orjson
+import zstandard
+
+LEGACY_PICKLE_HEADER = 0x80
+CODEC_MASK = 0x0F
+COMPRESSOR_SHIFT = 4
+
+
+class BaseCodec(ABC):
+    """
+    Интерфейс кодека
+
+    Attributes:
+        codec_id: Идентификатор кодека в заголовке записи (1-15)
+        name: Имя кодека, используемое в настройках
+    """
+    codec_id: int
+    name: str
+
+    @abstractmethod
+    def encode(self, data: Any) -> bytes:
+        """
+        Метод сериализации данных
+
+        Args:
+            data: Cериализуемые данные
+        """
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """
+        Метод десериализации данных
+
+        Args:
+            data: Десериализуемые данные
+        """
+
+
+class PickleCodec(BaseCodec):
+    """Кодек pickle, сохраняющий произвольные python объекты"""
+    codec_id = 1
+    name = "pickle"
+
+    def encode(self, data: Any) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+class JsonCodec(BaseCodec):
+    """
+    Кодек JSON на основе orjson
+
+    Note:
+        Кортежи декодируются как списки
+    """
+    codec_id = 2
+    name = "json"
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(BaseCodec):
+    """
+    Кодек msgpack
+
+    Note:
+        Кортежи декодируются как списки
+    """
+    codec_id = 3
+    name = "msgpack"
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class BaseCompressor(ABC):
+    """
+    Интерфейс алгоритма сжатия
+
+    Attributes:
+        compressor_id: Идентификатор сжатия в заголовке записи (1-7)
+        name: Имя алгоритма, используемое в настройках
+    """
+    compressor_id: int
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """
+        Метод сжатия данных
+
+        Args:
+            data: Сжимаемые данные
+        """
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        """
+        Метод распаковки данных
+
+        Args:
+            data: Распаковываемые данные
+        """
+
+
+class ZstdCompressor(BaseCompressor):
+    """Сжатие zstd"""
+    compressor_id = 1
+    name = "zstd"
+
+    def __init__(self, level: int = 3):
+        """
+        Args:
+            level: Уровень сжатия
+        """
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zstandard.ZstdDecompressor().decompress(data)
+
+
+CODECS: dict[int, BaseCodec] = {
+    codec.codec_id: codec for codec in (PickleCodec(), JsonCodec(), MsgpackCodec())
+}
+COMPRESSORS: dict[int, BaseCompressor] = {
+    compressor.compressor_id: compressor for compressor in (ZstdCompressor(),)
+}
+
+
+def get_codec(name: str) -> BaseCodec:
+    """
+    Функция получения кодека по имени
+
+    Args:
+        name: Имя кодека
+
+    Raises:
+        ValueError: Кодека с таким именем нет
+    """
+    codecs = {codec.name: codec for codec in CODECS.values()}
+    if name not in codecs:
+        raise ValueError(f"Неизвестный кодек кэша {name!r}, доступны: {', '.join(codecs)}")
+    return codecs[name]
+
+
+def get_compressor(name: str) -> BaseCompressor:
+    """
+    Функция получения алгоритма сжатия по имени
+
+    Args:
+        name: Имя алгоритма
+
+    Raises:
+        ValueError: Алгоритма с таким именем нет
+    """
+    compressors = {compressor.name: compressor for compressor in COMPRESSORS.values()}
+    if name not in compressors:
+        raise ValueError(
+            f"Неизвестный алгоритм сжатия кэша {name!r}, доступны: {', '.join(compressors)}"
+        )
+    return compressors[name]
+
+
+class CacheSerializer:
+    """
+    Сериализатор записей кэша, дописывающий
+    к данным байт заголовка
+
+    Note:
+        Записи пишутся выбранным кодеком, а читаются
+        любым зарегистрированным, поэтому процессы
+        с разными настройками понимают записи друг друга
+
+    Attributes:
+        codec: Кодек новых записей
+        compressor: Алгоритм сжатия новых записей
+        compress_threshold: Размер данных в байтах, начиная с которого они сжимаются
+    """
+
+    def __init__(
+            self,
+            codec: BaseCodec,
+            compressor: BaseCompressor | None = None,
+            compress_threshold: int = 0,
+    ):
+        """
+        Args:
+            codec: Кодек новых записей
+            compressor: Алгоритм сжатия новых записей
+            compress_threshold: Размер данных в байтах, начиная с которого они сжимаются
+        """
+        self.codec = codec
+        self.compressor = compressor
+        self.compress_threshold = compress_threshold
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Метод сериализации данных
+
+        Args:
+            data: Cериализуемые данные
+        """
+        payload = self.codec.encode(data)
+        header = self.codec.codec_id
+        if self.compressor is not None and len(payload) >= self.compress_threshold:
+            payload = self.compressor.compress(payload)
+            header |= self.compressor.compressor_id << COMPRESSOR_SHIFT
+        return bytes((header,)) + payload
+
+    @staticmethod
+    def loads(data: bytes) -> Any:
+        """
+        Метод десериализации данных
+
+        Args:
+            data: Десериализуемые данные
+        """
+        header = data[0]
+        if header & LEGACY_PICKLE_HEADER:
+            return pickle.loads(data)
+        payload = memoryview(data)[1:]
+        compressor_id = header >> COMPRESSOR_SHIFT
+        if compressor_id:
+            payload = COMPRESSORS[compressor_id].decompress(payload)
+        return CODECS[header & CODEC_MASK].decode(payload)
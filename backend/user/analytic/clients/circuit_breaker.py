@@ -0,0 +1,197 @@
+"""
+Модуль, содержащий автоматический выключатель
+запросов к внешним сервисам
+"""
+import enum
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from core.settings import (
+    CIRCUIT_BREAKER_FAILURE_RATE, CIRCUIT_BREAKER_MIN_CALLS, CIRCUIT_BREAKER_WINDOW,
+    CIRCUIT_BREAKER_SLOW_CALL, CIRCUIT_BREAKER_OPEN_TIMEOUT, CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+)
+
+
+class CircuitOpen(Exception):
+    """
+    Исключение, возникающее при вызове через разомкнутый выключатель
+
+    Attributes:
+        name: Имя выключателя
+        retry_after: Через сколько секунд выключатель пропустит пробный вызов
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Выключатель {name} разомкнут, повтор через {retry_after:.2f} с")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitState(str, enum.Enum):
+    """Перечисление состояний выключателя"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# pylint: disable=R0902
+class CircuitBreaker:
+    """
+    Автоматический выключатель
+
+    Note:
+        Выключатель помнит исходы последних window вызовов,
+        медленные вызовы считаются неудачными. Когда вызовов
+        не меньше min_calls и доля неудачных достигает
+        failure_rate, выключатель размыкается и open_timeout
+        секунд сразу отвечает CircuitOpen. Затем он пропускает
+        half_open_calls пробных вызовов: успех замыкает его,
+        неудача снова размыкает. Состояние своё у каждого процесса
+
+    Attributes:
+        name: Имя выключателя
+        state: Состояние выключателя
+    """
+
+    # pylint: disable=R0913
+    def __init__(
+            self,
+            name: str,
+            failure_rate: float = CIRCUIT_BREAKER_FAILURE_RATE,
+            min_calls: int = CIRCUIT_BREAKER_MIN_CALLS,
+            window: int = CIRCUIT_BREAKER_WINDOW,
+            slow_call: float = CIRCUIT_BREAKER_SLOW_CALL,
+            open_timeout: float = CIRCUIT_BREAKER_OPEN_TIMEOUT,
+            half_open_calls: int = CIRCUIT_BREAKER_HALF_OPEN_CALLS,
+            is_failure: Callable[[Exception], bool] = lambda exc: True,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            name: Имя выключателя
+            failure_rate: Доля неудачных вызовов, при которой выключатель размыкается
+            min_calls: Сколько вызовов нужно, чтобы судить о доле неудачных
+            window: Сколько последних вызовов учитывается
+            slow_call: Длительность вызова в секундах, начиная с которой он неудачный
+            open_timeout: Сколько секунд выключатель остается разомкнутым
+            half_open_calls: Сколько пробных вызовов пропускается после open_timeout
+            is_failure: Считается ли исключение вызова неудачей внешнего сервиса
+            clock: Монотонные часы
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.slow_call = slow_call
+        self.open_timeout = open_timeout
+        self.half_open_calls = half_open_calls
+        self.is_failure = is_failure
+        self.state = CircuitState.CLOSED
+        self._clock = clock
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        """
+        Метод проверки, что вызов можно выполнить
+
+        Raises:
+            CircuitOpen: Выключатель разомкнут или все пробные вызовы уже идут
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return
+            retry_after = self._opened_at + self.open_timeout - self._clock()
+            if self.state == CircuitState.OPEN and retry_after <= 0:
+                self.state, self._probes = CircuitState.HALF_OPEN, 0
+            if self.state == CircuitState.HALF_OPEN and self._probes < self.half_open_calls:
+                self._probes += 1
+                return
+            raise CircuitOpen(self.name, max(retry_after, 0.0))
+
+    def record(self, failed: bool) -> None:
+        """
+        Метод учета исхода вызова
+
+        Args:
+            failed: Неудачен ли вызов
+        """
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self.state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                return
+            if self.state == CircuitState.OPEN:
+                return
+            self._outcomes.append(failed)
+            if len(self._outcomes) >= self.min_calls \
+                    and sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def release(self) -> None:
+        """
+        Метод освобождения места пробного вызова без учета исхода
+
+        Note:
+            Нужен, когда вызов прерван, например отменой
+            корутины, и о внешнем сервисе ничего не известно.
+            Иначе место пробного вызова осталось бы занятым
+            и выключатель навсегда застрял бы полуоткрытым
+        """
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _open(self) -> None:
+        """Метод размыкания выключателя"""
+        self.state, self._opened_at = CircuitState.OPEN, self._clock()
+        self._outcomes.clear()
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Контекстный менеджер вызова через выключатель
+
+        Note:
+            Подходит и для асинхронного кода: внутри
+            блока можно ожидать корутины
+
+        Raises:
+            CircuitOpen: Выключатель не пропускает вызов
+        """
+        self.allow()
+        started_at = self._clock()
+        try:
+            yield
+        except Exception as exc:
+            self.record(self.is_failure(exc))
+            raise
+        except BaseException:
+            self.release()
+            raise
+        self.record(self._clock() - started_at >= self.slow_call)
+
+
+_circuit_breakers: dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Функция получения общего для процесса выключателя по имени
+
+    Args:
+        name: Имя выключателя, например сервис и конечная точка
+        kwargs: Параметры CircuitBreaker для создаваемого выключателя
+    """
+    with _circuit_breakers_lock:
+        if name not in _circuit_breakers:
+            _circuit_breakers[name] = CircuitBreaker(name, **kwargs)
+        return _circuit_breakers[name]
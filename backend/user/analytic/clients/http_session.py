@@ -0,0 +1,94 @@
+"""
+Модуль, хранящий общий для процесса
+HTTP транспорт клиентов внешних интеграций
+"""
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from core.settings import (
+    HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_RETRY_TOTAL,
+    HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_BACKOFF_MAX,
+)
+
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+
+
+def get_retry_delay(retry_after: str | None, attempt: int) -> float:
+    """
+    Функция расчета задержки перед повтором запроса
+
+    Note:
+        Используется Retry-After, если он есть и разбирается,
+        иначе экспоненциальная задержка.
+        Задержка не превышает HTTP_RETRY_BACKOFF_MAX
+
+    Args:
+        retry_after: Заголовок Retry-After ответа
+        attempt: Номер повтора, начиная с 0
+    """
+    delay = HTTP_RETRY_BACKOFF_FACTOR * 2 ** attempt
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                pass
+    return max(0.0, min(delay, HTTP_RETRY_BACKOFF_MAX))
+
+
+def create_session() -> requests.Session:
+    """
+    Функция создания сессии с пулом keep-alive соединений и повторами
+
+    Note:
+        Повторяются только идемпотентные запросы, не дошедшие
+        до сервиса из-за ошибки подключения. Повторы по
+        статусу ответа выполняют сами клиенты, чтобы каждая
+        попытка брала токен ограничителя частоты
+    """
+    retry = Retry(
+        total=HTTP_RETRY_TOTAL,
+        read=0,
+        backoff_factor=HTTP_RETRY_BACKOFF_FACTOR,
+        backoff_max=HTTP_RETRY_BACKOFF_MAX,
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Функция получения общей для процесса сессии
+
+    Note:
+        Сессия пересоздается в дочернем процессе после fork,
+        чтобы процессы не делили сокеты
+    """
+    global _session, _session_pid  # pylint: disable=W0603
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session, _session_pid = create_session(), os.getpid()
+        return _session
@@ -0,0 +1,201 @@
+"""
+Модуль, содержащий ограничитель частоты
+запросов к внешним сервисам
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from core.settings import RATE_LIMIT_BACKEND
+from user.analytic.clients.redis_client import RedisClient
+
+
+class RateLimitExceeded(Exception):
+    """
+    Исключение, возникающее, когда запрос
+    нельзя выполнить, не превысив частоту
+
+    Attributes:
+        key: Ключ ограничителя
+        retry_after: Через сколько секунд появится свободный токен
+    """
+
+    def __init__(self, key: str, retry_after: float):
+        super().__init__(f"Превышена частота запросов {key}, повтор через {retry_after:.2f} с")
+        self.key = key
+        self.retry_after = retry_after
+
+
+class BaseRateLimiterBackend(ABC):
+    """
+    Интерфейс хранилища корзин токенов
+
+    Note:
+        Корзина вмещает burst токенов и пополняется
+        со скоростью rate токенов в секунду
+    """
+
+    @abstractmethod
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        """
+        Метод взятия токена из корзины
+
+        Args:
+            key: Ключ корзины
+            rate: Скорость пополнения, токенов в секунду
+            burst: Вместимость корзины
+
+        Returns:
+            0, если токен взят, иначе через сколько
+            секунд появится свободный токен
+        """
+
+
+class LocalRateLimiterBackend(BaseRateLimiterBackend):
+    """
+    Хранилище корзин в памяти процесса
+
+    Note:
+        Используется в тестах и при локальной разработке
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            clock: Монотонные часы
+        """
+        self._clock = clock
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        with self._lock:
+            now = self._clock()
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            return wait
+
+
+class RedisRateLimiterBackend(BaseRateLimiterBackend):
+    """
+    Хранилище корзин в Redis, общее для всех процессов
+
+    Note:
+        Пополнение и взятие токена выполняются одним
+        скриптом по часам Redis, поэтому корзина согласована
+        между процессами с разными локальными часами
+    """
+    ACQUIRE_SCRIPT = """
+        local rate, burst = tonumber(ARGV[1]), tonumber(ARGV[2])
+        local time = redis.call("TIME")
+        local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+        local state = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+        local tokens = tonumber(state[1]) or burst
+        local updated_at = tonumber(state[2]) or now
+        tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+        local wait = 0
+        if tokens >= 1 then
+            tokens = tokens - 1
+        else
+            wait = (1 - tokens) / rate
+        end
+        redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now))
+        redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+        return tostring(wait)
+    """
+
+    def acquire(self, key: str, rate: float, burst: int) -> float:
+        return float(RedisClient().eval(self.ACQUIRE_SCRIPT, 1, key, rate, burst))
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов по алгоритму корзины токенов
+
+    Note:
+        Вызывающий выбирает поведение при исчерпанной корзине:
+        ждать токен не дольше timeout или, при timeout=0,
+        сразу получить RateLimitExceeded
+
+    Attributes:
+        prefix: Префикс ключей корзин
+        rate: Скорость пополнения, токенов в секунду
+        burst: Вместимость корзины
+        backend: Хранилище корзин
+    """
+
+    def __init__(
+            self,
+            prefix: str,
+            rate: float,
+            burst: int,
+            backend: BaseRateLimiterBackend | None = None,
+    ):
+        """
+        Args:
+            prefix: Префикс ключей корзин
+            rate: Скорость пополнения, токенов в секунду
+            burst: Вместимость корзины
+            backend: Хранилище корзин, по умолчанию выбирается по RATE_LIMIT_BACKEND
+        """
+        self.prefix = prefix
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend or {
+            "local": LocalRateLimiterBackend,
+            "redis": RedisRateLimiterBackend,
+        }[RATE_LIMIT_BACKEND]()
+
+    def _try_acquire(self, key: str, deadline: float) -> float:
+        """
+        Метод одной попытки взять токен
+
+        Args:
+            key: Ключ корзины без префикса
+            deadline: Монотонное время, до которого можно ждать
+
+        Returns:
+            Сколько ждать перед следующей попыткой, 0 - токен взят
+        """
+        wait = self.backend.acquire(f"{self.prefix}:{key}", self.rate, self.burst)
+        if wait and time.monotonic() + wait > deadline:
+            raise RateLimitExceeded(key, wait)
+        return wait
+
+    def acquire(self, key: str, timeout: float = 0) -> None:
+        """
+        Метод взятия токена
+
+        Args:
+            key: Ключ корзины, например хэш токена доступа
+            timeout: Сколько секунд можно ждать токен, 0 - не ждать
+
+        Raises:
+            RateLimitExceeded: Токен не появится до истечения timeout
+        """
+        deadline = time.monotonic() + timeout
+        while wait := self._try_acquire(key, deadline):
+            time.sleep(wait)
+
+    async def acquire_async(self, key: str, timeout: float = 0) -> None:
+        """
+        Асинхронный аналог acquire, ожидающий токен без блокировки event loop
+
+        Args:
+            key: Ключ корзины, например хэш токена доступа
+            timeout: Сколько секунд можно ждать токен, 0 - не ждать
+
+        Raises:
+            RateLimitExceeded: Токен не появится до истечения timeout
+        """
+        deadline = time.monotonic() + timeout
+        while wait := self._try_acquire(key, deadline):
+            await asyncio.sleep(wait)
@@ -1,13 +1,387 @@
 """
 Модуль, хранящий клиент доступа к redis db
 """
-import pickle
+import asyncio
+import hashlib
+import inspect
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Iterable
 
-from redis import Redis
+from redis import Redis, BlockingConnectionPool
+from redis import asyncio as aioredis
+from redis.exceptions import LockError
 
-from core.settings import REDIS_HOST, REDIS_PORT, REDIS_DB
+from core.settings import (
+    REDIS_HOST, REDIS_PORT, REDIS_DB, REDIS_MAX_CONNECTIONS, REDIS_POOL_TIMEOUT,
+    REDIS_SOCKET_TIMEOUT, REDIS_SOCKET_CONNECT_TIMEOUT, REDIS_SOCKET_KEEPALIVE,
+    REDIS_HEALTH_CHECK_INTERVAL,
+    REDIS_CACHE_LOCAL_MAX_ITEMS, REDIS_CACHE_LOCAL_MAX_BYTES,
+    REDIS_CACHE_REFRESH_WORKERS, REDIS_CACHE_CODEC, REDIS_CACHE_COMPRESSOR,
+    REDIS_CACHE_COMPRESS_MIN_BYTES, REDIS_CACHE_NAMESPACE_LOCAL_TTL,
+)
+from user.analytic.clients.cache_codecs import CacheSerializer, get_codec, get_compressor
+from user.analytic.clients.staleness import mark_stale
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "function-cache-prefix"
+CACHE_SCHEMA_VERSION = 2
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+
+@dataclass
+class LocalCacheStats:
+    """
+    Статистика работы локального кэша
+
+    Attributes:
+        hits: Количество попаданий
+        misses: Количество промахов
+        evictions: Количество вытесненных по LRU записей
+        expirations: Количество записей, удаленных по истечении TTL
+    """
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class LocalCache:
+    """
+    Ограниченный LRU кэш в памяти процесса,
+    используемый как первый уровень перед Redis
+
+    Note:
+        Хранит сериализованные данные, поэтому
+        вызывающий код всегда получает свою копию
+        результата, а объем записей известен точно
+
+    Attributes:
+        max_items: Максимальное количество записей
+        max_bytes: Максимальный суммарный объем записей в байтах
+        size: Текущий суммарный объем записей в байтах
+        stats: Статистика работы кэша
+    """
+
+    def __init__(self, max_items: int, max_bytes: int):
+        """
+        Args:
+            max_items: Максимальное количество записей
+            max_bytes: Максимальный суммарный объем записей в байтах
+        """
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.stats = LocalCacheStats()
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Метод получения записи, продлевающий ее в LRU очереди
+
+        Args:
+            key: Ключ записи
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return data
+
+    def set(self, key: str, data: bytes, ttl: float) -> None:
+        """
+        Метод сохранения записи с вытеснением
+        самых давно использованных записей
+
+        Args:
+            key: Ключ записи
+            data: Сериализованные данные
+            ttl: Время жизни записи в секундах
+        """
+        if ttl <= 0 or len(data) > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self.size += len(data)
+            while len(self._entries) > self.max_items or self.size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """
+        Метод удаления записи
+
+        Args:
+            key: Ключ записи
+        """
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        """Метод очистки кэша и его статистики"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.stats = LocalCacheStats()
+
+    def _pop(self, key: str) -> None:
+        """Метод удаления записи без блокировки"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+local_cache = LocalCache(
+    max_items=REDIS_CACHE_LOCAL_MAX_ITEMS,
+    max_bytes=REDIS_CACHE_LOCAL_MAX_BYTES,
+)
+
+
+class InFlightCall:
+    """
+    Вычисление, результат которого
+    ожидают несколько вызывающих
+
+    Attributes:
+        done: Событие завершения вычисления
+        result: Результат вычисления
+        error: Исключение, возникшее при вычислении
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Объединение одновременных вычислений
+    с одинаковым ключом внутри процесса
+
+    Note:
+        Первый вызывающий выполняет вычисление,
+        остальные дожидаются его результата
+        или исключения
+    """
+
+    def __init__(self):
+        self._calls: dict[str, InFlightCall] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        """
+        Метод выполнения вычисления не более
+        одного раза на ключ в каждый момент времени
+
+        Args:
+            key: Ключ вычисления
+            function: Вычисление
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = InFlightCall()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+single_flight_calls = SingleFlight()
+
+
+class BackgroundRefresher:
+    """
+    Пул фонового обновления устаревших значений кэша
+
+    Note:
+        Пока обновление ключа выполняется, повторные
+        запросы на его обновление игнорируются.
+        Потоки создаются лениво, чтобы пул
+        не переживал fork рабочих процессов
+
+    Attributes:
+        max_workers: Количество потоков обновления
+    """
+
+    def __init__(self, max_workers: int):
+        """
+        Args:
+            max_workers: Количество потоков обновления
+        """
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._keys: set[str] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, function: Callable[[], Any]) -> bool:
+        """
+        Метод постановки обновления ключа в очередь
+
+        Args:
+            key: Обновляемый ключ
+            function: Обновление
+
+        Returns:
+            Было ли обновление поставлено в очередь
+        """
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="redis-cache-refresh",
+                )
+        self._executor.submit(self._run, key, function)
+        return True
+
+    def _run(self, key: str, function: Callable[[], Any]) -> None:
+        """Метод выполнения обновления в потоке пула"""
+        try:
+            function()
+        except Exception:  # pylint: disable=W0718
+            logger.exception("Background refresh of %s failed", key)
+        finally:
+            with self._lock:
+                self._keys.discard(key)
+
+
+background_refresher = BackgroundRefresher(max_workers=REDIS_CACHE_REFRESH_WORKERS)
+
+
+@dataclass
+class ConnectionPoolStats:
+    """
+    Статистика пула соединений
+
+    Attributes:
+        max_connections: Размер пула
+        created: Количество открытых соединений
+        in_use: Количество выданных соединений
+        idle: Количество открытых свободных соединений
+        waits: Количество выдач соединения
+        total_wait_time: Суммарное время ожидания соединения в секундах
+        max_wait_time: Максимальное время ожидания соединения в секундах
+    """
+    max_connections: int
+    created: int
+    in_use: int
+    idle: int
+    waits: int
+    total_wait_time: float
+    max_wait_time: float
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """
+    Блокирующий пул соединений, замеряющий
+    время ожидания свободного соединения
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._stats_lock = threading.Lock()
+        self._waits = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    def get_connection(self, command_name, *keys, **options):
+        started = time.monotonic()
+        connection = super().get_connection(command_name, *keys, **options)
+        waited = time.monotonic() - started
+        with self._stats_lock:
+            self._waits += 1
+            self._total_wait_time += waited
+            self._max_wait_time = max(self._max_wait_time, waited)
+        return connection
+
+    def get_stats(self) -> ConnectionPoolStats:
+        """Метод получения статистики пула"""
+        with self.pool.mutex:
+            idle = sum(connection is not None for connection in self.pool.queue)
+        created = len(self._connections)
+        with self._stats_lock:
+            return ConnectionPoolStats(
+                max_connections=self.max_connections,
+                created=created,
+                in_use=created - idle,
+                idle=idle,
+                waits=self._waits,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+            )
+
+
+_connection_pool: InstrumentedConnectionPool | None = None
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> InstrumentedConnectionPool:
+    """
+    Функция получения общего для процесса пула соединений
+
+    Note:
+        После fork пул сам закрывает унаследованные
+        соединения и открывает новые
+    """
+    global _connection_pool  # pylint: disable=W0603
+    with _connection_pool_lock:
+        if _connection_pool is None:
+            _connection_pool = InstrumentedConnectionPool(
+                host=REDIS_HOST,
+                port=REDIS_PORT,
+                db=REDIS_DB,
+                max_connections=REDIS_MAX_CONNECTIONS,
+                timeout=REDIS_POOL_TIMEOUT,
+                socket_timeout=REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                socket_keepalive=REDIS_SOCKET_KEEPALIVE,
+                health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+            )
+        return _connection_pool
+
+
+_async_clients: dict[asyncio.AbstractEventLoop, aioredis.Redis] = {}
+_async_clients_lock = threading.Lock()
 
 
 # pylint: disable=W0223, R0901
@@ -20,45 +394,132 @@ class RedisClient(Redis):
 
     Attributes:
         instance: Единственный экземпляр клиента
+        serializer: Сериализатор записей кэша
     """
     instance: "RedisClient"
+    serializer = CacheSerializer(
+        codec=get_codec(REDIS_CACHE_CODEC),
+        compressor=get_compressor(REDIS_CACHE_COMPRESSOR) if REDIS_CACHE_COMPRESSOR else None,
+        compress_threshold=REDIS_CACHE_COMPRESS_MIN_BYTES,
+    )
 
-    def __new__(cls) -> "RedisClient":
+    def __new__(cls, **kwargs) -> "RedisClient":
         """Метод, обеспечивающий реализацию Singleton"""
         if not hasattr(cls, 'instance'):
             cls.instance = super(RedisClient, cls).__new__(cls)
         return cls.instance
 
-    @property
-    def _default_init_kwargs(self):
-        return {
-            "host": REDIS_HOST,
-            "port": REDIS_PORT,
-            "db": REDIS_DB,
-        }
-
     def __init__(self, **kwargs):
-        extra_kwargs = {
-            key: kwargs.pop(key) if kwargs.get(key) else val
-            for key, val in self._default_init_kwargs
-        }
-        super().__init__(**kwargs, **extra_kwargs)
+        """
+        Note:
+            Инициализация выполняется только при первом
+            создании экземпляра, последующие вызовы
+            RedisClient() возвращают его без изменений
+
+        Args:
+            kwargs: Аргументы Redis, по умолчанию используется общий пул соединений
+        """
+        if getattr(self, "_initialized", False):
+            return
+        kwargs.setdefault("connection_pool", get_connection_pool())
+        super().__init__(**kwargs)
+        self._initialized = True
+
+    @staticmethod
+    def get_async_client() -> aioredis.Redis:
+        """
+        Метод получения асинхронного клиента Redis
+
+        Note:
+            Соединения asyncio привязаны к event loop, поэтому
+            у каждого loop свой клиент и пул соединений
+            с теми же настройками, что и у общего пула.
+            Соединения клиента ссылаются на свой loop, поэтому
+            клиенты закрытых loop, например созданных async_to_sync,
+            забываются при создании клиента для нового loop
+        """
+        loop = asyncio.get_running_loop()
+        client = _async_clients.get(loop)
+        if client is not None:
+            return client
+        with _async_clients_lock:
+            for closed in [other for other in _async_clients if other.is_closed()]:
+                del _async_clients[closed]
+            client = _async_clients[loop] = aioredis.Redis(
+                connection_pool=aioredis.BlockingConnectionPool(
+                    host=REDIS_HOST,
+                    port=REDIS_PORT,
+                    db=REDIS_DB,
+                    max_connections=REDIS_MAX_CONNECTIONS,
+                    timeout=REDIS_POOL_TIMEOUT,
+                    socket_timeout=REDIS_SOCKET_TIMEOUT,
+                    socket_connect_timeout=REDIS_SOCKET_CONNECT_TIMEOUT,
+                    socket_keepalive=REDIS_SOCKET_KEEPALIVE,
+                    health_check_interval=REDIS_HEALTH_CHECK_INTERVAL,
+                ),
+            )
+        return client
 
     @staticmethod
-    def get_key_by_function_with_params(function: Callable, *args, **kwargs) -> str:
+    def normalize_cache_param(value: Any) -> Any:
+        """
+        Метод, приводящий аргумент функции к виду,
+        стабильному между процессами и экземплярами
+
+        Note:
+            Объекты, объявляющие get_cache_identity
+            (например, клиенты), заменяются на свою идентичность
+            вместе с поколениями их пространств имен,
+            прочие несериализуемые объекты - на repr
+
+        Args:
+            value: Аргумент, переданный в функцию
+        """
+        if hasattr(value, "get_cache_identity"):
+            return cache_namespaces.get_identity(value)
+        return repr(value)
+
+    @classmethod
+    def get_key_by_function_with_params(
+            cls,
+            function: Callable,
+            args: tuple = (),
+            kwargs: dict[str, Any] | None = None,
+            version: int = 1,
+    ) -> str:
         """
         Метод, генерирующий строку-ключ функции
         по ее определенной значениями сигнатуре
 
+        Note:
+            Аргументы сопоставляются с сигнатурой функции,
+            поэтому позиционная и keyword передача одного
+            и того же значения, а также явная передача значения
+            по умолчанию, дают один и тот же ключ
+
         Args:
             function: Функция, ключ к которой генерируется
             args: Позиционные аргументы, переданные в функцию при вызове
             kwargs: Keyword аргументы, переданные в функцию при вызове
+            version: Версия схемы результата функции
         """
-        return f"function-cache-prefix-{function.__name__}-{str(args)}-{str(kwargs)}"
+        bound = inspect.signature(function).bind(*args, **(kwargs or {}))
+        bound.apply_defaults()
+        params = json.dumps(
+            bound.arguments,
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=cls.normalize_cache_param,
+        )
+        digest = hashlib.sha256(params.encode()).hexdigest()
+        return (
+            f"{CACHE_KEY_PREFIX}:v{CACHE_SCHEMA_VERSION}.{version}:"
+            f"{function.__module__}.{function.__qualname__}:{digest}"
+        )
 
-    @staticmethod
-    def loads(data):
+    @classmethod
+    def loads(cls, data):
         """
         Метод, используемый клиентом
         для десериализации данных
@@ -66,10 +527,10 @@ class RedisClient(Redis):
         Args:
             data: Десериализуемые данные
         """
-        return pickle.loads(data)   # pragma: no cover
+        return cls.serializer.loads(data)
 
-    @staticmethod
-    def dumps(data):
+    @classmethod
+    def dumps(cls, data):
         """
         Метод, используемый клиентом
         для сериализации данных
@@ -77,16 +538,258 @@ class RedisClient(Redis):
         Args:
             data: Cериализуемые данные
         """
-        return pickle.dumps(data)   # pragma: no cover
+        return cls.serializer.dumps(data)
+
+
+class CacheNamespaces:
+    """
+    Поколения пространств имен кэша
+
+    Note:
+        Поколения пространств имен объекта (например,
+        проекта и токена клиента) входят в его идентичность,
+        а значит и в ключи кэша. Инвалидация пространства -
+        один INCR: старые записи перестают читаться
+        и истекают сами, без SCAN по ключам. Процесс помнит
+        поколения local_ttl секунд, поэтому инвалидация
+        в других процессах видна с такой задержкой
+    """
+
+    def __init__(self, local_ttl: float):
+        """
+        Args:
+            local_ttl: Сколько секунд процесс помнит прочитанные поколения
+        """
+        self.local_ttl = local_ttl
+        self._generations: dict[str, tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(namespace: str) -> str:
+        """
+        Метод получения ключа счетчика поколения
+
+        Args:
+            namespace: Пространство имен
+        """
+        return f"{CACHE_KEY_PREFIX}:generation:{namespace}"
+
+    def get_generations(self, namespaces: Iterable[str]) -> list[int]:
+        """
+        Метод получения поколений пространств имен
+
+        Note:
+            Поколения, которых нет в памяти процесса,
+            читаются из Redis одним MGET
+
+        Args:
+            namespaces: Пространства имен
+        """
+        namespaces, now = list(namespaces), time.monotonic()
+        cached = self._get_remembered(namespaces, now)
+        missing = [namespace for namespace in namespaces if namespace not in cached]
+        if missing:
+            values = RedisClient().mget([self.get_key(namespace) for namespace in missing])
+            cached.update(self._remember(missing, values, now))
+        return [cached[namespace] for namespace in namespaces]
+
+    async def aget_generations(self, namespaces: Iterable[str]) -> list[int]:
+        """
+        Асинхронный аналог get_generations
+
+        Args:
+            namespaces: Пространства имен
+        """
+        namespaces, now = list(namespaces), time.monotonic()
+        cached = self._get_remembered(namespaces, now)
+        missing = [namespace for namespace in namespaces if namespace not in cached]
+        if missing:
+            values = await RedisClient.get_async_client().mget(
+                [self.get_key(namespace) for namespace in missing],
+            )
+            cached.update(self._remember(missing, values, now))
+        return [cached[namespace] for namespace in namespaces]
+
+    def _get_remembered(self, namespaces: list[str], now: float) -> dict[str, int]:
+        """
+        Метод получения поколений, которые процесс еще помнит
+
+        Args:
+            namespaces: Пространства имен
+            now: Текущее монотонное время
+        """
+        with self._lock:
+            return {
+                namespace: self._generations[namespace][0]
+                for namespace in namespaces
+                if namespace in self._generations and self._generations[namespace][1] > now
+            }
+
+    def _remember(self, namespaces: list[str], values: list[Any], now: float) -> dict[str, int]:
+        """
+        Метод запоминания прочитанных из Redis поколений
+
+        Args:
+            namespaces: Пространства имен
+            values: Значения счетчиков поколений
+            now: Текущее монотонное время
+        """
+        generations = {namespace: int(value or 0) for namespace, value in zip(namespaces, values)}
+        with self._lock:
+            for namespace, generation in generations.items():
+                self._generations[namespace] = (generation, now + self.local_ttl)
+        return generations
+
+    def get_identity(self, value: Any) -> str:
+        """
+        Метод получения идентичности объекта для ключей кэша
+
+        Args:
+            value:
+                Объект, объявляющий get_cache_identity и,
+                при необходимости, get_cache_namespaces
+        """
+        identity = value.get_cache_identity()
+        namespaces = value.get_cache_namespaces() if hasattr(value, "get_cache_namespaces") else ()
+        if not namespaces:
+            return identity
+        generations = self.get_generations(namespaces)
+        return f"{identity}@{'.'.join(map(str, generations))}"
+
+    async def aget_identity(self, value: Any) -> str:
+        """
+        Асинхронный аналог get_identity
+
+        Args:
+            value:
+                Объект, объявляющий get_cache_identity и,
+                при необходимости, get_cache_namespaces
+        """
+        identity = value.get_cache_identity()
+        namespaces = value.get_cache_namespaces() if hasattr(value, "get_cache_namespaces") else ()
+        if not namespaces:
+            return identity
+        generations = await self.aget_generations(namespaces)
+        return f"{identity}@{'.'.join(map(str, generations))}"
+
+    def invalidate(self, namespace: str) -> int:
+        """
+        Метод инвалидации всех записей пространства имен
+
+        Args:
+            namespace: Пространство имен
+
+        Returns:
+            Новое поколение пространства
+        """
+        generation = RedisClient().incr(self.get_key(namespace))
+        with self._lock:
+            self._generations[namespace] = (generation, time.monotonic() + self.local_ttl)
+        return generation
+
+    def clear(self) -> None:
+        """Метод очистки поколений, запомненных процессом"""
+        with self._lock:
+            self._generations.clear()
+
+
+cache_namespaces = CacheNamespaces(REDIS_CACHE_NAMESPACE_LOCAL_TTL)
+
+
+def get_project_namespace(project_id: int) -> str:
+    """
+    Функция получения пространства имен кэша проекта
+
+    Args:
+        project_id: Идентификатор проекта
+    """
+    return f"project:{project_id}"
+
+
+def get_token_namespace(token: str) -> str:
+    """
+    Функция получения пространства имен кэша токена
+
+    Note:
+        Сам токен в пространство не попадает, только его хэш
+
+    Args:
+        token: Токен доступа к внешнему сервису
+    """
+    return f"token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def invalidate_project(project: Any) -> int:
+    """
+    Функция инвалидации кэша проекта: страниц
+    его клиента и производных от них индексов
+
+    Args:
+        project: Проект
+    """
+    return cache_namespaces.invalidate(get_project_namespace(project.id))
 
 
-def redis_cache(life_time: int) -> Callable[[Callable], Any]:
+def invalidate_token(token: str) -> int:
+    """
+    Функция инвалидации кэша всех клиентов с токеном
+
+    Args:
+        token: Токен доступа к внешнему сервису
+    """
+    return cache_namespaces.invalidate(get_token_namespace(token))
+
+
+# pylint: disable=R0913, R0914, R0915
+def redis_cache(
+        life_time: int,
+        version: int = 1,
+        local_ttl: float | None = None,
+        single_flight: bool = False,
+        lock_timeout: float = 10,
+        lock_wait: float = 2,
+        stale_ttl: float = 0,
+        fallback_ttl: float = 0,
+        fallback_on: tuple[type[Exception], ...] = (),
+) -> Callable[[Callable], Any]:
     """
     Функция, создающая декоратор
     временного кэширования
 
     Args:
         life_time: Время жизни созданного кэша
+        version:
+            Версия схемы результата функции, ее нужно
+            увеличить при изменении формата результата
+        local_ttl:
+            Время жизни записи в локальном кэше процесса.
+            Если не передано, локальный кэш не используется.
+            Запись локального кэша никогда не переживает запись в Redis
+        single_flight:
+            Объединять ли одновременные промахи по одному ключу.
+            Внутри процесса вызывающие ждут одно вычисление,
+            между процессами вычисление выполняет владелец
+            блокировки в Redis
+        lock_timeout: Время жизни блокировки вычисления в Redis
+        lock_wait:
+            Сколько процесс без блокировки ждет появления
+            значения, прежде чем вычислить его самостоятельно
+        stale_ttl:
+            Сколько секунд после life_time значение еще можно
+            отдавать, одновременно обновляя его в фоне.
+            Значения старше life_time + stale_ttl не используются
+        fallback_ttl:
+            Сколько секунд после life_time + stale_ttl значение
+            хранится как последний удачный результат
+        fallback_on:
+            Исключения функции, при которых вместо ошибки
+            отдается последний удачный результат, а запрос
+            помечается как отдавший устаревшие данные
+
+    Note:
+        В кэше хранится пара из времени вычисления и результата,
+        по которой запись делится на свежую, устаревшую, но
+        пригодную, и слишком старую
     """
 
     def decorator(func: Callable) -> Callable:
@@ -101,15 +804,135 @@ def redis_cache(life_time: int) -> Callable[[Callable], Any]:
         @wraps(func)
         def wrapper(*args, **kwargs):
             """Функция, оборачивающая декорируемую функций"""
-            key = RedisClient.get_key_by_function_with_params(func, *args, **kwargs)
+            key = RedisClient.get_key_by_function_with_params(func, args, kwargs, version)
             redis_client = RedisClient()
-            if redis_client.get(key) is not None:
-                result = redis_client.loads(redis_client.get(key))
-            else:
-                result = func(*args, **kwargs)
-                redis_client.setex(key, life_time, redis_client.dumps(result))
+            data = read(redis_client, key)
+            if data is not None:
+                created_at, result = redis_client.loads(data)
+                age = time.time() - created_at
+                if age <= life_time:
+                    return result
+                if age <= life_time + stale_ttl:
+                    background_refresher.submit(
+                        key, lambda: refresh(redis_client, key, lambda: func(*args, **kwargs)),
+                    )
+                    return result
+            try:
+                data = load(redis_client, key, lambda: func(*args, **kwargs))
+            except fallback_on:
+                if data is None:
+                    raise
+                mark_stale(age)
+                logger.warning("Serving last known good value of %s, %.0fs old", key, age)
+                return result
+            _, result = redis_client.loads(data)
             return result
 
         return wrapper
 
+    def is_fresh(redis_client: RedisClient, data: bytes | None, max_age: float = life_time) -> bool:
+        """Функция проверки, что сериализованная запись не старше max_age"""
+        if data is None:
+            return False
+        created_at, _ = redis_client.loads(data)
+        return time.time() - created_at <= max_age
+
+    def read(redis_client: RedisClient, key: str) -> bytes | None:
+        """
+        Функция чтения сериализованного значения из кэша
+
+        Note:
+            При включенном локальном кэше значение и оставшееся
+            время его жизни читаются из Redis за один запрос,
+            так что локальная запись истекает не позже записи в Redis
+        """
+        if local_ttl is None:
+            return redis_client.get(key)
+
+        data = local_cache.get(key)
+        if data is not None:
+            return data
+
+        with redis_client.pipeline(transaction=False) as pipe:
+            data, remaining_ms = pipe.get(key).pttl(key).execute()
+        if data is not None:
+            ttl = local_ttl if remaining_ms == -1 else min(local_ttl, remaining_ms / 1000)
+            local_cache.set(key, data, ttl)
+        return data
+
+    def compute_and_store(redis_client: RedisClient, key: str, function: Callable) -> bytes:
+        """
+        Функция вычисления и сохранения значения на всех уровнях кэша
+
+        Note:
+            В Redis запись живет life_time + stale_ttl + fallback_ttl,
+            чтобы устаревшее значение было доступно для отдачи,
+            в локальном кэше - не дольше life_time
+        """
+        data = redis_client.dumps((time.time(), function()))
+        redis_client.setex(key, math.ceil(life_time + stale_ttl + fallback_ttl), data)
+        if local_ttl is not None:
+            local_cache.set(key, data, min(local_ttl, life_time))
+        return data
+
+    def load(redis_client: RedisClient, key: str, function: Callable) -> bytes:
+        """Функция получения значения при промахе кэша"""
+        if not single_flight:
+            return compute_and_store(redis_client, key, function)
+        return single_flight_calls.do(
+            key, lambda: compute_locked(redis_client, key, function),
+        )
+
+    def refresh(redis_client: RedisClient, key: str, function: Callable) -> None:
+        """
+        Функция фонового обновления устаревшего значения
+
+        Note:
+            Если значение уже обновляет другой процесс,
+            обновление пропускается
+        """
+        if single_flight:
+            compute_locked(redis_client, key, function, wait=False)
+        else:
+            compute_and_store(redis_client, key, function)
+
+    def compute_locked(
+            redis_client: RedisClient,
+            key: str,
+            function: Callable,
+            wait: bool = True,
+    ) -> bytes | None:
+        """
+        Функция вычисления значения под блокировкой в Redis
+
+        Note:
+            Владелец блокировки перепроверяет кэш и вычисляет значение,
+            если свежего значения нет. Остальные процессы ждут появления
+            значения не дольше lock_wait, после чего вычисляют
+            его самостоятельно. Без ожидания (wait=False)
+            процесс без блокировки сразу возвращает None
+        """
+        lock = redis_client.lock(f"{key}:lock", timeout=lock_timeout)
+        if lock.acquire(blocking=False):
+            try:
+                data = redis_client.get(key)
+                if not is_fresh(redis_client, data):
+                    data = compute_and_store(redis_client, key, function)
+                return data
+            finally:
+                try:
+                    lock.release()
+                except LockError:
+                    pass
+
+        if not wait:
+            return None
+        deadline = time.monotonic() + lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(CACHE_LOCK_POLL_INTERVAL)
+            data = redis_client.get(key)
+            if is_fresh(redis_client, data, life_time + stale_ttl):
+                return data
+        return compute_and_store(redis_client, key, function)
+
     return decorator
@@ -0,0 +1,45 @@
+"""
+Модуль, содержащий учет устаревших данных,
+отданных вместо недоступного внешнего сервиса
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+
+@dataclass
+class Staleness:
+    """
+    Устаревание данных, отданных в рамках одного запроса
+
+    Attributes:
+        age: Возраст самых старых отданных данных в секундах, None - все данные свежие
+    """
+    age: float | None = None
+
+
+_staleness: ContextVar[Staleness | None] = ContextVar("staleness", default=None)
+
+
+def track_staleness() -> Staleness:
+    """
+    Функция, начинающая учет устаревших данных в текущем контексте
+
+    Note:
+        Потоки, запущенные с копией контекста, отмечают
+        устаревание в том же объекте
+    """
+    staleness = Staleness()
+    _staleness.set(staleness)
+    return staleness
+
+
+def mark_stale(age: float) -> None:
+    """
+    Функция, отмечающая отдачу устаревших данных
+
+    Args:
+        age: Возраст данных в секундах
+    """
+    staleness = _staleness.get()
+    if staleness is not None:
+        staleness.age = max(age, staleness.age or 0.0)
@@ -1,2 +1,3 @@
 """Пакет со всеми зависимостями клиента YouGile"""
 from .yougile_client import YouGileClient
+from .async_yougile_client import AsyncYouGileClient
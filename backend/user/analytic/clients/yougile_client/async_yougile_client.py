@@ -0,0 +1,252 @@
+"""
+Модуль, содержащий асинхронный класс YouGile клиента
+"""
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from core.settings import (
+    YOUGILE_API_URL, YOUGILE_CONNECT_TIMEOUT, YOUGILE_READ_TIMEOUT, YOUGILE_ASYNC_CONCURRENCY,
+    HTTP_POOL_MAXSIZE, HTTP_RETRY_TOTAL,
+    YOUGILE_RATE_LIMIT_WAIT,
+)
+from user.analytic.clients.base_client import BaseClient
+from user.analytic.clients.http_session import RETRY_STATUS_CODES, get_retry_delay
+from user.analytic.clients.yougile_client.schemas import paginated, parse_page, Task, Employee
+from user.analytic.clients.yougile_client.yougile_client import (
+    rate_limiter, get_endpoint_breaker, get_tasks_params,
+)
+
+_semaphores: dict[asyncio.AbstractEventLoop, dict[tuple[str, int], asyncio.Semaphore]] = {}
+_semaphores_lock = threading.Lock()
+
+
+class AsyncYouGileClient(BaseClient):
+    """
+    Асинхронный аналог YouGileClient
+
+    Note:
+        Используется как асинхронный контекстный менеджер,
+        внутри которого запросы идут через один пул соединений.
+        Количество одновременных запросов ограничено
+        на токен в пределах event loop
+
+    Example:
+        async with AsyncYouGileClient(token) as client:
+            pages = await client.get_employers_pages()
+    """
+
+    def __init__(
+            self,
+            token: str,
+            concurrency: int = YOUGILE_ASYNC_CONCURRENCY,
+            transport: httpx.AsyncBaseTransport | None = None,
+            rate_limit_wait: float = YOUGILE_RATE_LIMIT_WAIT,
+    ):
+        """
+        Args:
+            token: Bearer токен, необходимый для подключения к API
+            concurrency: Максимальное количество одновременных запросов с этим токеном
+            transport: Транспорт httpx, по умолчанию сетевой
+            rate_limit_wait:
+                Сколько секунд ждать свободного места в ограничении
+                частоты запросов токена, 0 - сразу бросать RateLimitExceeded
+        """
+        self._token = token
+        self._rate_limit_wait = rate_limit_wait
+        self._concurrency = concurrency
+        self._transport = transport
+        self._http: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> "AsyncYouGileClient":
+        self._http = httpx.AsyncClient(
+            base_url=YOUGILE_API_URL,
+            headers=self._get_minimal_headers(),
+            timeout=httpx.Timeout(YOUGILE_READ_TIMEOUT, connect=YOUGILE_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=HTTP_POOL_MAXSIZE),
+            transport=self._transport,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._http.aclose()
+        self._http = None
+
+    def get_cache_identity(self) -> str:
+        """
+        Метод получения идентичности клиента
+
+        Note:
+            Совпадает с идентичностью YouGileClient
+            с тем же токеном
+        """
+        return hashlib.sha256(self._token.encode()).hexdigest()
+
+    def _get_minimal_headers(self) -> dict[str, Any]:
+        """
+        Метод, подготавливающий минимально
+        необходимые headers, для общения с API
+        """
+        return {
+            'Authorization': f'Bearer {self._token}',
+            'Content-Type': 'application/json'
+        }
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Метод получения общего для токена ограничителя одновременных запросов
+
+        Note:
+            Ограничитель общий для клиентов с одинаковыми токеном
+            и concurrency, клиент с другим concurrency получает свой.
+            Ожидавший ограничитель ссылается на свой event loop,
+            поэтому ограничители закрытых loop забываются
+            при первом запросе в новом loop
+        """
+        loop = asyncio.get_running_loop()
+        semaphores = _semaphores.get(loop)
+        if semaphores is None:
+            with _semaphores_lock:
+                for closed in [other for other in _semaphores if other.is_closed()]:
+                    del _semaphores[closed]
+                semaphores = _semaphores.setdefault(loop, {})
+        return semaphores.setdefault(
+            (self.get_cache_identity(), self._concurrency),
+            asyncio.Semaphore(self._concurrency),
+        )
+
+    async def _get(self, path: str, params: dict[str, Any]) -> bytes:
+        """
+        Метод, производящий GET запрос к API с повторами
+
+        Args:
+            path: Путь конечной точки относительно корня API
+            params: Query параметры запроса
+
+        Returns:
+            Сырое тело ответа, которое валидируется без промежуточного словаря
+
+        Raises:
+            RateLimitExceeded: Ограничение частоты не освободится за rate_limit_wait
+            CircuitOpen: Выключатель конечной точки разомкнут
+        """
+        params = {key: val for key, val in params.items() if val is not None}
+        breaker = get_endpoint_breaker(path)
+        identity = self.get_cache_identity()
+        error = None
+        async with self._get_semaphore():
+            for attempt in range(HTTP_RETRY_TOTAL + 1):
+                if error is not None:
+                    retry_after = error.response.headers.get("Retry-After")
+                    await asyncio.sleep(get_retry_delay(retry_after, attempt - 1))
+                await rate_limiter.acquire_async(identity, timeout=self._rate_limit_wait)
+                try:
+                    with breaker.guard():
+                        response = await self._http.get(f"/{path}", params=params)
+                        response.raise_for_status()
+                    return response.content
+                except httpx.HTTPStatusError as exc:
+                    if exc.response.status_code not in RETRY_STATUS_CODES:
+                        raise
+                    error = exc
+        raise error
+
+    # pylint: disable=R0913
+    async def get_tasks(
+            self,
+            column_id: str = "",
+            include_deleted: bool = False,
+            limit: int = 50,
+            offset: int = 0,
+            title: str = "",
+    ) -> paginated(Task):
+        """
+        Метод, производящий запрос к конечной
+        точке, предоставляющей список задач
+
+        Args:
+            column_id:
+                Идентификатор колонки (берется из API),
+                из которой нужно получить задачи
+            include_deleted: Включать ли в список удаленные задачи
+            limit: Количество задач на странице
+            offset: С какой задачи по ее номеру в списке начнется страница
+            title: Название задачи
+        """
+        content = await self._get(
+            "tasks", params=get_tasks_params(column_id, include_deleted, limit, offset, title),
+        )
+        return parse_page(Task, content)
+
+    async def get_employers(
+            self,
+            email: str = "",
+            limit: int = 50,
+            offset: int = 0,
+            project_ref_id: str = None,
+    ) -> paginated(Employee):
+        """
+        Метод, производящий запрос к конечной
+        точке, предоставляющей список сотрудников
+
+        Args:
+            email: Почта сотрудника
+            limit: Количество сотрудника на странице
+            offset: С какого сотрудника по его номеру в списке начнется страница
+            project_ref_id:
+                Идентификатор проекта (берется из API),
+                сотрудников которого мы хотим получить
+        """
+        content = await self._get("users", params={
+            "email": email,
+            "limit": limit,
+            "offset": offset,
+            "projectId": project_ref_id,
+        })
+        return parse_page(Employee, content)
+
+    @staticmethod
+    async def _get_pages(get_page: Callable[..., Awaitable[Any]], limit: int) -> list[Any]:
+        """
+        Метод получения всех страниц выборки
+
+        Note:
+            Первая страница запрашивается отдельно, чтобы узнать
+            paging.count, остальные смещения запрашиваются
+            одновременно в пределах ограничения на токен
+
+        Args:
+            get_page: Метод получения страницы по limit и offset
+            limit: Размер страницы
+        """
+        first = await get_page(limit=limit, offset=0)
+        if not first.paging.next:
+            return [first]
+        rest = await asyncio.gather(*(
+            get_page(limit=limit, offset=offset)
+            for offset in range(limit, first.paging.count, limit)
+        ))
+        return [first, *rest]
+
+    async def get_tasks_pages(self, limit: int = 50, **kwargs) -> list[paginated(Task)]:
+        """
+        Метод получения всех страниц задач
+
+        Args:
+            limit: Размер страницы
+            kwargs: Фильтры get_tasks
+        """
+        return await self._get_pages(lambda **page: self.get_tasks(**kwargs, **page), limit)
+
+    async def get_employers_pages(self, limit: int = 50, **kwargs) -> list[paginated(Employee)]:
+        """
+        Метод получения всех страниц сотрудников
+
+        Args:
+            limit: Размер страницы
+            kwargs: Фильтры get_employers
+        """
+        return await self._get_pages(lambda **page: self.get_employers(**kwargs, **page), limit)
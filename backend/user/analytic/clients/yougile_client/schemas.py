@@ -2,35 +2,44 @@
 Модуль, содержащий схемы, используемые
 при работе YouGile клиента
 """
+from functools import lru_cache
+from typing import Any
+
 from pydantic import BaseModel, field_serializer
 
 
+class Paging(BaseModel):
+    """
+    Схема, отвечающая за сохранение
+    информации о состоянии пагинации
+
+    Attributes:
+        count: Общее количество объектов в выборке
+        limit: Количество объектов на странице
+        offset: Номер объекта, с которого начинаются объекты на страницы
+        next: Есть ли следующие страницы
+    """
+    count: int
+    limit: int
+    offset: int
+    next: bool
+
+
+@lru_cache(maxsize=None)
 def paginated(schema: type) -> type:
     """
     Функция, создающая схему пагинированного списка
     объектов, на основе одного объекта
 
+    Note:
+        Схема создается один раз на схему объекта,
+        поэтому ее валидатор компилируется тоже один раз
+
     Args:
         schema:
             Объект, используемый для пагинации
     """
 
-    class Paging(BaseModel):
-        """
-        Схема, отвечающая за сохранение
-        информации о состоянии пагинации
-
-        Attributes:
-            count: Общее количество объектов в выборке
-            limit: Количество объектов на странице
-            offset: Номер объекта, с которого начинаются объекты на страницы
-            next: Есть ли следующие страницы
-        """
-        count: int
-        limit: int
-        offset: int
-        next: bool
-
     class PaginatedSchema(BaseModel):
         """
         Схема контейнера пагинации
@@ -42,9 +51,27 @@ def paginated(schema: type) -> type:
         paging: Paging
         content: list[schema]
 
+    PaginatedSchema.__name__ = PaginatedSchema.__qualname__ = f"Paginated{schema.__name__}"
     return PaginatedSchema
 
 
+def parse_page(schema: type, data: bytes | dict[str, Any]) -> BaseModel:
+    """
+    Функция полной валидации страницы
+
+    Note:
+        Сырые байты ответа разбираются JSON парсером
+        pydantic-core напрямую, без промежуточных словарей
+
+    Args:
+        schema: Схема объекта страницы
+        data: Тело ответа в байтах или уже декодированный JSON
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return paginated(schema).model_validate_json(data)
+    return paginated(schema).model_validate(data)
+
+
 class Task(BaseModel):
     """
     Обобщенная схема 'задачи', приходящей из YouGile API
@@ -84,3 +111,89 @@ class Employee(BaseModel):
     id: str
     email: str
     realName: str
+
+
+class TaskRecord:
+    """
+    Облегченная запись 'задачи' без валидации
+
+    Note:
+        Используется на горячих путях метрик для ответов
+        доверенного API, когда полная валидация не нужна
+
+    Attributes:
+        completed: Завершена ли задача
+        assigned: Список UUID пользователей, подписанных на задачу
+    """
+    __slots__ = ("completed", "assigned")
+
+    def __init__(self, completed: bool, assigned: list[str] | str = ()):
+        self.completed = completed
+        self.assigned = assigned
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "TaskRecord":
+        """
+        Метод создания записи из JSON объекта API
+
+        Args:
+            data: JSON объект задачи
+        """
+        return cls(data["completed"], data.get("assigned", []))
+
+
+class EmployeeRecord:
+    """
+    Облегченная запись 'работника' без валидации
+
+    Attributes:
+        id: Идентификатор работника
+        email: Почтовый ящик работника
+        realName: Имя работника
+    """
+    __slots__ = ("id", "email", "realName")
+
+    # pylint: disable=C0103
+    def __init__(self, id: str, email: str, realName: str):  # pylint: disable=W0622
+        self.id = id
+        self.email = email
+        self.realName = realName
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "EmployeeRecord":
+        """
+        Метод создания записи из JSON объекта API
+
+        Args:
+            data: JSON объект работника
+        """
+        return cls(data["id"], data["email"], data["realName"])
+
+
+class PageRecord:
+    """
+    Облегченная страница записей без валидации
+
+    Attributes:
+        paging: Схема состояния пагинации
+        content: Список записей
+    """
+    __slots__ = ("paging", "content")
+
+    def __init__(self, paging: Paging, content: list):
+        self.paging = paging
+        self.content = content
+
+
+def parse_trusted_page(record: type, data: dict[str, Any]) -> PageRecord:
+    """
+    Функция разбора страницы доверенного API без валидации объектов
+
+    Args:
+        record: Класс облегченной записи объекта
+        data: Декодированный JSON страницы
+    """
+    return PageRecord(
+        paging=Paging(**data["paging"]),
+        content=[record.from_json(item) for item in data["content"]],
+    )
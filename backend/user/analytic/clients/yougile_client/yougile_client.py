@@ -1,13 +1,84 @@
 """
 Модуль, содержащий класс YouGile клиента
 """
-from typing import Any
+import contextvars
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator
 
+import httpx
 import requests
 
+from core.settings import (
+    YOUGILE_API_URL, YOUGILE_CONNECT_TIMEOUT, YOUGILE_READ_TIMEOUT,
+    YOUGILE_RATE_LIMIT, YOUGILE_RATE_BURST, YOUGILE_RATE_LIMIT_WAIT, YOUGILE_CACHE_FALLBACK_TTL,
+    HTTP_RETRY_TOTAL,
+)
 from user.analytic.clients.base_client import BaseClient
-from user.analytic.clients.redis_client import redis_cache
-from user.analytic.clients.yougile_client.schemas import paginated, Task, Employee
+from user.analytic.clients.http_session import RETRY_STATUS_CODES, get_session, get_retry_delay
+from user.analytic.clients.circuit_breaker import CircuitBreaker, CircuitOpen, get_circuit_breaker
+from user.analytic.clients.rate_limiter import RateLimiter, RateLimitExceeded
+from user.analytic.clients.redis_client import (
+    redis_cache, get_project_namespace, get_token_namespace,
+)
+from user.analytic.clients.yougile_client.schemas import (
+    paginated, parse_page, parse_trusted_page, Task, Employee,
+    TaskRecord, EmployeeRecord, PageRecord,
+)
+
+CACHE_LIFE_TIME = 10
+CACHE_STALE_TTL = 50
+
+FALLBACK_ON = (CircuitOpen, RateLimitExceeded, requests.RequestException)
+
+rate_limiter = RateLimiter("yougile-rate-limit", YOUGILE_RATE_LIMIT, YOUGILE_RATE_BURST)
+
+
+def is_upstream_failure(exc: Exception) -> bool:
+    """
+    Функция проверки, что исключение запроса говорит о сбое YouGile,
+    а не об ошибке самого запроса, например неверном токене
+
+    Args:
+        exc: Исключение запроса
+    """
+    if isinstance(exc, (requests.HTTPError, httpx.HTTPStatusError)) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return isinstance(exc, (requests.RequestException, httpx.TransportError, OSError))
+
+
+def get_endpoint_breaker(path: str) -> CircuitBreaker:
+    """
+    Функция получения выключателя конечной точки YouGile
+
+    Args:
+        path: Путь конечной точки относительно корня API
+    """
+    return get_circuit_breaker(f"yougile:{path}", is_failure=is_upstream_failure)
+
+
+def get_tasks_params(
+        column_id: str, include_deleted: bool, limit: int, offset: int, title: str,
+) -> dict[str, Any]:
+    """
+    Функция сборки query параметров конечной точки задач,
+    общая для синхронного и асинхронного клиентов
+
+    Args:
+        column_id: Идентификатор колонки, из которой нужно получить задачи
+        include_deleted: Включать ли в список удаленные задачи
+        limit: Количество задач на странице
+        offset: С какой задачи по ее номеру в списке начнется страница
+        title: Название задачи
+    """
+    return {
+        "columnId": column_id,
+        "includeDeleted": include_deleted,
+        "limit": limit,
+        "offset": offset,
+        "title": title,
+    }
 
 
 class YouGileClient(BaseClient):
@@ -16,12 +87,49 @@ class YouGileClient(BaseClient):
     предоставление унифицированного
     доступа к YouGile API
     """
-    def __init__(self, token: str):
+    def __init__(
+            self,
+            token: str,
+            rate_limit_wait: float = YOUGILE_RATE_LIMIT_WAIT,
+            project_id: int | None = None,
+    ):
         """
         Args:
              token: Bearer токен, необходимый для подключения к API
+             rate_limit_wait:
+                Сколько секунд ждать свободного места в ограничении
+                частоты запросов токена, 0 - сразу бросать RateLimitExceeded
+             project_id:
+                Идентификатор проекта, от имени которого работает клиент.
+                Кэш такого клиента сбрасывается вместе с кэшем проекта
         """
         self._token = token
+        self._rate_limit_wait = rate_limit_wait
+        self._project_id = project_id
+
+    @property
+    def project_id(self) -> int | None:
+        """Идентификатор проекта, от имени которого работает клиент"""
+        return self._project_id
+
+    def get_cache_identity(self) -> str:
+        """
+        Метод получения идентичности клиента,
+        подставляемой вместо self в ключи кэша
+
+        Note:
+            Ответы API определяются только токеном,
+            поэтому клиенты с одинаковым токеном разделяют кэш.
+            Сам токен в ключ не попадает, только его хэш
+        """
+        return hashlib.sha256(self._token.encode()).hexdigest()
+
+    def get_cache_namespaces(self) -> tuple[str, ...]:
+        """Метод получения пространств имен кэша клиента: токена и проекта"""
+        namespaces = (get_token_namespace(self._token),)
+        if self._project_id is not None:
+            namespaces += (get_project_namespace(self._project_id),)
+        return namespaces
 
     def _get_minimal_headers(self) -> dict[str, Any]:
         """
@@ -33,8 +141,55 @@ class YouGileClient(BaseClient):
             'Content-Type': 'application/json'
         }
 
+    def _get(self, path: str, params: dict[str, Any]) -> dict[str, Any]:
+        """
+        Метод, производящий GET запрос к API
+
+        Note:
+            Запрос идет через общую для процесса сессию
+            с keep-alive соединениями и таймаутами.
+            Перед каждой попыткой, включая повторы по статусу
+            ответа, берется токен из общего для всех процессов
+            ограничителя частоты по хэшу токена.
+            Запрос идет через выключатель конечной точки,
+            который при сбоях YouGile перестает пропускать запросы
+
+        Args:
+            path: Путь конечной точки относительно корня API
+            params: Query параметры запроса
+
+        Raises:
+            RateLimitExceeded: Ограничение частоты не освободится за rate_limit_wait
+            CircuitOpen: Выключатель конечной точки разомкнут
+        """
+        breaker = get_endpoint_breaker(path)
+        error = None
+        for attempt in range(HTTP_RETRY_TOTAL + 1):
+            if error is not None:
+                retry_after = error.response.headers.get("Retry-After")
+                time.sleep(get_retry_delay(retry_after, attempt - 1))
+            rate_limiter.acquire(self.get_cache_identity(), timeout=self._rate_limit_wait)
+            try:
+                with breaker.guard():
+                    response = get_session().get(
+                        f"{YOUGILE_API_URL}/{path}",
+                        headers=self._get_minimal_headers(),
+                        params=params,
+                        timeout=(YOUGILE_CONNECT_TIMEOUT, YOUGILE_READ_TIMEOUT),
+                    )
+                    response.raise_for_status()
+                return response.json()
+            except requests.HTTPError as exc:
+                if exc.response.status_code not in RETRY_STATUS_CODES:
+                    raise
+                error = exc
+        raise error
+
     # pylint: disable=R0913
-    @redis_cache(10)
+    @redis_cache(
+        CACHE_LIFE_TIME, local_ttl=5, single_flight=True, stale_ttl=CACHE_STALE_TTL,
+        fallback_ttl=YOUGILE_CACHE_FALLBACK_TTL, fallback_on=FALLBACK_ON,
+    )
     def _get_tasks(
             self,
             column_id: str = "",
@@ -51,7 +206,9 @@ class YouGileClient(BaseClient):
             Важно отметить, что отдельный метод
             существует для декорирования посредством redis_cache,
             который, в свою очередь, на время запоминает
-            результат для последующего перепредоставления
+            результат для последующего перепредоставления.
+            Если YouGile недоступен, отдается последний
+            удачный ответ не старше YOUGILE_CACHE_FALLBACK_TTL
 
         Args:
             column_id:
@@ -62,19 +219,9 @@ class YouGileClient(BaseClient):
             offset: С какой задачи по ее номеру в списке начнется страница
             title: Название задачи
         """
-        # pylint: disable=W3101
-        json = requests.get(
-            "https://ru.yougile.com/api-v2/tasks",
-            headers=self._get_minimal_headers(),
-            params={
-                "columnId": column_id,
-                "includeDeleted": include_deleted,
-                "limit": limit,
-                "offset": offset,
-                "title": title,
-            }
-        ).json()
-        return json
+        return self._get(
+            "tasks", params=get_tasks_params(column_id, include_deleted, limit, offset, title),
+        )
 
     # pylint: disable=R0913
     def get_tasks(
@@ -84,11 +231,18 @@ class YouGileClient(BaseClient):
             limit: int = 50,
             offset: int = 0,
             title: str = "",
-    ) -> paginated(Task):
+            trusted: bool = False,
+    ) -> paginated(Task) | PageRecord:
         """
         Метод, производящий запрос к конечной
         точке, предоставляющей список задач
 
+        Note:
+            В отличие от AsyncYouGileClient, страница валидируется
+            из словаря, а не из сырых байт ответа: в кэше redis_cache
+            лежит декодированный JSON, который нужен кодеку json
+            и облегченным записям, поэтому байт ответа здесь уже нет
+
         Args:
             column_id:
                 Идентификатор колонки (берется из API),
@@ -97,6 +251,9 @@ class YouGileClient(BaseClient):
             limit: Количество задач на странице
             offset: С какой задачи по ее номеру в списке начнется страница
             title: Название задачи
+            trusted:
+                Собрать ли страницу из облегченных записей TaskRecord
+                без валидации, для горячих путей метрик
         """
         json = self._get_tasks(
             column_id=column_id,
@@ -105,10 +262,14 @@ class YouGileClient(BaseClient):
             offset=offset,
             title=title,
         )
-        schema = paginated(Task)(**json)
-        return schema
+        if trusted:
+            return parse_trusted_page(TaskRecord, json)
+        return parse_page(Task, json)
 
-    @redis_cache(10)
+    @redis_cache(
+        CACHE_LIFE_TIME, local_ttl=5, single_flight=True, stale_ttl=CACHE_STALE_TTL,
+        fallback_ttl=YOUGILE_CACHE_FALLBACK_TTL, fallback_on=FALLBACK_ON,
+    )
     def _get_employers(
             self,
             email: str = "",
@@ -124,7 +285,9 @@ class YouGileClient(BaseClient):
             Важно отметить, что отдельный метод
             существует для декорирования посредством redis_cache,
             который, в свою очередь, на время запоминает
-            результат для последующего перепредоставления
+            результат для последующего перепредоставления.
+            Если YouGile недоступен, отдается последний
+            удачный ответ не старше YOUGILE_CACHE_FALLBACK_TTL
 
         Args:
             email: Почта сотрудника
@@ -134,18 +297,12 @@ class YouGileClient(BaseClient):
                 Идентификатор проекта (берется из API),
                 сотрудников которого мы хотим получить
         """
-        # pylint: disable=W3101
-        json = requests.get(
-            "https://ru.yougile.com/api-v2/users",
-            headers=self._get_minimal_headers(),
-            params={
-                "email": email,
-                "limit": limit,
-                "offset": offset,
-                "projectId": project_ref_id,
-            }
-        ).json()
-        return json
+        return self._get("users", params={
+            "email": email,
+            "limit": limit,
+            "offset": offset,
+            "projectId": project_ref_id,
+        })
 
     def get_employers(
             self,
@@ -153,7 +310,8 @@ class YouGileClient(BaseClient):
             limit: int = 50,
             offset: int = 0,
             project_ref_id: str = None,
-    ) -> paginated(Employee):
+            trusted: bool = False,
+    ) -> paginated(Employee) | PageRecord:
         """
         Метод, производящий запрос к конечной
         точке, предоставляющей список сотрудников
@@ -165,6 +323,9 @@ class YouGileClient(BaseClient):
             project_ref_id:
                 Идентификатор проекта (берется из API),
                 сотрудников которого мы хотим получить
+            trusted:
+                Собрать ли страницу из облегченных записей
+                EmployeeRecord без валидации
         """
         json = self._get_employers(
             email=email,
@@ -172,5 +333,77 @@ class YouGileClient(BaseClient):
             offset=offset,
             project_ref_id=project_ref_id,
         )
-        schema = paginated(Employee)(**json)
-        return schema
+        if trusted:
+            return parse_trusted_page(EmployeeRecord, json)
+        return parse_page(Employee, json)
+
+    @staticmethod
+    def _iter_pages(get_page: Callable[..., Any], limit: int, prefetch: bool) -> Iterator[Any]:
+        """
+        Метод обхода всех страниц выборки
+
+        Note:
+            При prefetch следующая страница запрашивается
+            в фоновом потоке, пока обрабатывается текущая,
+            так что в памяти одновременно не больше двух страниц
+
+        Args:
+            get_page: Метод получения страницы по limit и offset
+            limit: Размер страницы
+            prefetch: Запрашивать ли следующую страницу заранее
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page, offset = get_page(limit=limit, offset=0), limit
+            while True:
+                next_page = None
+                if page.paging.next and executor is not None:
+                    next_page = executor.submit(
+                        contextvars.copy_context().run, get_page, limit=limit, offset=offset,
+                    )
+                yield page
+                if not page.paging.next:
+                    return
+                page = next_page.result() if next_page else get_page(limit=limit, offset=offset)
+                offset += limit
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_tasks(
+            self,
+            limit: int = 50,
+            prefetch: bool = True,
+            **kwargs,
+    ) -> Iterator[Task | TaskRecord]:
+        """
+        Метод обхода всех задач выборки по одной
+
+        Args:
+            limit: Размер запрашиваемой страницы
+            prefetch: Запрашивать ли следующую страницу заранее
+            kwargs: Фильтры и параметры get_tasks
+        """
+        for page in self._iter_pages(
+                lambda **page: self.get_tasks(**kwargs, **page), limit, prefetch,
+        ):
+            yield from page.content
+
+    def iter_employers(
+            self,
+            limit: int = 50,
+            prefetch: bool = True,
+            **kwargs,
+    ) -> Iterator[Employee | EmployeeRecord]:
+        """
+        Метод обхода всех сотрудников выборки по одному
+
+        Args:
+            limit: Размер запрашиваемой страницы
+            prefetch: Запрашивать ли следующую страницу заранее
+            kwargs: Фильтры и параметры get_employers
+        """
+        for page in self._iter_pages(
+                lambda **page: self.get_employers(**kwargs, **page), limit, prefetch,
+        ):
+            yield from page.content
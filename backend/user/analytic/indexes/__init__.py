@@ -0,0 +1,4 @@
+"""
+Пакет, содержащий индексы, заранее
+агрегирующие данные внешних интеграций
+"""
@@ -0,0 +1,123 @@
+"""
+Модуль, содержащий колоночное представление задач
+"""
+from typing import Iterable
+
+import numpy as np
+
+from user.analytic.clients.yougile_client.schemas import Task, TaskRecord
+
+
+class TaskColumns:
+    """
+    Колоночное представление задач для векторного
+    расчета метрик по всем сотрудникам сразу
+
+    Note:
+        Назначения хранятся в CSR виде: строки задач
+        исполнителя assignees[i] лежат в
+        task_rows[assignee_ptr[i]:assignee_ptr[i + 1]]
+
+    Attributes:
+        completed: Выполнена ли задача, по строкам задач
+        assignees: Идентификаторы исполнителей
+        assignee_ptr: Границы строк задач исполнителей в task_rows
+        task_rows: Строки задач, сгруппированные по исполнителям
+    """
+
+    def __init__(
+            self,
+            completed: np.ndarray,
+            assignees: list[str],
+            assignee_ptr: np.ndarray,
+            task_rows: np.ndarray,
+    ):
+        """
+        Args:
+            completed: Выполнена ли задача, по строкам задач
+            assignees: Идентификаторы исполнителей
+            assignee_ptr: Границы строк задач исполнителей в task_rows
+            task_rows: Строки задач, сгруппированные по исполнителям
+        """
+        self.completed = completed
+        self.assignees = assignees
+        self.assignee_ptr = assignee_ptr
+        self.task_rows = task_rows
+        self._positions = {ref_id: i for i, ref_id in enumerate(assignees)}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task | TaskRecord]) -> "TaskColumns":
+        """
+        Метод построения представления за один проход по задачам
+
+        Args:
+            tasks: Задачи
+        """
+        completed: list[bool] = []
+        positions: dict[str, int] = {}
+        entry_assignees: list[int] = []
+        entry_rows: list[int] = []
+        for row, task in enumerate(tasks):
+            completed.append(task.completed)
+            assigned = task.assigned if isinstance(task.assigned, list) else [task.assigned]
+            for ref_id in dict.fromkeys(assigned):
+                entry_assignees.append(positions.setdefault(ref_id, len(positions)))
+                entry_rows.append(row)
+
+        entry_assignees = np.asarray(entry_assignees, dtype=np.int64)
+        order = np.argsort(entry_assignees, kind="stable")
+        assignee_ptr = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(entry_assignees, minlength=len(positions)), out=assignee_ptr[1:])
+        return cls(
+            completed=np.asarray(completed, dtype=bool),
+            assignees=list(positions),
+            assignee_ptr=assignee_ptr,
+            task_rows=np.asarray(entry_rows, dtype=np.int64)[order],
+        )
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def get_rows(self, ref_id: str) -> np.ndarray:
+        """
+        Метод получения строк задач исполнителя
+
+        Args:
+            ref_id: Идентификатор исполнителя
+        """
+        position = self._positions.get(ref_id)
+        if position is None:
+            return self.task_rows[:0]
+        return self.task_rows[self.assignee_ptr[position]:self.assignee_ptr[position + 1]]
+
+    def count_by_assignee(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """
+        Метод подсчета задач каждого исполнителя
+
+        Args:
+            mask: Учитываемые задачи, по строкам задач. По умолчанию все
+
+        Returns:
+            Количество задач по порядку assignees
+        """
+        if mask is None:
+            return np.diff(self.assignee_ptr)
+        entry_assignees = np.repeat(np.arange(len(self.assignees)), np.diff(self.assignee_ptr))
+        return np.bincount(
+            entry_assignees[mask[self.task_rows]],
+            minlength=len(self.assignees),
+        )
+
+    def count_for(self, ref_ids: Iterable[str], mask: np.ndarray | None = None) -> dict[str, int]:
+        """
+        Метод подсчета задач заданных исполнителей
+
+        Args:
+            ref_ids: Идентификаторы исполнителей
+            mask: Учитываемые задачи, по строкам задач. По умолчанию все
+        """
+        counts = self.count_by_assignee(mask)
+        return {
+            ref_id: int(counts[self._positions[ref_id]]) if ref_id in self._positions else 0
+            for ref_id in ref_ids
+        }
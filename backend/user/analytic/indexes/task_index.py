@@ -0,0 +1,266 @@
+"""
+Модуль, содержащий индекс задач проекта
+"""
+import time
+from contextlib import suppress
+from typing import Iterable
+
+from asgiref.sync import sync_to_async
+from pydantic import BaseModel
+from redis.exceptions import LockError
+
+from user.analytic.clients.redis_client import (
+    RedisClient, single_flight_calls, background_refresher, cache_namespaces,
+    get_project_namespace, CACHE_LOCK_POLL_INTERVAL,
+)
+from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.clients.yougile_client.yougile_client import CACHE_LIFE_TIME, CACHE_STALE_TTL
+from user.analytic.indexes.task_columns import TaskColumns
+
+TASK_INDEX_PREFIX = "task-index"
+BUILT_AT_FIELD = "__built_at__"
+
+
+class AssigneeTaskCounters(BaseModel):
+    """
+    Счетчики задач одного исполнителя
+
+    Attributes:
+        completed: Количество выполненных задач
+        open: Количество невыполненных задач
+        total: Общее количество задач
+    """
+    completed: int = 0
+    open: int = 0
+    total: int = 0
+
+
+class TaskIndex:
+    """
+    Индекс задач проекта: счетчики задач
+    по исполнителям в хэше Redis
+
+    Note:
+        Индекс строится за один проход по задачам, счетчики
+        всех исполнителей считаются векторно по TaskColumns, и индекс
+        атомарно подменяет предыдущую версию. Чтение
+        счетчиков сотрудника - один HMGET. Индекс старше
+        life_time отдается как есть и перестраивается в фоне,
+        индекс старше life_time + stale_ttl удаляется Redis.
+        У каждого проекта свой индекс, клиент без проекта
+        индексирует задачи своего токена
+
+    Attributes:
+        client: Клиент, задачи которого индексируются
+        key: Ключ хэша индекса, включающий поколения пространств имен клиента
+        life_time: Время, в течение которого индекс считается свежим
+        stale_ttl: Сколько после life_time индекс еще можно отдавать
+    """
+
+    # pylint: disable=R0913
+    def __init__(
+            self,
+            client: YouGileClient,
+            life_time: int = CACHE_LIFE_TIME,
+            stale_ttl: int = CACHE_STALE_TTL,
+            lock_wait: float = 2,
+            identity: str | None = None,
+    ):
+        """
+        Args:
+            client: Клиент, задачи которого индексируются
+            life_time: Время, в течение которого индекс считается свежим
+            stale_ttl: Сколько после life_time индекс еще можно отдавать
+            lock_wait: Сколько ждать построения индекса другим процессом
+            identity: Уже полученная идентичность клиента для ключа кэша
+        """
+        self.client = client
+        self.key = self.get_key(client, identity or cache_namespaces.get_identity(client))
+        self.life_time = life_time
+        self.stale_ttl = stale_ttl
+        self.lock_wait = lock_wait
+
+    @classmethod
+    async def aopen(cls, client: YouGileClient, **kwargs) -> "TaskIndex":
+        """
+        Метод создания индекса без блокирующего
+        чтения поколений пространств имен клиента
+
+        Args:
+            client: Клиент, задачи которого индексируются
+            kwargs: Остальные аргументы индекса
+        """
+        return cls(client, identity=await cache_namespaces.aget_identity(client), **kwargs)
+
+    @staticmethod
+    def get_key(client: YouGileClient, identity: str) -> str:
+        """
+        Метод получения ключа хэша индекса
+
+        Args:
+            client: Клиент, задачи которого индексируются
+            identity: Идентичность клиента с поколениями его пространств имен
+        """
+        if client.project_id is None:
+            return f"{TASK_INDEX_PREFIX}:{identity}"
+        return f"{TASK_INDEX_PREFIX}:{get_project_namespace(client.project_id)}:{identity}"
+
+    @staticmethod
+    def get_field(ref_id: str, counter: str) -> str:
+        """
+        Метод получения имени поля хэша
+
+        Args:
+            ref_id: Идентификатор исполнителя
+            counter: Имя счетчика
+        """
+        return f"{ref_id}:{counter}"
+
+    def build(self) -> None:
+        """Метод построения индекса за один проход по задачам"""
+        columns = TaskColumns.from_tasks(self.client.iter_tasks(trusted=True))
+        counts = {
+            "completed": columns.count_by_assignee(columns.completed),
+            "open": columns.count_by_assignee(~columns.completed),
+            "total": columns.count_by_assignee(),
+        }
+        mapping = {
+            self.get_field(ref_id, name): int(values[i])
+            for name, values in counts.items()
+            for i, ref_id in enumerate(columns.assignees)
+        }
+        mapping[BUILT_AT_FIELD] = time.time()
+        building_key = f"{self.key}:building"
+        with RedisClient().pipeline(transaction=True) as pipe:
+            pipe.delete(building_key)
+            pipe.hset(building_key, mapping=mapping)
+            pipe.expire(building_key, self.life_time + self.stale_ttl)
+            pipe.rename(building_key, self.key)
+            pipe.execute()
+
+    def refresh(self, wait: bool = True) -> None:
+        """
+        Метод перестроения индекса под блокировкой в Redis
+
+        Note:
+            Владелец блокировки строит индекс, остальные процессы
+            ждут его не дольше lock_wait и строят сами.
+            Без ожидания (wait=False) процесс без блокировки
+            сразу завершается
+
+        Args:
+            wait: Ждать ли построения индекса другим процессом
+        """
+        redis_client = RedisClient()
+        lock = redis_client.lock(f"{self.key}:lock", timeout=60)
+        if lock.acquire(blocking=False):
+            try:
+                self.build()
+            finally:
+                with suppress(LockError):
+                    lock.release()
+            return
+        if not wait:
+            return
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(CACHE_LOCK_POLL_INTERVAL)
+            if redis_client.hexists(self.key, BUILT_AT_FIELD):
+                return
+        self.build()
+
+    def get_many(self, ref_ids: Iterable[str]) -> dict[str, AssigneeTaskCounters]:
+        """
+        Метод получения счетчиков нескольких исполнителей
+
+        Args:
+            ref_ids: Идентификаторы исполнителей
+        """
+        ref_ids = list(ref_ids)
+        fields = self._get_fields(ref_ids)
+        built_at, *values = RedisClient().hmget(self.key, fields)
+        if built_at is None:
+            single_flight_calls.do(self.key, self.refresh)
+            built_at, *values = RedisClient().hmget(self.key, fields)
+        elif time.time() - float(built_at) > self.life_time:
+            background_refresher.submit(self.key, lambda: self.refresh(wait=False))
+        return self._parse_counters(ref_ids, values)
+
+    async def aget_many(self, ref_ids: Iterable[str]) -> dict[str, AssigneeTaskCounters]:
+        """
+        Асинхронный аналог get_many
+
+        Note:
+            Чтение построенного индекса не блокирует event loop.
+            Построение отсутствующего индекса - обход страниц
+            задач с кэшем и векторный подсчет - выполняется
+            в пуле потоков, устаревший индекс по-прежнему
+            перестраивается в фоне
+
+        Args:
+            ref_ids: Идентификаторы исполнителей
+        """
+        ref_ids = list(ref_ids)
+        fields = self._get_fields(ref_ids)
+        redis_client = RedisClient.get_async_client()
+        built_at, *values = await redis_client.hmget(self.key, fields)
+        if built_at is None:
+            single_flight = sync_to_async(single_flight_calls.do, thread_sensitive=False)
+            await single_flight(self.key, self.refresh)
+            built_at, *values = await redis_client.hmget(self.key, fields)
+        elif time.time() - float(built_at) > self.life_time:
+            background_refresher.submit(self.key, lambda: self.refresh(wait=False))
+        return self._parse_counters(ref_ids, values)
+
+    def _get_fields(self, ref_ids: list[str]) -> list[str]:
+        """
+        Метод получения полей хэша, читаемых для исполнителей
+
+        Args:
+            ref_ids: Идентификаторы исполнителей
+        """
+        return [BUILT_AT_FIELD] + [
+            self.get_field(ref_id, name)
+            for ref_id in ref_ids
+            for name in AssigneeTaskCounters.model_fields
+        ]
+
+    @staticmethod
+    def _parse_counters(
+            ref_ids: list[str],
+            values: list[bytes | None],
+    ) -> dict[str, AssigneeTaskCounters]:
+        """
+        Метод разбора прочитанных полей хэша в счетчики
+
+        Args:
+            ref_ids: Идентификаторы исполнителей
+            values: Значения полей без BUILT_AT_FIELD
+        """
+        counter_names = list(AssigneeTaskCounters.model_fields)
+        step = len(counter_names)
+        return {
+            ref_id: AssigneeTaskCounters(**{
+                name: int(value or 0)
+                for name, value in zip(counter_names, values[i * step:(i + 1) * step])
+            })
+            for i, ref_id in enumerate(ref_ids)
+        }
+
+    def get(self, ref_id: str) -> AssigneeTaskCounters:
+        """
+        Метод получения счетчиков исполнителя
+
+        Args:
+            ref_id: Идентификатор исполнителя
+        """
+        return self.get_many([ref_id])[ref_id]
+
+    async def aget(self, ref_id: str) -> AssigneeTaskCounters:
+        """
+        Асинхронный аналог get
+
+        Args:
+            ref_id: Идентификатор исполнителя
+        """
+        return (await self.aget_many([ref_id]))[ref_id]
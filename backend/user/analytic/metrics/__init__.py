@@ -2,3 +2,6 @@
 Пакет, содержащий основные метрики,
 который можно получить по сотрудникам
 """
+from .registry import metric_registry
+from .planner import MetricPlanner
+from .count_of_complete_tasks import CountOfCompleteTasks
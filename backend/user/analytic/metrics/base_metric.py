@@ -4,6 +4,7 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from pydantic import BaseModel
 
 
@@ -13,8 +14,12 @@ class BaseMetric(ABC):
 
     Attributes:
         PARAMS_KWARGS_OBJ: Схема аргументов блока методов get_*_params
+        NAME: Имя, под которым метрика зарегистрирована
+        DATASETS: Наборы данных, необходимые для группового расчета
     """
     PARAMS_KWARGS_OBJ: type = BaseModel
+    NAME: str = ""
+    DATASETS: tuple[str, ...] = ()
 
     @abstractmethod
     def calculate(self, *args, **kwargs) -> Any:
@@ -41,3 +46,42 @@ class BaseMetric(ABC):
             project: Проект, в котором рассчитывается метрика
         """
         return self.calculate(**self.get_params(project=project, **kwargs))     # pragma: no cover
+
+    async def aget_params(self, project, **kwargs: PARAMS_KWARGS_OBJ) -> dict[str, Any]:
+        """
+        Асинхронный аналог get_params
+
+        Note:
+            Используется метод aget_{type}_params, если метрика
+            его объявляет, иначе get_params выполняется в пуле потоков
+
+        Args:
+            project: Проект, в котором рассчитывается метрика
+        """
+        get_params = getattr(self, f"aget_{project.type.lower()}_params", None)
+        if get_params is None:
+            get_params = sync_to_async(self.get_params, thread_sensitive=False)
+            return await get_params(project=project, **kwargs)
+        return await get_params(project.type_service.get_client(), **kwargs)
+
+    async def acall(self, project, **kwargs: PARAMS_KWARGS_OBJ) -> Any:
+        """
+        Асинхронный вызов расчета функции
+
+        Args:
+            project: Проект, в котором рассчитывается метрика
+        """
+        return self.calculate(**await self.aget_params(project=project, **kwargs))
+
+    @abstractmethod
+    def calculate_batch(self, employees, **datasets) -> dict[str, Any]:
+        """
+        Метод расчета метрики сразу для группы сотрудников
+
+        Args:
+            employees: Сотрудники, для которых рассчитывается метрика
+            datasets: Наборы данных, перечисленные в DATASETS
+
+        Returns:
+            Значения метрики по ref_id сотрудников
+        """
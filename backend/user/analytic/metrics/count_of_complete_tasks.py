@@ -3,7 +3,9 @@ from typing import Any
 
 from pydantic import BaseModel
 
+from user.analytic.indexes.task_index import TaskIndex, AssigneeTaskCounters
 from .base_metric import BaseMetric
+from .registry import metric_registry
 
 
 class Employee(BaseModel):
@@ -16,6 +18,7 @@ class KwargsObj(BaseModel):
     employee: Employee
 
 
+@metric_registry.register("count_of_complete_tasks")
 class CountOfCompleteTasks(BaseMetric):
     """
     Класс расчета метрики количества
@@ -23,31 +26,60 @@ class CountOfCompleteTasks(BaseMetric):
 
     Attributes:
         PARAMS_KWARGS_OBJ: Схема аргументов блока методов get_*_params
+        DATASETS: Наборы данных, необходимые для группового расчета
     """
     PARAMS_KWARGS_OBJ: type = KwargsObj
+    DATASETS = ("task_index",)
 
     @staticmethod
     def get_yougile_params(client, **kwargs: PARAMS_KWARGS_OBJ) -> dict[str, Any]:
         """
         Получение параметров функции и API YouGile
 
+        Note:
+            Счетчики берутся из индекса задач проекта,
+            а не подсчитываются по списку задач
+
         Args:
             client: YouGile клиент для взаимодействия с API
         """
         employee = kwargs.pop('employee')
-        tasks = client.get_tasks().content
-        return {"employee": employee, "tasks": tasks}
+        counters = TaskIndex(client).get(employee.ref_id)
+        return {"counters": counters}
+
+    @staticmethod
+    async def aget_yougile_params(client, **kwargs: PARAMS_KWARGS_OBJ) -> dict[str, Any]:
+        """
+        Асинхронный аналог get_yougile_params
+
+        Args:
+            client: YouGile клиент для взаимодействия с API
+        """
+        employee = kwargs.pop('employee')
+        counters = await (await TaskIndex.aopen(client)).aget(employee.ref_id)
+        return {"counters": counters}
 
     # pylint: disable=W0221
-    def calculate(self, employee: Employee, tasks) -> int:
+    def calculate(self, counters: AssigneeTaskCounters) -> int:
         """
         Метод расчета метрики количества выполненных задач
 
         Args:
-            employee: сотрудник, задачи которого учитываются
-            tasks: Задачи, идущие в учет
+            counters: Счетчики задач сотрудника
+        """
+        return counters.completed
+
+    # pylint: disable=W0221
+    def calculate_batch(
+            self,
+            employees,
+            task_index: dict[str, AssigneeTaskCounters],
+    ) -> dict[str, int]:
+        """
+        Метод расчета метрики сразу для группы сотрудников
+
+        Args:
+            employees: Сотрудники, для которых рассчитывается метрика
+            task_index: Счетчики задач по ref_id сотрудников
         """
-        return len([
-            task for task in tasks
-            if task.completed and employee.ref_id in task.assigned
-        ])
+        return {employee.ref_id: task_index[employee.ref_id].completed for employee in employees}
@@ -0,0 +1,96 @@
+"""
+Модуль, содержащий загрузку наборов данных,
+от которых зависят метрики
+"""
+from typing import Any
+
+from asgiref.sync import sync_to_async
+
+from user.analytic.indexes.task_columns import TaskColumns
+from user.analytic.indexes.task_index import TaskIndex
+
+
+class DatasetLoader:
+    """
+    Загрузчик наборов данных проекта
+
+    Note:
+        Набор данных name для сервиса type загружается
+        методом get_{type}_{name}. Каждый набор загружается
+        не более одного раза на экземпляр загрузчика
+
+    Attributes:
+        project: Проект, данные которого загружаются
+        employees: Сотрудники, для которых рассчитываются метрики
+    """
+
+    def __init__(self, project, employees):
+        """
+        Args:
+            project: Проект, данные которого загружаются
+            employees: Сотрудники, для которых рассчитываются метрики
+        """
+        self.project = project
+        self.employees = list(employees)
+        self._client = None
+        self._datasets: dict[str, Any] = {}
+
+    @property
+    def client(self):
+        """Клиент сервиса проекта"""
+        if self._client is None:
+            self._client = self.project.type_service.get_client()
+        return self._client
+
+    def get(self, name: str) -> Any:
+        """
+        Метод получения набора данных
+
+        Args:
+            name: Имя набора данных
+        """
+        if name not in self._datasets:
+            self._datasets[name] = getattr(self, f"get_{self.project.type.lower()}_{name}")()
+        return self._datasets[name]
+
+    async def aget(self, name: str) -> Any:
+        """
+        Асинхронный аналог get
+
+        Note:
+            Набор загружается методом aget_{type}_{name}, если он
+            объявлен, иначе get выполняется в пуле потоков
+
+        Args:
+            name: Имя набора данных
+        """
+        if name not in self._datasets:
+            load = getattr(self, f"aget_{self.project.type.lower()}_{name}", None)
+            if load is None:
+                return await sync_to_async(self.get, thread_sensitive=False)(name)
+            self._datasets[name] = await load()
+        return self._datasets[name]
+
+    def get_yougile_tasks(self) -> list:
+        """Все задачи проекта"""
+        return list(self.client.iter_tasks())
+
+    def get_yougile_task_columns(self) -> TaskColumns:
+        """Все задачи проекта в колоночном представлении"""
+        if "tasks" in self._datasets:
+            return TaskColumns.from_tasks(self._datasets["tasks"])
+        return TaskColumns.from_tasks(self.client.iter_tasks(trusted=True))
+
+    def get_yougile_employees(self) -> list:
+        """Все сотрудники проекта в YouGile"""
+        return list(self.client.iter_employers())
+
+    def get_yougile_task_index(self) -> dict:
+        """Счетчики задач сотрудников из индекса задач проекта"""
+        return TaskIndex(self.client).get_many(employee.ref_id for employee in self.employees)
+
+    async def aget_yougile_task_index(self) -> dict:
+        """Асинхронная загрузка счетчиков задач сотрудников"""
+        return await (await TaskIndex.aopen(self.client)).aget_many(
+            employee.ref_id for employee in self.employees
+        )
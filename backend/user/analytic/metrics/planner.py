@@ -0,0 +1,77 @@
+"""
+Модуль, содержащий планировщик
+группового расчета метрик
+"""
+from typing import Any, Iterable
+
+from .base_metric import BaseMetric
+from .datasets import DatasetLoader
+
+
+class MetricPlanner:
+    """
+    Планировщик группового расчета метрик
+
+    Note:
+        Наборы данных, от которых зависят метрики,
+        загружаются один раз и используются всеми
+        рассчитываемыми метриками
+
+    Attributes:
+        loader: Загрузчик наборов данных
+    """
+
+    def __init__(self, project, employees):
+        """
+        Args:
+            project: Проект, в котором рассчитываются метрики
+            employees: Сотрудники, для которых рассчитываются метрики
+        """
+        self.loader = DatasetLoader(project, employees)
+
+    def evaluate(self, metrics: Iterable[type[BaseMetric]]) -> dict[str, dict[str, Any]]:
+        """
+        Метод расчета метрик
+
+        Args:
+            metrics: Классы рассчитываемых метрик
+
+        Returns:
+            Значения метрик по ref_id сотрудников для каждого имени метрики
+        """
+        metrics = list(metrics)
+        for name in dict.fromkeys(name for metric in metrics for name in metric.DATASETS):
+            self.loader.get(name)
+        return {
+            metric.NAME: metric().calculate_batch(
+                employees=self.loader.employees,
+                **{name: self.loader.get(name) for name in metric.DATASETS},
+            )
+            for metric in metrics
+        }
+
+    async def aevaluate(self, metrics: Iterable[type[BaseMetric]]) -> dict[str, dict[str, Any]]:
+        """
+        Асинхронный аналог evaluate
+
+        Note:
+            Наборы загружаются по очереди, как и в evaluate,
+            чтобы производные наборы переиспользовали исходные
+
+        Args:
+            metrics: Классы рассчитываемых метрик
+
+        Returns:
+            Значения метрик по ref_id сотрудников для каждого имени метрики
+        """
+        metrics = list(metrics)
+        datasets = {}
+        for name in dict.fromkeys(name for metric in metrics for name in metric.DATASETS):
+            datasets[name] = await self.loader.aget(name)
+        return {
+            metric.NAME: metric().calculate_batch(
+                employees=self.loader.employees,
+                **{name: datasets[name] for name in metric.DATASETS},
+            )
+            for metric in metrics
+        }
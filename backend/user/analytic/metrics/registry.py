@@ -0,0 +1,57 @@
+"""
+Модуль, содержащий реестр метрик,
+доступных по имени
+"""
+import inspect
+from typing import Callable, Iterator
+
+from .base_metric import BaseMetric
+
+
+class MetricRegistry:
+    """Реестр метрик, доступных по имени"""
+
+    def __init__(self):
+        self._metrics: dict[str, type[BaseMetric]] = {}
+
+    def register(self, name: str) -> Callable[[type[BaseMetric]], type[BaseMetric]]:
+        """
+        Функция, создающая декоратор регистрации метрики
+
+        Args:
+            name: Имя, под которым метрика доступна
+        """
+        def decorator(metric: type[BaseMetric]) -> type[BaseMetric]:
+            """
+            Декоратор, регистрирующий класс метрики
+
+            Args:
+                metric: Класс метрики
+            """
+            if name in self._metrics:
+                raise ValueError(f"Метрика {name} уже зарегистрирована")
+            if inspect.isabstract(metric):
+                raise ValueError(f"Метрика {name} реализует не все методы расчета")
+            metric.NAME = name
+            self._metrics[name] = metric
+            return metric
+
+        return decorator
+
+    def get(self, name: str) -> type[BaseMetric]:
+        """
+        Метод получения метрики по имени
+
+        Args:
+            name: Имя метрики
+        """
+        return self._metrics[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._metrics)
+
+
+metric_registry = MetricRegistry()
@@ -6,3 +6,8 @@ class UserConfig(AppConfig):
     """Класс настроек приложения user"""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user'
+
+    def ready(self):
+        """Метод подключения обработчиков сигналов"""
+        # pylint: disable=C0415, W0611
+        from user import signals
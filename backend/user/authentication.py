@@ -0,0 +1,159 @@
+"""Модуль, содержащий классы аутентификации API"""
+import hashlib
+import logging
+from typing import Any
+
+from django.utils.translation import gettext_lazy as _
+from redis.exceptions import RedisError
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from core.settings import AUTH_TOKEN_CACHE_TTL, AUTH_TOKEN_LOCAL_TTL
+from user.analytic.clients.redis_client import RedisClient, local_cache, CACHE_KEY_PREFIX
+from user.models import User
+
+logger = logging.getLogger(__name__)
+
+CACHED_USER_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email',
+    'is_active', 'is_staff', 'is_superuser',
+)
+AUTH_TOKEN_TOMBSTONE = b"revoked"
+
+
+def get_auth_token_key(key: str) -> str:
+    """
+    Функция получения ключа кэша пользователя токена
+
+    Note:
+        Сам токен в ключ не попадает, только его хэш
+
+    Args:
+        key: Токен доступа к API
+    """
+    return f"{CACHE_KEY_PREFIX}:auth-token:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def invalidate_auth_token(key: str) -> None:
+    """
+    Функция удаления пользователя токена из кэша
+
+    Note:
+        Запись в Redis заменяется надгробием на AUTH_TOKEN_CACHE_TTL
+        секунд, а из памяти текущего процесса удаляется, другие
+        процессы перестают ее видеть не позже чем через
+        AUTH_TOKEN_LOCAL_TTL секунд. Запись кэша сохраняется
+        только при отсутствии ключа, поэтому запрос, прочитавший
+        пользователя из базы до удаления токена, не вернет его
+        в кэш. Если Redis недоступен, запись истечет сама
+        через AUTH_TOKEN_CACHE_TTL
+
+    Args:
+        key: Токен доступа к API
+    """
+    cache_key = get_auth_token_key(key)
+    local_cache.delete(cache_key)
+    try:
+        RedisClient().set(cache_key, AUTH_TOKEN_TOMBSTONE, ex=AUTH_TOKEN_CACHE_TTL)
+    except RedisError:
+        logger.error("Auth token cache entry was not invalidated", exc_info=True)
+
+
+def invalidate_user_tokens(user: User) -> None:
+    """
+    Функция удаления из кэша всех токенов пользователя
+
+    Args:
+        user: Пользователь
+    """
+    tokens = Token.objects.filter(user_id=user.pk)  # pylint: disable=E1101
+    for key in tokens.values_list('key', flat=True):
+        invalidate_auth_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Аутентификация по токену с кэшированием пользователя
+
+    Note:
+        Пользователь токена хранится в памяти процесса
+        AUTH_TOKEN_LOCAL_TTL секунд и в Redis AUTH_TOKEN_CACHE_TTL
+        секунд, так что запрос к базе остается только при промахе.
+        В кэш попадают только поля CACHED_USER_FIELDS, остальные
+        поля пользователя загружаются из базы при обращении.
+        Если Redis недоступен, пользователь читается из базы
+    """
+
+    def authenticate_credentials(self, key: str) -> tuple[User, Token]:
+        """
+        Метод получения пользователя и токена по ключу
+
+        Args:
+            key: Токен доступа к API
+
+        Raises:
+            AuthenticationFailed: Токен не существует или пользователь неактивен
+        """
+        cache_key = get_auth_token_key(key)
+        try:
+            fields = self._read(cache_key)
+        except RedisError:
+            logger.warning("Auth token cache is unavailable", exc_info=True)
+            return super().authenticate_credentials(key)
+        if fields is AUTH_TOKEN_TOMBSTONE:
+            return super().authenticate_credentials(key)
+        if fields is None:
+            user, token = super().authenticate_credentials(key)
+            self._write(cache_key, {name: getattr(user, name) for name in CACHED_USER_FIELDS})
+            return user, token
+        if not fields['is_active']:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        user = User.from_db('default', list(fields), list(fields.values()))
+        token = Token.from_db('default', ['key', 'user_id'], [key, user.pk])
+        token.user = user
+        return user, token
+
+    @staticmethod
+    def _read(cache_key: str) -> dict[str, Any] | bytes | None:
+        """
+        Метод чтения полей пользователя из кэша
+
+        Args:
+            cache_key: Ключ кэша
+
+        Returns:
+            Поля пользователя, AUTH_TOKEN_TOMBSTONE для
+            недавно удаленного токена или None при промахе
+        """
+        data = local_cache.get(cache_key)
+        if data is None:
+            data = RedisClient().get(cache_key)
+            if data is None:
+                return None
+            if data == AUTH_TOKEN_TOMBSTONE:
+                return AUTH_TOKEN_TOMBSTONE
+            local_cache.set(cache_key, data, AUTH_TOKEN_LOCAL_TTL)
+        return RedisClient.loads(data)
+
+    @staticmethod
+    def _write(cache_key: str, fields: dict[str, Any]) -> None:
+        """
+        Метод сохранения полей пользователя в кэш
+
+        Note:
+            Запись не перезаписывает существующий ключ,
+            в том числе надгробие удаленного токена
+
+        Args:
+            cache_key: Ключ кэша
+            fields: Поля пользователя
+        """
+        data = RedisClient.dumps(fields)
+        try:
+            written = RedisClient().set(cache_key, data, ex=AUTH_TOKEN_CACHE_TTL, nx=True)
+        except RedisError:
+            logger.warning("Auth token cache is unavailable", exc_info=True)
+            return
+        if written:
+            local_cache.set(cache_key, data, AUTH_TOKEN_LOCAL_TTL)
@@ -0,0 +1,45 @@
+"""Модуль, содержащий обработчики исключений API"""
+import math
+
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.views import exception_handler as default_exception_handler
+
+from user.analytic.clients.circuit_breaker import CircuitOpen
+from user.analytic.clients.rate_limiter import RateLimitExceeded
+
+
+class ServiceUnavailable(APIException):
+    """
+    Исключение API, возникающее, когда внешний сервис
+    недоступен, а сохраненных данных для ответа нет
+
+    Attributes:
+        wait: Через сколько секунд стоит повторить запрос
+    """
+    status_code = 503
+    default_detail = "Внешний сервис временно недоступен."
+    default_code = "service_unavailable"
+
+    def __init__(self, wait: float | None = None, detail=None, code=None):
+        super().__init__(detail, code)
+        self.wait = math.ceil(wait) if wait is not None else None
+
+
+def exception_handler(exc, context):
+    """
+    Обработчик исключений API
+
+    Note:
+        Превышение частоты запросов к внешнему сервису
+        отдается клиенту как 429, а разомкнутый выключатель -
+        как 503, оба с заголовком Retry-After
+
+    Args:
+        exc: Исключение
+        context: Контекст представления
+    """
+    if isinstance(exc, RateLimitExceeded):
+        exc = Throttled(wait=exc.retry_after)
+    elif isinstance(exc, CircuitOpen):
+        exc = ServiceUnavailable(wait=exc.retry_after)
+    return default_exception_handler(exc, context)
@@ -0,0 +1,6 @@
+"""
+Пакет, содержащий фоновые задачи и их очередь
+"""
+from .queue import Job, JobStatus, JobQueue, job_queue
+from .sync import enqueue_sync_employers, enqueue_sync_project
+from .scheduler import ProjectSyncScheduler, SchedulerStats, get_scheduler_stats
@@ -0,0 +1,205 @@
+"""
+Модуль, содержащий хранилища очереди фоновых задач
+"""
+import queue
+import threading
+from abc import ABC, abstractmethod
+
+from core.settings import JOBS_QUEUE_KEY, JOBS_RESULT_TTL, JOBS_COALESCE_TTL
+from user.analytic.clients.redis_client import RedisClient
+
+
+class BaseJobBackend(ABC):
+    """
+    Интерфейс хранилища очереди фоновых задач
+
+    Note:
+        Хранилище не знает о структуре задачи и
+        работает с ее сериализованным состоянием
+    """
+
+    @abstractmethod
+    def save(self, job_id: str, data: str) -> None:
+        """
+        Метод сохранения состояния задачи
+
+        Args:
+            job_id: Идентификатор задачи
+            data: Сериализованное состояние задачи
+        """
+
+    @abstractmethod
+    def load(self, job_id: str) -> str | None:
+        """
+        Метод получения состояния задачи
+
+        Args:
+            job_id: Идентификатор задачи
+        """
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """
+        Метод удаления состояния задачи
+
+        Args:
+            job_id: Идентификатор задачи
+        """
+
+    @abstractmethod
+    def push(self, job_id: str) -> None:
+        """
+        Метод постановки задачи в очередь
+
+        Args:
+            job_id: Идентификатор задачи
+        """
+
+    @abstractmethod
+    def pop(self, timeout: float) -> str | None:
+        """
+        Метод получения следующей задачи из очереди
+
+        Args:
+            timeout: Сколько ждать задачу, если очередь пуста
+        """
+
+    @abstractmethod
+    def claim(self, key: str, job_id: str) -> str | None:
+        """
+        Метод закрепления ключа объединения за задачей
+
+        Args:
+            key: Ключ объединения одинаковых задач
+            job_id: Идентификатор задачи
+
+        Returns:
+            Идентификатор задачи, за которой ключ уже закреплен,
+            или None, если ключ закреплен за job_id
+        """
+
+    @abstractmethod
+    def release(self, key: str, job_id: str) -> None:
+        """
+        Метод освобождения ключа объединения,
+        если он все еще закреплен за задачей
+
+        Args:
+            key: Ключ объединения одинаковых задач
+            job_id: Идентификатор задачи
+        """
+
+
+class LocalJobBackend(BaseJobBackend):
+    """
+    Хранилище очереди в памяти процесса
+
+    Note:
+        Используется в тестах и при локальной разработке.
+        При JOBS_BACKEND=local очередь выполняет задачи
+        сразу при постановке, без отдельного воркера
+    """
+
+    def __init__(self):
+        self._jobs: dict[str, str] = {}
+        self._claims: dict[str, str] = {}
+        self._queue: queue.Queue[str] = queue.Queue()
+        self._lock = threading.Lock()
+
+    def save(self, job_id: str, data: str) -> None:
+        self._jobs[job_id] = data
+
+    def load(self, job_id: str) -> str | None:
+        return self._jobs.get(job_id)
+
+    def delete(self, job_id: str) -> None:
+        self._jobs.pop(job_id, None)
+
+    def push(self, job_id: str) -> None:
+        self._queue.put(job_id)
+
+    def pop(self, timeout: float) -> str | None:
+        try:
+            return self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def claim(self, key: str, job_id: str) -> str | None:
+        with self._lock:
+            claimed = self._claims.setdefault(key, job_id)
+        return None if claimed == job_id else claimed
+
+    def release(self, key: str, job_id: str) -> None:
+        with self._lock:
+            if self._claims.get(key) == job_id:
+                del self._claims[key]
+
+
+class RedisJobBackend(BaseJobBackend):
+    """
+    Хранилище очереди в Redis
+
+    Note:
+        Очередь - список JOBS_QUEUE_KEY, состояние задачи
+        хранится JOBS_RESULT_TTL секунд. Ключ объединения
+        живет не дольше JOBS_COALESCE_TTL, чтобы задача,
+        потерянная упавшим воркером, не блокировала новые
+    """
+    RELEASE_SCRIPT = """
+        if redis.call("GET", KEYS[1]) == ARGV[1] then
+            return redis.call("DEL", KEYS[1])
+        end
+        return 0
+    """
+
+    @staticmethod
+    def get_job_key(job_id: str) -> str:
+        """
+        Метод получения ключа состояния задачи
+
+        Args:
+            job_id: Идентификатор задачи
+        """
+        return f"{JOBS_QUEUE_KEY}:job:{job_id}"
+
+    @staticmethod
+    def get_claim_key(key: str) -> str:
+        """
+        Метод получения ключа Redis для ключа объединения
+
+        Args:
+            key: Ключ объединения одинаковых задач
+        """
+        return f"{JOBS_QUEUE_KEY}:claim:{key}"
+
+    def save(self, job_id: str, data: str) -> None:
+        RedisClient().set(self.get_job_key(job_id), data, ex=JOBS_RESULT_TTL)
+
+    def load(self, job_id: str) -> str | None:
+        data = RedisClient().get(self.get_job_key(job_id))
+        return data.decode() if data is not None else None
+
+    def delete(self, job_id: str) -> None:
+        RedisClient().delete(self.get_job_key(job_id))
+
+    def push(self, job_id: str) -> None:
+        RedisClient().rpush(JOBS_QUEUE_KEY, job_id)
+
+    def pop(self, timeout: float) -> str | None:
+        if not timeout:
+            job_id = RedisClient().lpop(JOBS_QUEUE_KEY)
+            return job_id.decode() if job_id is not None else None
+        item = RedisClient().blpop([JOBS_QUEUE_KEY], timeout=timeout)
+        return item[1].decode() if item is not None else None
+
+    def claim(self, key: str, job_id: str) -> str | None:
+        redis_client = RedisClient()
+        claim_key = self.get_claim_key(key)
+        while not redis_client.set(claim_key, job_id, nx=True, ex=JOBS_COALESCE_TTL):
+            claimed = redis_client.get(claim_key)
+            if claimed is not None:
+                return claimed.decode()
+        return None
+
+    def release(self, key: str, job_id: str) -> None:
+        RedisClient().eval(self.RELEASE_SCRIPT, 1, self.get_claim_key(key), job_id)
@@ -0,0 +1,245 @@
+"""
+Модуль, содержащий очередь фоновых задач
+"""
+import enum
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from django.db import close_old_connections, connection
+from pydantic import BaseModel, Field
+
+from core.settings import JOBS_BACKEND
+from user.jobs.backends import BaseJobBackend, LocalJobBackend, RedisJobBackend
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., dict[str, Any] | None]
+
+
+class JobStatus(str, enum.Enum):
+    """Перечисление состояний фоновой задачи"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """
+    Схема состояния фоновой задачи
+
+    Attributes:
+        id: Идентификатор задачи
+        name: Имя обработчика задачи
+        payload: Аргументы обработчика
+        coalesce_key: Ключ, по которому одинаковые задачи объединяются
+        status: Состояние задачи
+        progress: Ход выполнения, который сообщает обработчик
+        result: Результат обработчика
+        error: Текст ошибки, если задача упала
+        created_at: Время постановки в очередь
+        started_at: Время начала выполнения
+        finished_at: Время окончания выполнения
+    """
+    id: str
+    name: str
+    payload: dict[str, Any] = Field(default_factory=dict)
+    coalesce_key: str | None = None
+    status: JobStatus = JobStatus.QUEUED
+    progress: dict[str, Any] = Field(default_factory=dict)
+    result: dict[str, Any] | None = None
+    error: str | None = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def is_finished(self) -> bool:
+        """Завершилась ли задача, успешно или нет"""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobQueue:
+    """
+    Очередь фоновых задач
+
+    Note:
+        Обработчики регистрируются по имени декоратором register.
+        Задача с ключом объединения не ставится в очередь,
+        пока предыдущая задача с тем же ключом не завершилась:
+        вместо нее возвращается уже поставленная задача
+
+    Attributes:
+        backend: Хранилище очереди
+        eager: Выполнять ли задачи сразу при постановке, без воркера
+    """
+
+    def __init__(self, backend: BaseJobBackend | None = None, eager: bool | None = None):
+        """
+        Args:
+            backend: Хранилище очереди, по умолчанию выбирается по JOBS_BACKEND
+            eager:
+                Выполнять ли задачи сразу при постановке, по умолчанию -
+                если хранилище в памяти процесса выбрано по JOBS_BACKEND,
+                потому что воркер другого процесса его не видит
+        """
+        if eager is None:
+            eager = backend is None and JOBS_BACKEND == "local"
+        self.backend = backend or {
+            "local": LocalJobBackend,
+            "redis": RedisJobBackend,
+        }[JOBS_BACKEND]()
+        self.eager = eager
+        self._handlers: dict[str, JobHandler] = {}
+
+    def register(self, name: str) -> Callable[[JobHandler], JobHandler]:
+        """
+        Функция, создающая декоратор регистрации обработчика
+
+        Note:
+            Обработчик получает аргументы задачи и функцию
+            progress, которой сообщает ход выполнения
+
+        Args:
+            name: Имя, под которым обработчик доступен
+        """
+        def decorator(handler: JobHandler) -> JobHandler:
+            """
+            Декоратор, регистрирующий обработчик задачи
+
+            Args:
+                handler: Функция обработчика
+            """
+            if name in self._handlers:
+                raise ValueError(f"Обработчик {name} уже зарегистрирован")
+            self._handlers[name] = handler
+            return handler
+
+        return decorator
+
+    def save(self, job: Job) -> None:
+        """
+        Метод сохранения состояния задачи
+
+        Args:
+            job: Задача
+        """
+        self.backend.save(job.id, job.model_dump_json())
+
+    def get(self, job_id: str) -> Job | None:
+        """
+        Метод получения задачи по идентификатору
+
+        Args:
+            job_id: Идентификатор задачи
+        """
+        data = self.backend.load(job_id)
+        return Job.model_validate_json(data) if data is not None else None
+
+    def enqueue(self, name: str, coalesce_key: str | None = None, **payload) -> Job:
+        """
+        Метод постановки задачи в очередь
+
+        Note:
+            Задача сохраняется до закрепления ключа объединения,
+            поэтому ключ никогда не указывает на еще не сохраненную
+            задачу. Если ключ уже закреплен за незавершенной
+            задачей, своя задача удаляется и возвращается та
+
+        Args:
+            name: Имя обработчика
+            coalesce_key: Ключ объединения одинаковых задач
+            payload: Аргументы обработчика
+        """
+        if name not in self._handlers:
+            raise KeyError(f"Обработчик {name} не зарегистрирован")
+        job = Job(id=uuid.uuid4().hex, name=name, payload=payload, coalesce_key=coalesce_key)
+        self.save(job)
+        if coalesce_key is not None:
+            while claimed_id := self.backend.claim(coalesce_key, job.id):
+                claimed = self.get(claimed_id)
+                if claimed is not None and not claimed.is_finished:
+                    self.backend.delete(job.id)
+                    return claimed
+                self.backend.release(coalesce_key, claimed_id)
+        if self.eager:
+            return self.run(job)
+        self.backend.push(job.id)
+        return job
+
+    def run(self, job: Job) -> Job:
+        """
+        Метод выполнения задачи в текущем процессе
+
+        Args:
+            job: Задача
+        """
+        def progress(**values) -> None:
+            """
+            Функция, сохраняющая ход выполнения задачи
+
+            Args:
+                values: Значения хода выполнения
+            """
+            job.progress.update(values)
+            self.save(job)
+
+        job.status, job.started_at = JobStatus.RUNNING, datetime.now(timezone.utc)
+        self.save(job)
+        self._close_old_connections()
+        try:
+            job.result = self._handlers[job.name](progress=progress, **job.payload)
+            job.status = JobStatus.SUCCEEDED
+        except Exception as exc:  # pylint: disable=W0718
+            logger.exception("Job %s (%s) failed", job.id, job.name)
+            job.status, job.error = JobStatus.FAILED, f"{type(exc).__name__}: {exc}"
+        finally:
+            self._close_old_connections()
+            job.finished_at = datetime.now(timezone.utc)
+            self.save(job)
+            if job.coalesce_key is not None:
+                self.backend.release(job.coalesce_key, job.id)
+        return job
+
+    @staticmethod
+    def _close_old_connections() -> None:
+        """
+        Метод закрытия устаревших соединений с базой данных
+
+        Note:
+            Воркер живет дольше CONN_MAX_AGE, поэтому соединения
+            проверяются вокруг каждой задачи, как вокруг запроса.
+            Внутри транзакции (например, в тестах) соединение не трогается
+        """
+        if not connection.in_atomic_block:
+            close_old_connections()
+
+    def work(self, burst: bool = False, timeout: float = 5) -> int:
+        """
+        Метод обработки задач очереди
+
+        Args:
+            burst: Выйти, когда очередь опустеет, вместо ожидания новых задач
+            timeout: Сколько ждать задачу при пустой очереди
+
+        Returns:
+            Количество выполненных задач
+        """
+        done = 0
+        while True:
+            job_id = self.backend.pop(0 if burst else timeout)
+            if job_id is None:
+                if burst:
+                    return done
+                continue
+            job = self.get(job_id)
+            if job is None:
+                logger.warning("Job %s expired before it was run", job_id)
+                continue
+            self.run(job)
+            done += 1
+
+
+job_queue = JobQueue()
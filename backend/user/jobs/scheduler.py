@@ -0,0 +1,219 @@
+"""
+Модуль, содержащий планировщик периодической синхронизации проектов
+"""
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+from typing import Callable
+
+from django.db.models import F
+from django.utils import timezone
+
+from core.settings import (
+    SCHEDULER_ACTIVE_INTERVAL, SCHEDULER_IDLE_INTERVAL, SCHEDULER_ACTIVE_WINDOW,
+    SCHEDULER_JITTER, SCHEDULER_MAX_CONCURRENCY, SCHEDULER_TICK, JOBS_QUEUE_KEY,
+)
+from user.analytic.clients.redis_client import RedisClient
+from user.jobs.queue import Job, JobQueue, job_queue
+from user.jobs.sync import enqueue_sync_project
+from user.models import Project
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_STATS_KEY = f"{JOBS_QUEUE_KEY}:scheduler:stats"
+
+
+# pylint: disable=R0902
+@dataclass
+class SchedulerStats:
+    """
+    Метрики планировщика
+
+    Attributes:
+        ticks: Количество проходов планировщика
+        enqueued: Количество поставленных синхронизаций
+        deferred: Сколько раз синхронизация откладывалась из-за ограничения
+        succeeded: Количество успешных синхронизаций
+        failed: Количество упавших синхронизаций
+        running: Количество синхронизаций в работе
+        lag: Наибольшее опоздание запуска синхронизации за последний проход, в секундах
+        max_lag: Наибольшее опоздание запуска синхронизации за все время, в секундах
+        durations: Длительность последней синхронизации по идентификаторам проектов, в секундах
+    """
+    ticks: int = 0
+    enqueued: int = 0
+    deferred: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    running: int = 0
+    lag: float = 0
+    max_lag: float = 0
+    durations: dict[int, float] = field(default_factory=dict)
+
+
+class ProjectSyncScheduler:
+    """
+    Планировщик периодической синхронизации проектов
+
+    Note:
+        Каждый проход планировщик ставит в очередь синхронизации
+        проектов, которым подошел срок. Интервал проекта - его
+        sync_interval, а без него - короткий для проектов, к которым
+        недавно обращались, и длинный для остальных. Срок сдвигается
+        на случайную долю интервала, чтобы проекты не синхронизировались
+        одновременно. Недавно использованные проекты ставятся первыми,
+        а в работе одновременно не больше max_concurrency синхронизаций
+
+    Attributes:
+        queue: Очередь фоновых задач
+        max_concurrency: Наибольшее количество одновременных синхронизаций
+        jitter: Доля интервала, на которую случайно сдвигается срок
+        stats: Метрики планировщика
+    """
+
+    def __init__(
+            self,
+            queue: JobQueue = job_queue,
+            max_concurrency: int = SCHEDULER_MAX_CONCURRENCY,
+            jitter: float = SCHEDULER_JITTER,
+            clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            queue: Очередь фоновых задач
+            max_concurrency: Наибольшее количество одновременных синхронизаций
+            jitter: Доля интервала, на которую случайно сдвигается срок
+            clock: Монотонные часы
+        """
+        self.queue = queue
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.stats = SchedulerStats()
+        self._clock = clock
+        self._due: dict[int, float] = {}
+        self._running: dict[str, int] = {}
+
+    @staticmethod
+    def get_interval(project: Project) -> int:
+        """
+        Метод получения интервала синхронизации проекта
+
+        Args:
+            project: Проект
+        """
+        if project.sync_interval:
+            return project.sync_interval
+        active_since = timezone.now() - timedelta(seconds=SCHEDULER_ACTIVE_WINDOW)
+        if project.last_accessed_at and project.last_accessed_at >= active_since:
+            return SCHEDULER_ACTIVE_INTERVAL
+        return SCHEDULER_IDLE_INTERVAL
+
+    def _jittered(self, interval: float) -> float:
+        """
+        Метод случайного сдвига интервала
+
+        Args:
+            interval: Интервал в секундах
+        """
+        return interval * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def _reap(self) -> None:
+        """Метод учета завершившихся синхронизаций"""
+        for job_id, project_id in list(self._running.items()):
+            job: Job | None = self.queue.get(job_id)
+            if job is not None and not job.is_finished:
+                continue
+            del self._running[job_id]
+            if job is None:
+                continue
+            if job.error is None:
+                self.stats.succeeded += 1
+            else:
+                self.stats.failed += 1
+            if job.started_at and job.finished_at:
+                duration = job.finished_at - job.started_at
+                self.stats.durations[project_id] = duration.total_seconds()
+
+    def tick(self) -> list[int]:
+        """
+        Метод одного прохода планировщика
+
+        Returns:
+            Идентификаторы проектов, синхронизации которых поставлены в очередь
+        """
+        now = self._clock()
+        self._reap()
+        projects = Project.objects\
+            .only('id', 'sync_interval', 'last_accessed_at')\
+            .order_by(F('last_accessed_at').desc(nulls_last=True), 'id')
+        due = []
+        for project in projects:
+            if project.id not in self._due:
+                # Первые синхронизации распределяются по доле интервала
+                delay = random.uniform(0, self.jitter) * self.get_interval(project)
+                self._due[project.id] = now + delay
+            if self._due[project.id] <= now:
+                due.append(project)
+        self._due = {project.id: self._due[project.id] for project in projects}
+
+        enqueued, lag = [], 0.0
+        for project in due:
+            if len(self._running) >= self.max_concurrency:
+                self.stats.deferred += len(due) - len(enqueued)
+                break
+            job = enqueue_sync_project(project.id)
+            self._running[job.id] = project.id
+            lag = max(lag, now - self._due[project.id])
+            self._due[project.id] = now + self._jittered(self.get_interval(project))
+            enqueued.append(project.id)
+
+        self.stats.ticks += 1
+        self.stats.enqueued += len(enqueued)
+        self.stats.running = len(self._running)
+        self.stats.lag = lag
+        self.stats.max_lag = max(self.stats.max_lag, lag)
+        return enqueued
+
+    def publish_stats(self) -> None:
+        """Метод публикации метрик планировщика в Redis"""
+        RedisClient().set(SCHEDULER_STATS_KEY, json.dumps(asdict(self.stats)))
+
+    def run(self, tick: float = SCHEDULER_TICK, ticks: int | None = None) -> None:
+        """
+        Метод запуска планировщика
+
+        Note:
+            Ошибка прохода, например кратковременная недоступность
+            Redis или базы, только логируется, и планировщик
+            продолжает работу со следующего прохода
+
+        Args:
+            tick: Пауза между проходами, в секундах
+            ticks: Сколько проходов сделать, по умолчанию без ограничения
+        """
+        passes = 0
+        while ticks is None or passes < ticks:
+            passes += 1
+            try:
+                self.tick()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Scheduler tick failed")
+            logger.info("Scheduler stats: %s", self.stats)
+            try:
+                self.publish_stats()
+            except Exception:  # pylint: disable=W0718
+                logger.exception("Failed to publish scheduler stats")
+            time.sleep(tick)
+
+
+def get_scheduler_stats() -> SchedulerStats | None:
+    """Функция получения последних опубликованных метрик планировщика"""
+    data = RedisClient().get(SCHEDULER_STATS_KEY)
+    if data is None:
+        return None
+    stats = json.loads(data)
+    stats["durations"] = {int(key): val for key, val in stats["durations"].items()}
+    return SchedulerStats(**stats)
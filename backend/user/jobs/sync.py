@@ -0,0 +1,97 @@
+"""
+Модуль, содержащий фоновые задачи синхронизации проектов
+"""
+from dataclasses import asdict
+from typing import Any, Callable
+
+from user.analytic.clients.redis_client import invalidate_project
+from user.jobs.queue import Job, job_queue
+from user.models import Project, EmployeesSyncReport
+
+SYNC_EMPLOYERS_JOB = "sync_employers"
+SYNC_PROJECT_JOB = "sync_project"
+
+
+@job_queue.register(SYNC_EMPLOYERS_JOB)
+def sync_employers(progress: Callable[..., None], project_id: int) -> dict[str, Any]:
+    """
+    Задача синхронизации сотрудников проекта
+
+    Args:
+        progress: Функция, сохраняющая ход выполнения
+        project_id: Идентификатор проекта
+    """
+    batches = 0
+
+    def on_batch(report: EmployeesSyncReport) -> None:
+        """
+        Функция, сообщающая ход синхронизации после каждой пачки
+
+        Args:
+            report: Итог синхронизации на текущий момент
+        """
+        nonlocal batches
+        batches += 1
+        progress(batches=batches, **asdict(report))
+
+    report = Project.objects.get(id=project_id).type_service.update_employers(on_batch=on_batch)
+    return asdict(report)
+
+
+@job_queue.register(SYNC_PROJECT_JOB)
+def sync_project(progress: Callable[..., None], project_id: int) -> dict[str, Any]:
+    """
+    Задача полной синхронизации проекта: сотрудники
+    в базе данных и задачи в кэше
+
+    Note:
+        Кэш проекта инвалидируется, только если синхронизация
+        добавила или изменила сотрудников. Иначе страницы задач
+        остаются в текущем поколении кэша: они обновляются
+        по life_time, при сбое YouGile отдается последний
+        удачный ответ, а индекс перестраивается из теплого кэша.
+        Смену токена инвалидирует ProjectViewSet.perform_update
+
+    Args:
+        progress: Функция, сохраняющая ход выполнения
+        project_id: Идентификатор проекта
+    """
+    result = sync_employers(progress=progress, project_id=project_id)
+    project = Project.objects.get(id=project_id)
+    if result["inserted"] or result["updated"]:
+        invalidate_project(project)
+    project.type_service.refresh_tasks()
+    progress(tasks_refreshed=True)
+    return result
+
+
+def enqueue_sync_employers(project: Project) -> Job:
+    """
+    Функция постановки синхронизации сотрудников в очередь
+
+    Note:
+        Повторные запросы синхронизации того же проекта
+        возвращают уже поставленную задачу
+
+    Args:
+        project: Проект
+    """
+    return job_queue.enqueue(
+        SYNC_EMPLOYERS_JOB,
+        coalesce_key=f"{SYNC_EMPLOYERS_JOB}:{project.id}",
+        project_id=project.id,
+    )
+
+
+def enqueue_sync_project(project_id: int) -> Job:
+    """
+    Функция постановки полной синхронизации проекта в очередь
+
+    Args:
+        project_id: Идентификатор проекта
+    """
+    return job_queue.enqueue(
+        SYNC_PROJECT_JOB,
+        coalesce_key=f"{SYNC_PROJECT_JOB}:{project_id}",
+        project_id=project_id,
+    )
@@ -0,0 +1,25 @@
+"""
+Модуль, содержащий команду запуска воркера фоновых задач
+"""
+from django.core.management.base import BaseCommand
+
+from user.jobs import job_queue
+
+
+# pylint: disable=C0115
+class Command(BaseCommand):
+    help = "Запускает воркер, выполняющий фоновые задачи из очереди"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--burst", action="store_true",
+            help="Завершиться, когда очередь опустеет",
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=5,
+            help="Сколько секунд ждать задачу при пустой очереди",
+        )
+
+    def handle(self, *args, **options):
+        done = job_queue.work(burst=options["burst"], timeout=options["timeout"])
+        self.stdout.write(f"Выполнено задач: {done}")
@@ -0,0 +1,31 @@
+"""
+Модуль, содержащий команду запуска планировщика синхронизации проектов
+"""
+from django.core.management.base import BaseCommand
+
+from core.settings import SCHEDULER_TICK, SCHEDULER_MAX_CONCURRENCY
+from user.jobs.scheduler import ProjectSyncScheduler
+
+
+# pylint: disable=C0115
+class Command(BaseCommand):
+    help = "Запускает планировщик, периодически синхронизирующий проекты"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tick", type=float, default=SCHEDULER_TICK,
+            help="Пауза между проходами планировщика, в секундах",
+        )
+        parser.add_argument(
+            "--max-concurrency", type=int, default=SCHEDULER_MAX_CONCURRENCY,
+            help="Наибольшее количество одновременных синхронизаций",
+        )
+        parser.add_argument(
+            "--ticks", type=int, default=None,
+            help="Сколько проходов сделать перед выходом",
+        )
+
+    def handle(self, *args, **options):
+        scheduler = ProjectSyncScheduler(max_concurrency=options["max_concurrency"])
+        scheduler.run(tick=options["tick"], ticks=options["ticks"])
+        self.stdout.write(f"Статистика планировщика: {scheduler.stats}")
@@ -0,0 +1,52 @@
+"""Модуль, содержащий промежуточные слои обработки запросов"""
+import math
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+
+from user.analytic.clients.staleness import Staleness, track_staleness
+
+
+class StaleDataMiddleware:
+    """
+    Промежуточный слой, помечающий ответы с устаревшими данными
+
+    Note:
+        Если при обработке запроса внешний сервис был недоступен
+        и вместо его данных отдан последний сохраненный результат,
+        в ответ добавляются заголовки Warning и X-Data-Stale-Age.
+        Работает и в синхронной, и в асинхронной цепочке,
+        чтобы не переводить асинхронные представления в поток
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        staleness = track_staleness()
+        return self.mark_stale_response(self.get_response(request), staleness)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        staleness = track_staleness()
+        return self.mark_stale_response(await self.get_response(request), staleness)
+
+    @staticmethod
+    def mark_stale_response(response: HttpResponse, staleness: Staleness) -> HttpResponse:
+        """
+        Метод добавления в ответ заголовков устаревания
+
+        Args:
+            response: Ответ
+            staleness: Устаревание данных, отданных при обработке запроса
+        """
+        if staleness.age is not None:
+            response["Warning"] = '110 - "Response is Stale"'
+            response["X-Data-Stale-Age"] = str(math.ceil(staleness.age))
+        return response
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.6 on 2026-10-17 23:31
+
+import django.contrib.auth.models
+import django.contrib.auth.validators
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='Дата последнего посещения')),
+                ('username', models.CharField(error_messages={'unique': 'Это имя пользователя уже существует.'}, help_text='Требуется не более 150 символов. Только буквы, цифры и @/./+/-/_.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='Логин')),
+                ('password', models.CharField(max_length=128, verbose_name='Пароль')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='Имя')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='Фамилия')),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('is_staff', models.BooleanField(default=False, help_text='Определяет, может ли пользователь войти на этот административный сайт.', verbose_name='Администраторские права')),
+                ('is_active', models.BooleanField(default=True, help_text='Определяет, следует ли считать этого пользователя активным. Снимите этот флажок вместо удаления учетных записей.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата регистрации')),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'Пользователь',
+                'verbose_name_plural': 'Пользователи',
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Project',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(choices=[('Yougile', 'Yougile')], help_text='Название сервиса, который будет использоваться для аналитики', max_length=16, verbose_name='Тип клиента')),
+                ('token', models.CharField(help_text='Ключ доступа, по которому можно получить необходимые данные из сервиса (Нужно получить из сервиса)', max_length=255, verbose_name='Ключ')),
+                ('user', models.ForeignKey(help_text='Пользователь, которому принадлежат права доступа к проекту', on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Проект',
+                'verbose_name_plural': 'Проекты',
+            },
+        ),
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ref_id', models.CharField(help_text='Уникальный идентификатор объекта, используемый сервисом для его определения', max_length=255, unique=True, verbose_name='ID объекта в сервисе')),
+                ('email', models.EmailField(max_length=254)),
+                ('name', models.CharField(max_length=255, verbose_name='Имя')),
+                ('project', models.ForeignKey(help_text='Проект, в котором работает сотрудник', on_delete=django.db.models.deletion.PROTECT, to='user.project', verbose_name='Рабочий проект')),
+            ],
+            options={
+                'verbose_name': 'Сотрудник',
+                'verbose_name_plural': 'Сотрудники',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 23:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='last_accessed_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Когда к аналитике проекта обращались в последний раз', null=True, verbose_name='Дата последнего обращения'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='sync_interval',
+            field=models.PositiveIntegerField(blank=True, help_text='Через сколько секунд планировщик повторно синхронизирует проект (по умолчанию зависит от того, как давно к проекту обращались)', null=True, verbose_name='Интервал синхронизации'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.0.6 on 2026-10-18 00:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Индексы строятся CREATE INDEX CONCURRENTLY, без блокировки записи
+    # в таблицы, а такие запросы не выполняются внутри транзакции
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('user', '0002_project_sync_schedule'),
+    ]
+
+    operations = [
+        # Уникальный индекс строится конкурентно, затем на его основе
+        # создается ограничение. Глобальная уникальность ref_id снимается
+        # только после этого, так что дубли не могут появиться в промежутке
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='employee',
+                    constraint=models.UniqueConstraint(
+                        fields=('project', 'ref_id'), name='employee_project_ref_id_uniq',
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql='CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "employee_project_ref_id_uniq" '
+                        'ON "user_employee" ("project_id", "ref_id")',
+                    reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS "employee_project_ref_id_uniq"',
+                ),
+                migrations.RunSQL(
+                    sql='ALTER TABLE "user_employee" ADD CONSTRAINT "employee_project_ref_id_uniq" '
+                        'UNIQUE USING INDEX "employee_project_ref_id_uniq"',
+                    reverse_sql='ALTER TABLE "user_employee" DROP CONSTRAINT "employee_project_ref_id_uniq"',
+                ),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='employee',
+            name='ref_id',
+            field=models.CharField(help_text='Уникальный в пределах проекта идентификатор объекта, используемый сервисом для его определения', max_length=255, verbose_name='ID объекта в сервисе'),
+        ),
+        AddIndexConcurrently(
+            model_name='employee',
+            index=models.Index(fields=['project', 'id'], name='employee_project_id_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='project',
+            index=models.Index(fields=['user', 'id'], name='project_user_id_idx'),
+        ),
+        # Индексы внешних ключей повторяют начало составных индексов
+        # и только замедляют запись, поэтому удаляются так же конкурентно
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='employee',
+                    name='project',
+                    field=models.ForeignKey(db_index=False, help_text='Проект, в котором работает сотрудник', on_delete=django.db.models.deletion.PROTECT, to='user.project', verbose_name='Рабочий проект'),
+                ),
+                migrations.AlterField(
+                    model_name='project',
+                    name='user',
+                    field=models.ForeignKey(db_index=False, help_text='Пользователь, которому принадлежат права доступа к проекту', on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql='DROP INDEX CONCURRENTLY IF EXISTS "user_employee_project_id_ca2720e4"',
+                    reverse_sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS "user_employee_project_id_ca2720e4" '
+                                'ON "user_employee" ("project_id")',
+                ),
+                migrations.RunSQL(
+                    sql='DROP INDEX CONCURRENTLY IF EXISTS "user_project_user_id_94351b41"',
+                    reverse_sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS "user_project_user_id_94351b41" '
+                                'ON "user_project" ("user_id")',
+                ),
+            ],
+        ),
+    ]
@@ -2,17 +2,30 @@
 Модуль, содержащий ORM классы,
 определяющие таблицы базы данных
 """
+import logging
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from importlib.resources import _
-from typing import Any, cast
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, cast
+
+from asgiref.sync import async_to_sync
 
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.validators import UnicodeUsernameValidator
 from django.utils import timezone
-from django.db import models
+from django.db import models, transaction
 
+from core.settings import (
+    YOUGILE_ASYNC_PAGINATION, EMPLOYEES_SYNC_BATCH_SIZE, PROJECT_ACCESS_RESOLUTION,
+)
 from user.analytic.clients.base_client import BaseClient
-from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.clients.yougile_client import YouGileClient, AsyncYouGileClient
+from user.analytic.clients.yougile_client.schemas import paginated, Employee as YouGileEmployee
+from user.analytic.indexes.task_index import TaskIndex
+
+logger = logging.getLogger(__name__)
 
 
 class ExplicitModel(models.Model):
@@ -79,6 +92,23 @@ class Services(models.TextChoices):
     YOUGILE = "Yougile"
 
 
+@dataclass
+class EmployeesSyncReport:
+    """
+    Итог синхронизации сотрудников проекта
+
+    Attributes:
+        inserted: Количество добавленных сотрудников
+        updated: Количество сотрудников, данные которых изменились
+        unchanged: Количество сотрудников, данные которых не изменились
+        skipped: Количество пропущенных повторов в выдаче сервиса
+    """
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+
+
 class BaseProjectTypeService(ABC):
     """
     Интерфейс класса, отвечающего за взаимодействие
@@ -90,8 +120,20 @@ class BaseProjectTypeService(ABC):
         """Метод получения токена (он может быть зашифрован, например)"""
 
     @abstractmethod
-    def update_employers(self) -> None:
-        """Метод обновления сотрудников в текущем проекте"""
+    def update_employers(
+            self,
+            on_batch: Callable[[EmployeesSyncReport], None] | None = None,
+    ) -> EmployeesSyncReport:
+        """
+        Метод обновления сотрудников в текущем проекте
+
+        Args:
+            on_batch: Функция, получающая промежуточный итог синхронизации
+        """
+
+    @abstractmethod
+    def refresh_tasks(self) -> None:
+        """Метод прогрева задач проекта в кэше"""
 
     @abstractmethod
     def get_client(self) -> BaseClient:
@@ -114,45 +156,110 @@ class YouGileTypeService(BaseProjectTypeService):
         """Метод получения токена (он может быть зашифрован, например)"""
         return self.project.token
 
-    def update_employers(self):
-        """Метод обновления сотрудников в текущем проекте"""
-        next_ = True
-        client = cast(YouGileClient, self.get_client())
-        existed_employers_objs = Employee.objects\
-            .filter(project__id=self.project.id)\
-            .in_bulk(field_name='ref_id')
-        new_employers_objs = {}
-        offset, limit = 0, 50
-        while next_:
-            response = client.get_employers(limit=limit, offset=offset)
-            offset += limit
-
-            for employee in response.content:
-                values = {
-                    'email': employee.email,
-                    'name': employee.realName,
-                    'project': self.project,
+    def iter_employers(self) -> Iterable[YouGileEmployee]:
+        """
+        Метод обхода всех сотрудников проекта
+
+        Note:
+            При включенной настройке YOUGILE_ASYNC_PAGINATION
+            страницы запрашиваются одновременно асинхронным клиентом
+        """
+        if YOUGILE_ASYNC_PAGINATION:
+            pages = async_to_sync(self._get_employers_pages_async)()
+            return (employee for page in pages for employee in page.content)
+        return cast(YouGileClient, self.get_client()).iter_employers()
+
+    async def _get_employers_pages_async(self) -> list[paginated(YouGileEmployee)]:
+        """Метод одновременного получения всех страниц сотрудников"""
+        async with AsyncYouGileClient(token=self.get_token()) as client:
+            return await client.get_employers_pages()
+
+    def update_employers(
+            self,
+            on_batch: Callable[[EmployeesSyncReport], None] | None = None,
+            batch_size: int = EMPLOYEES_SYNC_BATCH_SIZE,
+    ) -> EmployeesSyncReport:
+        """
+        Метод обновления сотрудников в текущем проекте
+
+        Note:
+            Страницы сервиса обходятся потоком, пачками по batch_size.
+            Для каждой пачки одним запросом читаются сохраненные
+            значения, и в базу одним upsert попадают только новые
+            и изменившиеся сотрудники. Транзакция открывается
+            только на запись пачки, чтобы не держать ее на время
+            запросов к сервису. ref_id уникален в пределах проекта,
+            поэтому выборка и upsert идут по индексу (project, ref_id)
+
+        Args:
+            on_batch: Функция, получающая итог после каждой пачки
+            batch_size: Количество сотрудников сервиса в одной пачке
+        """
+        report = EmployeesSyncReport()
+        seen = set()
+        for batch in self._iter_batches(self.iter_employers(), batch_size):
+            with transaction.atomic():
+                stored = {
+                    ref_id: (email, name)
+                    for ref_id, email, name in Employee.objects
+                    .filter(
+                        project_id=self.project.id,
+                        ref_id__in=[employee.id for employee in batch],
+                    )
+                    .values_list('ref_id', 'email', 'name')
                 }
-                if existed_employers_objs.get(employee.id):
-                    for key, val in values.items():
-                        setattr(existed_employers_objs.get(employee.id), key, val)
-                else:
-                    new_employers_objs[employee.id] = Employee(
+                changed = []
+                for employee in batch:
+                    if employee.id in seen:
+                        report.skipped += 1
+                        continue
+                    seen.add(employee.id)
+                    values = (employee.email, employee.realName)
+                    if employee.id not in stored:
+                        report.inserted += 1
+                    elif stored[employee.id] == values:
+                        report.unchanged += 1
+                        continue
+                    else:
+                        report.updated += 1
+                    changed.append(Employee(
                         ref_id=employee.id,
-                        **values,
+                        email=employee.email,
+                        name=employee.realName,
+                        project=self.project,
+                    ))
+                if changed:
+                    Employee.objects.bulk_create(
+                        changed,
+                        update_conflicts=True,
+                        unique_fields=['project', 'ref_id'],
+                        update_fields=['email', 'name'],
                     )
+            if on_batch is not None:
+                on_batch(report)
+        logger.info("Employees sync of project %s: %s", self.project.id, report)
+        return report
 
-            next_ = response.paging.next
+    @staticmethod
+    def _iter_batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+        """
+        Метод разбиения потока на пачки
 
-        Employee.objects.bulk_update(
-            list(existed_employers_objs.values()),
-            fields=['email', 'name', 'project'],
-        )
-        Employee.objects.bulk_create(list(new_employers_objs.values()))
+        Args:
+            items: Поток объектов
+            size: Размер пачки
+        """
+        items = iter(items)
+        while batch := list(islice(items, size)):
+            yield batch
+
+    def refresh_tasks(self) -> None:
+        """Метод перестроения индекса задач проекта"""
+        TaskIndex(cast(YouGileClient, self.get_client())).refresh()
 
     def get_client(self) -> BaseClient:
         """Метод получения клиента по проекту"""
-        return YouGileClient(token=self.get_token())
+        return YouGileClient(token=self.get_token(), project_id=self.project.id)
 
 
 class Project(ExplicitModel):
@@ -173,9 +280,42 @@ class Project(ExplicitModel):
         ),
     )
     user: "user.User" = models.ForeignKey(
-        'user.User', verbose_name=_("Пользователь"), on_delete=models.PROTECT,
+        'user.User', verbose_name=_("Пользователь"), on_delete=models.PROTECT, db_index=False,
         help_text=_("Пользователь, которому принадлежат права доступа к проекту"),
     )
+    sync_interval: int | None = models.PositiveIntegerField(
+        _("Интервал синхронизации"), null=True, blank=True,
+        help_text=_(
+            "Через сколько секунд планировщик повторно синхронизирует проект "
+            "(по умолчанию зависит от того, как давно к проекту обращались)"
+        ),
+    )
+    last_accessed_at: datetime | None = models.DateTimeField(
+        _("Дата последнего обращения"), null=True, blank=True, editable=False,
+        help_text=_("Когда к аналитике проекта обращались в последний раз"),
+    )
+
+    def mark_accessed(self) -> None:
+        """
+        Метод, отмечающий обращение к аналитике проекта
+
+        Note:
+            Дата пишется не чаще раза в PROJECT_ACCESS_RESOLUTION
+            секунд, чтобы чтения не превращались в запись на каждый запрос.
+            Если загруженная дата еще свежая, запроса к базе нет вовсе
+        """
+        now = timezone.now()
+        resolution = timedelta(seconds=PROJECT_ACCESS_RESOLUTION)
+        if self.last_accessed_at is not None and now - self.last_accessed_at < resolution:
+            return
+        Project.objects\
+            .filter(pk=self.pk)\
+            .filter(
+                models.Q(last_accessed_at__isnull=True)
+                | models.Q(last_accessed_at__lt=now - resolution)
+            )\
+            .update(last_accessed_at=now)
+        self.last_accessed_at = now
 
     @property
     def type_service(self) -> BaseProjectTypeService:
@@ -188,18 +328,24 @@ class Project(ExplicitModel):
     class Meta:
         verbose_name = _("Проект")
         verbose_name_plural = _("Проекты")
+        indexes = [
+            models.Index(fields=['user', 'id'], name='project_user_id_idx'),
+        ]
 
 
 class Employee(ExplicitModel):
     """Модель, отвечающая за хранение информации по сотрудникам проекта"""
     ref_id: str = models.CharField(
-        _("ID объекта в сервисе"), max_length=255, unique=True,
-        help_text=_("Уникальный идентификатор объекта, используемый сервисом для его определения"),
+        _("ID объекта в сервисе"), max_length=255,
+        help_text=_(
+            "Уникальный в пределах проекта идентификатор объекта, "
+            "используемый сервисом для его определения"
+        ),
     )
     email: str = models.EmailField()
     name: str = models.CharField(_("Имя"), max_length=255)
     project: 'user.Project' = models.ForeignKey(
-        'user.Project', verbose_name=_("Рабочий проект"), on_delete=models.PROTECT,
+        'user.Project', verbose_name=_("Рабочий проект"), on_delete=models.PROTECT, db_index=False,
         help_text=_("Проект, в котором работает сотрудник"),
     )
 
@@ -207,3 +353,11 @@ class Employee(ExplicitModel):
     class Meta:
         verbose_name = _("Сотрудник")
         verbose_name_plural = _("Сотрудники")
+        constraints = [
+            models.UniqueConstraint(
+                fields=['project', 'ref_id'], name='employee_project_ref_id_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['project', 'id'], name='employee_project_id_idx'),
+        ]
@@ -0,0 +1,20 @@
+"""Модуль, содержащий классы пагинации API"""
+from rest_framework.pagination import CursorPagination
+
+from core.settings import API_PAGE_SIZE, API_MAX_PAGE_SIZE
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по первичному ключу
+
+    Note:
+        Следующая страница выбирается условием id > последнего
+        id страницы по индексу первичного ключа, без OFFSET и
+        без подсчета строк, поэтому время ответа не зависит
+        от того, насколько далеко страница от начала выборки
+    """
+    ordering = 'id'
+    page_size = API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = API_MAX_PAGE_SIZE
@@ -12,7 +12,7 @@ class IsYourEmployeePermission(BasePermission):
         """
         Верните "True", если разрешение получено, или "False" в противном случае.
         """
-        return obj.project.user.id == request.user.id
+        return obj.project.user_id == request.user.id
 
 
 class IsYourProjectPermission(BasePermission):
@@ -25,4 +25,4 @@ class IsYourProjectPermission(BasePermission):
         """
         Верните "True", если разрешение получено, или "False" в противном случае.
         """
-        return obj.user.id == request.user.id
+        return obj.user_id == request.user.id
@@ -4,7 +4,25 @@ from rest_framework import serializers
 from user.models import Employee, User, Project
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class SparseFieldsetSerializerMixin:
+    """
+    Примесь сериализатора, отдающего только запрошенные поля
+    """
+
+    def __init__(self, *args, fields: tuple[str, ...] | None = None, **kwargs):
+        """
+        Args:
+            args: Аргументы сериализатора
+            fields: Имена полей, которые нужно отдать, по умолчанию все
+            kwargs: Keyword аргументы сериализатора
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class EmployeeSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Сериализатор сотрудника"""
     # pylint: disable=C0115
     class Meta:
@@ -12,7 +30,7 @@ class EmployeeSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """Сериализатор проекта"""
     # pylint: disable=C0115
     class Meta:
@@ -0,0 +1,22 @@
+"""Модуль, содержащий обработчики сигналов моделей"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_auth_token, invalidate_user_tokens
+from user.models import User
+
+
+# pylint: disable=W0613
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance: Token, **kwargs) -> None:
+    """Удаленный токен, например при выходе из системы, сразу убирается из кэша"""
+    invalidate_auth_token(instance.key)
+
+
+# pylint: disable=W0613
+@receiver(post_save, sender=User)
+def forget_inactive_user_tokens(sender, instance: User, **kwargs) -> None:
+    """Токены деактивированного пользователя сразу убираются из кэша"""
+    if not instance.is_active:
+        invalidate_user_tokens(instance)
@@ -0,0 +1,83 @@
+"""Модуль, содержащий тесты аутентификации по токену"""
+from unittest.mock import patch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from user.analytic.clients.redis_client import RedisClient, local_cache
+from user.authentication import AUTH_TOKEN_TOMBSTONE, get_auth_token_key
+from user.factories import UserFactory
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+
+
+class TestCachedTokenAuthentication(FakeRedisTestCase, APITestCase):
+    """Тесты кэширования аутентификации по токену"""
+    link = '/api/v1/user/'
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserFactory()
+        self.token = Token.objects.create(user=self.user)  # pylint: disable=E1101
+        self.headers = {"Authorization": f"Token {self.token.key}"}
+
+    def test_cached_user(self):
+        """Проверяет, что повторные запросы не читают токен из базы"""
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.link, headers=self.headers)
+        self.assertEqual([item['username'] for item in response.data], [self.user.username])
+        local_cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        self.assertIsNone(self.redis_client.get(self.token.key), "Токен не должен попадать в ключ")
+
+    def test_logout_invalidates(self):
+        """Проверяет, что выход из системы сразу убирает токен из кэша"""
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        response = self.client.post(f'{self.link}logout/', headers=self.headers)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            self.redis_client.get(get_auth_token_key(self.token.key)), AUTH_TOKEN_TOMBSTONE,
+        )
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 401)
+
+    def test_invalidation_wins_over_concurrent_miss(self):
+        """Проверяет, что запрос, прочитавший токен до удаления, не возвращает его в кэш"""
+        authenticate = TokenAuthentication.authenticate_credentials
+
+        def authenticate_and_logout(auth, key):
+            result = authenticate(auth, key)
+            self.token.delete()
+            return result
+
+        with patch.object(TokenAuthentication, 'authenticate_credentials', authenticate_and_logout):
+            self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        local_cache.clear()
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 401)
+
+    def test_cached_inactive_user(self):
+        """Проверяет отказ пользователю, ставшему неактивным в обход сигналов"""
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        cache_key = get_auth_token_key(self.token.key)
+        fields = RedisClient.loads(self.redis_client.get(cache_key))
+        self.redis_client.set(cache_key, RedisClient.dumps({**fields, 'is_active': False}))
+        local_cache.clear()
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 401)
+
+    def test_deactivation_invalidates(self):
+        """Проверяет, что деактивация пользователя сразу убирает его токены из кэша"""
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 401)
+
+    def test_redis_unavailable(self):
+        """Проверяет, что без Redis пользователь читается из базы"""
+        with patch.object(RedisClient, 'get', side_effect=RedisConnectionError), \
+                patch.object(RedisClient, 'set', side_effect=RedisConnectionError), \
+                self.assertLogs('user.authentication', 'WARNING'):
+            with self.assertNumQueries(2):
+                self.assertEqual(self.client.get(self.link, headers=self.headers).status_code, 200)
@@ -0,0 +1,40 @@
+"""
+Модуль, содержащий вспомогательные при
+тестировании кэша redis инструменты
+"""
+from unittest.mock import patch
+
+import fakeredis
+from django.test import SimpleTestCase
+
+from user.analytic.clients.redis_client import RedisClient, local_cache, cache_namespaces
+
+
+class FakeRedisTestCase(SimpleTestCase):
+    """
+    Тестовый класс, подменяющий единственный
+    экземпляр RedisClient и асинхронные клиенты
+    на работающие в памяти с общими данными
+
+    Attributes:
+        redis_client: Подмененный экземпляр клиента
+    """
+    redis_client: RedisClient
+
+    def setUp(self):
+        super().setUp()
+        self.redis_client = object.__new__(RedisClient)
+        patcher = patch.object(RedisClient, "instance", self.redis_client, create=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        server = fakeredis.FakeServer()
+        RedisClient(connection_pool=fakeredis.FakeRedis(server=server).connection_pool)
+        patcher = patch.object(
+            RedisClient, "get_async_client", lambda: fakeredis.aioredis.FakeRedis(server=server),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        local_cache.clear()
+        self.addCleanup(local_cache.clear)
+        cache_namespaces.clear()
+        self.addCleanup(cache_namespaces.clear)
@@ -0,0 +1,100 @@
+"""Модуль, содержащий тесты асинхронного YouGile клиента"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+from django.test import SimpleTestCase
+
+from user.analytic.clients.rate_limiter import LocalRateLimiterBackend
+from user.analytic.clients.yougile_client import AsyncYouGileClient, async_yougile_client
+from user.analytic.clients.yougile_client.yougile_client import rate_limiter
+
+
+class TestAsyncYouGileClient(SimpleTestCase):
+    """Тесты асинхронного YouGile клиента"""
+    count = 120
+
+    def setUp(self):
+        self.in_flight = self.max_in_flight = 0
+        self.requests: list[httpx.Request] = []
+        patcher = patch.object(rate_limiter, "backend", LocalRateLimiterBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        """Обработчик, имитирующий пагинированную конечную точку сотрудников"""
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        limit, offset = int(request.url.params["limit"]), int(request.url.params["offset"])
+        return httpx.Response(200, json={
+            "paging": {
+                "count": self.count, "limit": limit, "offset": offset,
+                "next": offset + limit < self.count,
+            },
+            "content": [
+                {"id": str(i), "email": f"{i}@mail.ru", "realName": f"Name {i}"}
+                for i in range(offset, min(offset + limit, self.count))
+            ],
+        })
+
+    def get_pages(self, concurrency: int = 4, handler=None) -> list:
+        """Метод получения всех страниц сотрудников через имитацию API"""
+        transport = httpx.MockTransport(handler or self.handler)
+
+        async def get_pages():
+            client = AsyncYouGileClient("token", concurrency=concurrency, transport=transport)
+            async with client:
+                return await client.get_employers_pages(limit=10)
+        return asyncio.run(get_pages())
+
+    def test_fetches_all_pages_concurrently(self):
+        """Проверяет, что все страницы получены по порядку с ограничением одновременности"""
+        pages = self.get_pages(concurrency=3)
+        self.assertEqual(len(pages), 12)
+        self.assertEqual(
+            [employee.id for page in pages for employee in page.content],
+            [str(i) for i in range(self.count)],
+        )
+        self.assertEqual(self.max_in_flight, 3)
+        self.assertEqual(self.requests[0].headers["Authorization"], "Bearer token")
+
+    def test_semaphores_of_closed_loops_are_dropped(self):
+        """Проверяет, что ограничители закрытых event loop не накапливаются"""
+        with patch.dict(async_yougile_client._semaphores, clear=True):  # pylint: disable=W0212
+            for _ in range(2):
+                self.get_pages()
+            self.assertEqual(len(async_yougile_client._semaphores), 1)  # pylint: disable=W0212
+
+    def test_semaphore_per_concurrency(self):
+        """Проверяет, что клиент с другим concurrency не получает чужой ограничитель"""
+        transport = httpx.MockTransport(self.handler)
+
+        async def get_pages(concurrency):
+            client = AsyncYouGileClient("token", concurrency=concurrency, transport=transport)
+            async with client:
+                await client.get_employers_pages(limit=10)
+
+        async def get_pages_twice():
+            await get_pages(1)
+            self.max_in_flight = 0
+            await get_pages(3)
+
+        asyncio.run(get_pages_twice())
+        self.assertEqual(self.max_in_flight, 3)
+
+    def test_retries_rate_limited_requests(self):
+        """Проверяет повтор запроса после 429 с учетом Retry-After"""
+        responses = iter([httpx.Response(429, headers={"Retry-After": "0"})])
+
+        async def rate_limited(request):
+            response = next(responses, None)
+            return response if response is not None else await self.handler(request)
+
+        with patch("asyncio.sleep", wraps=asyncio.sleep) as sleep:
+            self.count = 5
+            pages = self.get_pages(handler=rate_limited)
+        self.assertEqual(len(pages[0].content), 5)
+        sleep.assert_any_call(0.0)
@@ -0,0 +1,47 @@
+"""Модуль, содержащий тесты кодеков кэша"""
+import pickle
+
+from django.test import SimpleTestCase
+
+from user.analytic.clients.cache_codecs import (
+    CacheSerializer, PickleCodec, JsonCodec, MsgpackCodec, ZstdCompressor,
+    get_codec, get_compressor,
+)
+
+
+class TestCacheSerializer(SimpleTestCase):
+    """Тесты сериализатора записей кэша"""
+    entry = [1_700_000_000.5, {"paging": {"next": False}, "content": [{"title": "Задача"}]}]
+
+    def test_round_trip(self):
+        """Проверяет, что каждый кодек, со сжатием и без, восстанавливает данные"""
+        for codec in (PickleCodec(), JsonCodec(), MsgpackCodec()):
+            for compressor in (None, ZstdCompressor()):
+                with self.subTest(codec=codec.name, compressor=compressor):
+                    serializer = CacheSerializer(codec, compressor)
+                    data = serializer.dumps(self.entry)
+                    self.assertEqual(list(serializer.loads(data)), self.entry)
+
+    def test_compress_threshold(self):
+        """Проверяет, что сжимаются только данные не меньше порога"""
+        serializer = CacheSerializer(JsonCodec(), ZstdCompressor(), compress_threshold=1024)
+        small = serializer.dumps(self.entry)
+        large = serializer.dumps([self.entry] * 100)
+        self.assertEqual(small[0], JsonCodec.codec_id)
+        self.assertEqual(large[0], JsonCodec.codec_id | ZstdCompressor.compressor_id << 4)
+        self.assertLess(len(large), len(JsonCodec().encode([self.entry] * 100)))
+
+    def test_mixed_deployment(self):
+        """Проверяет, что записи читаются независимо от настроек читающего"""
+        writer = CacheSerializer(MsgpackCodec(), ZstdCompressor())
+        reader = CacheSerializer(JsonCodec())
+        self.assertEqual(reader.loads(writer.dumps(self.entry)), self.entry)
+        self.assertEqual(reader.loads(pickle.dumps(tuple(self.entry))), tuple(self.entry))
+
+    def test_unknown_name(self):
+        """Проверяет понятную ошибку при неизвестном кодеке или алгоритме сжатия"""
+        self.assertIsInstance(get_codec("msgpack"), MsgpackCodec)
+        with self.assertRaisesMessage(ValueError, "pickle, json, msgpack"):
+            get_codec("yaml")
+        with self.assertRaisesMessage(ValueError, "zstd"):
+            get_compressor("gzip")
@@ -0,0 +1,104 @@
+"""Модуль, содержащий тесты автоматического выключателя"""
+import asyncio
+from unittest.mock import patch, Mock
+
+import requests
+from django.test import SimpleTestCase
+
+from user.analytic.clients.circuit_breaker import CircuitBreaker, CircuitOpen, CircuitState
+from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.clients.yougile_client.yougile_client import is_upstream_failure
+
+CLIENT_MODULE = "user.analytic.clients.yougile_client.yougile_client"
+
+
+class TestCircuitBreaker(SimpleTestCase):
+    """Тесты автоматического выключателя"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            "test", failure_rate=0.5, min_calls=4, window=4, slow_call=1,
+            open_timeout=10, half_open_calls=1, clock=lambda: self.now,
+        )
+
+    def call(self, fail: bool = False, duration: float = 0) -> None:
+        """Метод вызова через выключатель"""
+        with self.breaker.guard():
+            self.now += duration
+            if fail:
+                raise ConnectionError
+
+    def test_opens_on_failure_rate(self):
+        """Проверяет размыкание по доле неудачных вызовов"""
+        self.call()
+        with self.assertRaises(ConnectionError):
+            self.call(fail=True)
+        self.call()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+        self.call(duration=2)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        with self.assertRaises(CircuitOpen) as context:
+            self.call()
+        self.assertAlmostEqual(context.exception.retry_after, 10)
+
+    def test_half_open(self):
+        """Проверяет пробные вызовы после open_timeout"""
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                self.call(fail=True)
+        self.now += 10
+        with self.assertRaises(ConnectionError):
+            self.call(fail=True)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+        self.now += 10
+        with self.breaker.guard():
+            with self.assertRaises(CircuitOpen):
+                self.breaker.allow()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_cancelled_probe(self):
+        """Проверяет, что отмененный пробный вызов не занимает место навсегда"""
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                self.call(fail=True)
+        self.now += 10
+        with self.assertRaises(asyncio.CancelledError):
+            with self.breaker.guard():
+                raise asyncio.CancelledError
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+        self.call()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    def test_ignored_errors(self):
+        """Проверяет, что ошибки, не говорящие о сбое сервиса, не размыкают выключатель"""
+        self.breaker.is_failure = lambda exc: False
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                self.call(fail=True)
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+
+class TestYouGileCircuitBreaker(SimpleTestCase):
+    """Тесты выключателей конечных точек YouGile"""
+
+    def test_is_upstream_failure(self):
+        """Проверяет, какие ошибки запроса считаются сбоем YouGile"""
+        def http_error(status_code: int) -> requests.HTTPError:
+            return requests.HTTPError(response=Mock(status_code=status_code))
+
+        self.assertTrue(is_upstream_failure(http_error(503)))
+        self.assertFalse(is_upstream_failure(http_error(401)))
+        self.assertTrue(is_upstream_failure(requests.ConnectTimeout()))
+        self.assertFalse(is_upstream_failure(ValueError()))
+
+    def test_client_uses_endpoint_breaker(self):
+        """Проверяет, что клиент не идет в API через разомкнутый выключатель"""
+        breaker = CircuitBreaker("test", min_calls=1)
+        breaker.record(True)
+        with patch(f"{CLIENT_MODULE}.get_endpoint_breaker", return_value=breaker), \
+                patch(f"{CLIENT_MODULE}.rate_limiter"), \
+                patch(f"{CLIENT_MODULE}.get_session") as get_session:
+            with self.assertRaises(CircuitOpen):
+                YouGileClient("token")._get("tasks", {})  # pylint: disable=W0212
+        get_session.assert_not_called()
@@ -0,0 +1,37 @@
+"""Модуль, содержащий тесты HTTP транспорта клиентов"""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from urllib3.util.retry import Retry
+
+from core.settings import HTTP_RETRY_BACKOFF_FACTOR, HTTP_RETRY_BACKOFF_MAX
+from user.analytic.clients import http_session
+from user.analytic.clients.http_session import get_session, get_retry_delay
+
+
+class TestHttpSession(SimpleTestCase):
+    """Тесты общей HTTP сессии"""
+
+    def test_session_is_shared_per_process(self):
+        """Проверяет, что сессия переиспользуется и пересоздается после fork"""
+        session = get_session()
+        self.assertIs(get_session(), session)
+        with patch.object(http_session.os, "getpid", return_value=-1):
+            self.assertIsNot(get_session(), session)
+
+    def test_retry_policy(self):
+        """Проверяет, что сессия повторяет только неудачные подключения идемпотентных запросов"""
+        retry = get_session().get_adapter("https://ru.yougile.com").max_retries
+        self.assertIsInstance(retry, Retry)
+        self.assertFalse(retry.is_retry("GET", 429, has_retry_after=True))
+        self.assertFalse(retry.is_retry("GET", 502))
+        self.assertEqual(retry.read, 0)
+        self.assertFalse(retry.is_exhausted())
+
+    def test_retry_delay(self):
+        """Проверяет задержку повтора по Retry-After и ее предел"""
+        self.assertEqual(get_retry_delay("2", 0), 2)
+        self.assertEqual(get_retry_delay("100000", 0), HTTP_RETRY_BACKOFF_MAX)
+        self.assertEqual(get_retry_delay(None, 1), HTTP_RETRY_BACKOFF_FACTOR * 2)
+        self.assertEqual(get_retry_delay("garbage", 1), HTTP_RETRY_BACKOFF_FACTOR * 2)
+        self.assertEqual(get_retry_delay("Mon, 01 Jan 2001 00:00:00 GMT", 1), 0)
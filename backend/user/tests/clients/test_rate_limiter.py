@@ -0,0 +1,112 @@
+"""Модуль, содержащий тесты ограничителя частоты запросов"""
+from unittest.mock import patch, Mock
+
+import requests
+from django.test import SimpleTestCase
+
+from core.settings import HTTP_RETRY_TOTAL
+from user.analytic.clients.rate_limiter import (
+    RateLimiter, RateLimitExceeded, LocalRateLimiterBackend, RedisRateLimiterBackend,
+)
+from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.clients.yougile_client.yougile_client import rate_limiter
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+
+CLIENT_MODULE = "user.analytic.clients.yougile_client.yougile_client"
+
+
+class TestLocalRateLimiterBackend(SimpleTestCase):
+    """Тесты хранилища ограничителя частоты в памяти процесса"""
+
+    def test_token_bucket(self):
+        """Проверяет расход и пополнение корзины"""
+        now = 0.0
+        backend = LocalRateLimiterBackend(clock=lambda: now)
+        self.assertEqual([backend.acquire("key", 2, 3) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(backend.acquire("key", 2, 3), 0.5)
+        self.assertEqual(backend.acquire("other", 2, 3), 0)
+        now = 0.5
+        self.assertEqual(backend.acquire("key", 2, 3), 0)
+        now = 100
+        self.assertEqual([backend.acquire("key", 2, 3) for _ in range(3)], [0, 0, 0])
+        self.assertGreater(backend.acquire("key", 2, 3), 0)
+
+
+class TestRedisRateLimiterBackend(FakeRedisTestCase):
+    """Тесты хранилища ограничителя частоты в Redis"""
+
+    def test_token_bucket(self):
+        """Проверяет, что корзина в Redis ограничивает частоту"""
+        backend = RedisRateLimiterBackend()
+        self.assertEqual([backend.acquire("key", 1, 2) for _ in range(2)], [0, 0])
+        self.assertGreater(backend.acquire("key", 1, 2), 0)
+        self.assertEqual(backend.acquire("other", 1, 2), 0)
+        self.assertGreater(self.redis_client.pttl("key"), 0)
+
+
+class TestRateLimiter(SimpleTestCase):
+    """Тесты ограничителя частоты запросов"""
+
+    def setUp(self):
+        self.limiter = RateLimiter("prefix", rate=10, burst=1, backend=LocalRateLimiterBackend())
+
+    def test_fail_fast(self):
+        """Проверяет немедленный отказ без ожидания"""
+        self.limiter.acquire("key")
+        with self.assertRaises(RateLimitExceeded) as context:
+            self.limiter.acquire("key")
+        self.assertEqual(context.exception.key, "key")
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_wait(self):
+        """Проверяет ожидание токена до дедлайна"""
+        now = [0.0]
+        limiter = RateLimiter(
+            "prefix", rate=10, burst=1, backend=LocalRateLimiterBackend(lambda: now[0]),
+        )
+        limiter.acquire("key")
+
+        def sleep(seconds):
+            now[0] += seconds
+
+        with patch("time.sleep", side_effect=sleep) as mock_sleep:
+            limiter.acquire("key", timeout=1)
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(now[0], 0.1)
+
+    def test_client_acquires_before_request(self):
+        """Проверяет, что клиент не идет в API при исчерпанном ограничении"""
+        client = YouGileClient("token", rate_limit_wait=0)
+        with patch.object(rate_limiter, "backend", self.limiter.backend), \
+                patch.object(rate_limiter, "burst", 1), \
+                patch(f"{CLIENT_MODULE}.get_session") as get_session:
+            client._get("tasks", {})  # pylint: disable=W0212
+            with self.assertRaises(RateLimitExceeded):
+                client._get("tasks", {})  # pylint: disable=W0212
+        self.assertEqual(get_session.return_value.get.call_count, 1)
+
+    def test_client_acquires_for_each_retry(self):
+        """Проверяет, что повтор после 429 берет свой токен ограничителя"""
+        limited = requests.Response()
+        limited.status_code, limited.headers["Retry-After"] = 429, "1"
+        response = Mock(**{"json.return_value": {}})
+        with patch.object(rate_limiter, "acquire") as acquire, \
+                patch(f"{CLIENT_MODULE}.time.sleep") as sleep, \
+                patch(f"{CLIENT_MODULE}.get_session") as get_session:
+            get_session.return_value.get.side_effect = [limited, response]
+            YouGileClient("token")._get("tasks", {})  # pylint: disable=W0212
+        self.assertEqual(acquire.call_count, 2)
+        sleep.assert_called_once_with(1)
+
+    def test_client_raises_after_retries(self):
+        """Проверяет, что после последнего повтора клиент поднимает ошибку ответа"""
+        unavailable = requests.Response()
+        unavailable.status_code, unavailable.headers["Retry-After"] = 503, "garbage"
+        with patch.object(rate_limiter, "acquire"), \
+                patch(f"{CLIENT_MODULE}.time.sleep") as sleep, \
+                patch(f"{CLIENT_MODULE}.get_session") as get_session:
+            get_session.return_value.get.return_value = unavailable
+            with self.assertRaises(requests.HTTPError):
+                YouGileClient("token")._get("retries", {})  # pylint: disable=W0212
+        self.assertEqual(get_session.return_value.get.call_count, HTTP_RETRY_TOTAL + 1)
+        self.assertEqual(sleep.call_count, HTTP_RETRY_TOTAL)
@@ -0,0 +1,366 @@
+"""Модуль, содержащий тесты клиента redis"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import fakeredis
+from django.test import SimpleTestCase
+
+from core.settings import REDIS_MAX_CONNECTIONS, REDIS_SOCKET_TIMEOUT
+from user.analytic.clients import redis_client
+from user.analytic.clients.redis_client import (
+    RedisClient, LocalCache, local_cache, redis_cache, background_refresher,
+    InstrumentedConnectionPool, get_connection_pool,
+    cache_namespaces, invalidate_project, invalidate_token,
+)
+from user.analytic.clients.staleness import track_staleness
+from user.analytic.clients.yougile_client import YouGileClient
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+
+UPSTREAM = f"{__name__}.upstream"
+
+
+def upstream(page):
+    """Функция внешнего источника страниц, подменяемая в тестах"""
+    raise NotImplementedError
+
+
+def get_page(page):
+    """Функция получения страницы из внешнего источника"""
+    return upstream(page)
+
+
+def echo_page(page):
+    """Функция, возвращающая номер запрошенной страницы"""
+    return page
+
+
+class TestCacheKey(FakeRedisTestCase):
+    """Тесты ключей кэша"""
+
+    @staticmethod
+    def get_key(*args, version: int = 1, **kwargs) -> str:
+        """Метод получения ключа кэша для YouGileClient._get_tasks"""
+        # pylint: disable=W0212, E1101
+        function = YouGileClient._get_tasks.__wrapped__
+        return RedisClient.get_key_by_function_with_params(function, args, kwargs, version)
+
+    def test_key_is_shared_between_clients(self):
+        """Проверяет, что клиенты с одинаковым токеном разделяют ключ"""
+        self.assertEqual(
+            self.get_key(YouGileClient("token"), limit=50),
+            self.get_key(YouGileClient("token"), limit=50),
+        )
+        self.assertNotEqual(
+            self.get_key(YouGileClient("token"), limit=50),
+            self.get_key(YouGileClient("other_token"), limit=50),
+        )
+
+    def test_key_is_normalized_by_signature(self):
+        """Проверяет, что способ передачи аргументов не влияет на ключ"""
+        client = YouGileClient("token")
+        self.assertEqual(
+            self.get_key(client, "column", False),
+            self.get_key(client, column_id="column", limit=50),
+        )
+        self.assertNotEqual(
+            self.get_key(client, limit=50),
+            self.get_key(client, limit=100),
+        )
+
+    def test_key_content(self):
+        """Проверяет, что ключ содержит версию и имя функции, но не токен"""
+        key = self.get_key(YouGileClient("secret_token"))
+        self.assertIn("YouGileClient._get_tasks", key)
+        self.assertNotIn("secret_token", key)
+        self.assertNotEqual(key, self.get_key(YouGileClient("secret_token"), version=2))
+
+    def test_namespace_invalidation(self):
+        """Проверяет, что инвалидация проекта или токена меняет ключи его клиентов"""
+        project, other = Mock(id=1), Mock(id=2)
+        key = self.get_key(YouGileClient("token", project_id=project.id))
+        self.assertEqual(key, self.get_key(YouGileClient("token", project_id=other.id)))
+
+        self.assertEqual(invalidate_project(project), 1)
+        invalidated = self.get_key(YouGileClient("token", project_id=project.id))
+        self.assertNotEqual(invalidated, key)
+        self.assertEqual(self.get_key(YouGileClient("token", project_id=other.id)), key)
+
+        invalidate_token("token")
+        self.assertNotIn(
+            self.get_key(YouGileClient("token", project_id=other.id)), (key, invalidated),
+        )
+
+    def test_generations_are_remembered(self):
+        """Проверяет, что поколения читаются из Redis не чаще раза в local_ttl"""
+        client = YouGileClient("token", project_id=1)
+        with patch.object(self.redis_client, "mget", wraps=self.redis_client.mget) as mget:
+            self.get_key(client)
+            self.get_key(client)
+        mget.assert_called_once()
+        with patch("time.monotonic", return_value=time.monotonic() + cache_namespaces.local_ttl), \
+                patch.object(self.redis_client, "mget", wraps=self.redis_client.mget) as mget:
+            self.get_key(client)
+        mget.assert_called_once()
+
+    def test_functions_do_not_share_entries(self):
+        """Проверяет, что разные функции одного модуля не делят записи кэша"""
+        with patch(UPSTREAM, return_value={"page": 1}):
+            self.assertEqual(redis_cache(10)(get_page)(1), {"page": 1})
+            self.assertEqual(redis_cache(10)(echo_page)(1), 1)
+            self.assertEqual(redis_cache(10)(get_page)(1), {"page": 1})
+
+
+class TestLocalCache(SimpleTestCase):
+    """Тесты локального кэша процесса"""
+
+    def test_lru_eviction(self):
+        """Проверяет вытеснение по количеству записей и объему"""
+        cache = LocalCache(max_items=2, max_bytes=10)
+        cache.set("a", b"1", 10)
+        cache.set("b", b"2", 10)
+        cache.get("a")
+        cache.set("c", b"3", 10)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), b"1")
+
+        cache.set("d", b"1234567890", 10)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 10)
+        self.assertEqual(cache.stats.evictions, 3)
+
+        cache.set("e", b"12345678901", 10)
+        self.assertIsNone(cache.get("e"))
+
+    def test_expiration(self):
+        """Проверяет истечение записи по TTL"""
+        cache = LocalCache(max_items=2, max_bytes=10)
+        with patch("time.monotonic", return_value=100):
+            cache.set("a", b"1", 5)
+        with patch("time.monotonic", return_value=104):
+            self.assertEqual(cache.get("a"), b"1")
+        with patch("time.monotonic", return_value=105):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+        self.assertEqual(cache.size, 0)
+
+
+class TestRedisCacheLocalTier(FakeRedisTestCase):
+    """Тесты локального уровня redis_cache"""
+
+    def test_local_tier(self):
+        """Проверяет, что повторное чтение не обращается к Redis"""
+        cached = redis_cache(10, local_ttl=5)(get_page)
+        with patch(UPSTREAM, return_value={"content": []}) as function:
+            self.assertEqual(cached(1), {"content": []})
+            with patch.object(RedisClient, "pipeline") as pipeline:
+                self.assertEqual(cached(1), {"content": []})
+                pipeline.assert_not_called()
+        function.assert_called_once_with(1)
+
+    def test_local_tier_does_not_outlive_redis(self):
+        """Проверяет, что запись локального кэша не живет дольше записи в Redis"""
+        cached = redis_cache(10, local_ttl=5)(echo_page)
+        key = RedisClient.get_key_by_function_with_params(
+            cached.__wrapped__, (1,), {}, 1,
+        )
+        self.redis_client.setex(key, 2, self.redis_client.dumps((time.time(), 1)))
+        with patch("time.monotonic", return_value=100):
+            self.assertEqual(cached(1), 1)
+        self.assertLessEqual(local_cache._entries[key][0], 102)  # pylint: disable=W0212
+
+
+class TestRedisCacheSingleFlight(FakeRedisTestCase):
+    """Тесты единственного вычисления при промахе redis_cache"""
+
+    def test_concurrent_callers_share_computation(self):
+        """Проверяет, что одновременные промахи вычисляются один раз"""
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow(page):
+            calls.append(page)
+            started.set()
+            release.wait(5)
+            return {"page": page}
+
+        cached = redis_cache(10, single_flight=True)(slow)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(cached, 1)]
+            started.wait(5)
+            futures += [executor.submit(cached, 1) for _ in range(3)]
+            release.set()
+            results = [future.result(5) for future in futures]
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [{"page": 1}] * 4)
+
+    def test_waits_for_lock_owner(self):
+        """Проверяет, что процесс без блокировки дожидается значения владельца"""
+        cached = redis_cache(10, single_flight=True, lock_wait=1)(get_page)
+        key = RedisClient.get_key_by_function_with_params(cached.__wrapped__, (1,), {}, 1)
+        self.redis_client.set(f"{key}:lock", "other-process")
+        value = self.redis_client.dumps((time.time(), 1))
+        threading.Timer(0.1, self.redis_client.setex, (key, 10, value)).start()
+        with patch(UPSTREAM, return_value=2) as function:
+            self.assertEqual(cached(1), 1)
+        function.assert_not_called()
+
+    def test_computes_after_lock_wait(self):
+        """Проверяет, что процесс вычисляет значение сам, не дождавшись владельца"""
+        cached = redis_cache(10, single_flight=True, lock_wait=0.1)(echo_page)
+        key = RedisClient.get_key_by_function_with_params(cached.__wrapped__, (1,), {}, 1)
+        self.redis_client.set(f"{key}:lock", "other-process")
+        self.assertEqual(cached(1), 1)
+
+
+class TestRedisCacheStaleWhileRevalidate(FakeRedisTestCase):
+    """Тесты отдачи устаревшего значения с фоновым обновлением"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch(UPSTREAM, side_effect=lambda page: {"version": self.function.call_count})
+        self.function = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cached = redis_cache(10, stale_ttl=20)(get_page)
+        self.now = time.time()
+        with patch("time.time", return_value=self.now):
+            self.cached(1)
+
+    def call_at(self, moment: float):
+        """Метод вызова кэшированной функции в заданный момент времени"""
+        with patch("time.time", return_value=self.now + moment):
+            with patch.object(
+                    background_refresher, "submit",
+                    side_effect=lambda key, function: function(),
+            ) as submit:
+                return self.cached(1), submit
+
+    def test_fresh(self):
+        """Проверяет, что свежее значение отдается без обновления"""
+        result, submit = self.call_at(5)
+        self.assertEqual(result, {"version": 1})
+        submit.assert_not_called()
+
+    def test_stale(self):
+        """Проверяет, что устаревшее значение отдается сразу и обновляется в фоне"""
+        result, submit = self.call_at(15)
+        self.assertEqual(result, {"version": 1})
+        submit.assert_called_once()
+        result, _ = self.call_at(16)
+        self.assertEqual(result, {"version": 2})
+
+    def test_too_old(self):
+        """Проверяет, что слишком старое значение не используется"""
+        result, submit = self.call_at(31)
+        self.assertEqual(result, {"version": 2})
+        submit.assert_not_called()
+
+    def test_stored_with_stale_ttl(self):
+        """Проверяет, что запись в Redis живет life_time + stale_ttl"""
+        key = RedisClient.get_key_by_function_with_params(self.cached.__wrapped__, (1,), {}, 1)
+        self.assertAlmostEqual(self.redis_client.ttl(key), 30, delta=1)
+
+
+class TestRedisCacheFallback(FakeRedisTestCase):
+    """Тесты отдачи последнего удачного результата при сбое"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch(UPSTREAM, return_value={"version": 1})
+        self.function = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cached = redis_cache(10, fallback_ttl=100, fallback_on=(ConnectionError,))(get_page)
+        self.now = time.time()
+        with patch("time.time", return_value=self.now):
+            self.cached(1)
+
+    def call_at(self, moment: float):
+        """Метод вызова кэшированной функции в заданный момент времени с учетом устаревания"""
+        staleness = track_staleness()
+        with patch("time.time", return_value=self.now + moment):
+            return self.cached(1), staleness
+
+    def test_fallback(self):
+        """Проверяет, что при сбое отдается последний удачный результат с отметкой устаревания"""
+        self.function.side_effect = ConnectionError
+        with self.assertLogs("user.analytic.clients.redis_client", "WARNING"):
+            result, staleness = self.call_at(50)
+        self.assertEqual(result, {"version": 1})
+        self.assertAlmostEqual(staleness.age, 50)
+
+    def test_fallback_only_on_listed_errors(self):
+        """Проверяет, что прочие ошибки не подменяются сохраненным результатом"""
+        self.function.side_effect = ValueError
+        with self.assertRaises(ValueError):
+            self.call_at(50)
+
+    def test_recomputes_when_available(self):
+        """Проверяет, что при доступном сервисе результат пересчитывается"""
+        self.function.return_value = {"version": 2}
+        result, staleness = self.call_at(50)
+        self.assertEqual(result, {"version": 2})
+        self.assertIsNone(staleness.age)
+
+    def test_stored_with_fallback_ttl(self):
+        """Проверяет, что запись в Redis хранится еще fallback_ttl"""
+        key = RedisClient.get_key_by_function_with_params(self.cached.__wrapped__, (1,), {}, 1)
+        self.assertAlmostEqual(self.redis_client.ttl(key), 110, delta=1)
+
+
+class TestConnectionPool(SimpleTestCase):
+    """Тесты пула соединений Redis"""
+
+    def test_shared_pool(self):
+        """Проверяет, что клиент создается один раз на общем пуле процесса"""
+        with patch.object(RedisClient, "instance", object.__new__(RedisClient), create=True):
+            client = RedisClient()
+            pool = client.connection_pool
+            self.assertIs(pool, get_connection_pool())
+            self.assertIs(RedisClient(), client)
+            self.assertIs(RedisClient().connection_pool, pool)
+        self.assertEqual(pool.max_connections, REDIS_MAX_CONNECTIONS)
+        self.assertEqual(pool.connection_kwargs["socket_timeout"], REDIS_SOCKET_TIMEOUT)
+
+    def test_stats(self):
+        """Проверяет статистику выданных и свободных соединений"""
+        pool = InstrumentedConnectionPool(
+            connection_class=fakeredis.FakeConnection,
+            server=fakeredis.FakeServer(),
+            max_connections=2,
+        )
+        first = pool.get_connection("GET")
+        second = pool.get_connection("GET")
+        pool.release(first)
+        stats = pool.get_stats()
+        self.assertEqual((stats.created, stats.in_use, stats.idle), (2, 1, 1))
+        self.assertEqual(stats.waits, 2)
+        pool.release(second)
+        self.assertEqual(pool.get_stats().in_use, 0)
+
+    def test_async_clients_of_closed_loops_are_dropped(self):
+        """Проверяет, что асинхронные клиенты закрытых event loop не накапливаются"""
+        async def get_client():
+            self.assertIs(RedisClient.get_async_client(), RedisClient.get_async_client())
+            return asyncio.get_running_loop()
+
+        with patch.dict(redis_client._async_clients, clear=True):  # pylint: disable=W0212
+            first = asyncio.run(get_client())
+            second = asyncio.run(get_client())
+            self.assertEqual(list(redis_client._async_clients), [second])  # pylint: disable=W0212
+        self.assertTrue(first.is_closed())
+
+
+class TestRedisCacheRoundTrips(FakeRedisTestCase):
+    """Тесты количества обращений redis_cache к Redis"""
+
+    def test_hit_is_single_get(self):
+        """Проверяет, что попадание в кэш стоит ровно одного GET"""
+        cached = redis_cache(10)(echo_page)
+        cached(1)
+        with patch.object(
+                self.redis_client, "execute_command", wraps=self.redis_client.execute_command,
+        ) as execute_command:
+            self.assertEqual(cached(1), 1)
+        self.assertEqual([call.args[0] for call in execute_command.call_args_list], ["GET"])
@@ -0,0 +1,70 @@
+"""Модуль, содержащий тесты YouGile клиента"""
+from unittest.mock import patch
+
+import orjson
+from django.test import SimpleTestCase
+
+from user.analytic.clients.yougile_client import YouGileClient, schemas
+from user.tests.clients.yougile_test_pack import make_tasks_response
+
+
+class TestYouGileClientIterators(SimpleTestCase):
+    """Тесты обхода страниц YouGile клиентом"""
+
+    def test_iter_tasks(self):
+        """Проверяет, что итератор обходит все страницы, с предзагрузкой и без"""
+        for prefetch in (True, False):
+            with self.subTest(prefetch=prefetch), patch.object(
+                    YouGileClient, "_get_tasks",
+                    side_effect=lambda **kwargs: make_tasks_response(
+                        kwargs["limit"], kwargs["offset"], count=25,
+                    ),
+            ) as get_tasks:
+                tasks = list(YouGileClient("token").iter_tasks(limit=10, prefetch=prefetch))
+                self.assertEqual(len(tasks), 25)
+                self.assertEqual(
+                    sorted(call.kwargs["offset"] for call in get_tasks.call_args_list),
+                    [0, 10, 20],
+                )
+
+    def test_iter_tasks_prefetches_one_page(self):
+        """Проверяет, что заранее запрашивается только следующая страница"""
+        with patch.object(
+                YouGileClient, "_get_tasks",
+                side_effect=lambda **kwargs: make_tasks_response(
+                    kwargs["limit"], kwargs["offset"], count=100,
+                ),
+        ) as get_tasks:
+            tasks = YouGileClient("token").iter_tasks(limit=10)
+            next(tasks)
+            tasks.close()
+        self.assertLessEqual(get_tasks.call_count, 2)
+
+
+class TestYouGileSchemas(SimpleTestCase):
+    """Тесты схем ответов YouGile API"""
+    page = make_tasks_response(limit=10, offset=0, count=5)
+
+    def test_paginated_is_cached(self):
+        """Проверяет, что схема страницы создается один раз на схему объекта"""
+        self.assertIs(schemas.paginated(schemas.Task), schemas.paginated(schemas.Task))
+        self.assertIsNot(schemas.paginated(schemas.Task), schemas.paginated(schemas.Employee))
+
+    def test_parse_page(self):
+        """Проверяет, что разбор из байт и из словаря дает одну страницу"""
+        self.assertEqual(
+            schemas.parse_page(schemas.Task, orjson.dumps(self.page)),
+            schemas.parse_page(schemas.Task, self.page),
+        )
+
+    def test_trusted_page(self):
+        """Проверяет облегченные записи страницы"""
+        page = schemas.parse_trusted_page(schemas.TaskRecord, self.page)
+        validated = schemas.parse_page(schemas.Task, self.page)
+        self.assertEqual(page.paging.count, 5)
+        self.assertEqual(
+            [(task.completed, task.assigned) for task in page.content],
+            [(task.completed, task.assigned) for task in validated.content],
+        )
+        with self.assertRaises(AttributeError):
+            page.content[0].title = "title"
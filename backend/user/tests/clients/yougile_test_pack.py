@@ -0,0 +1,25 @@
+"""
+Модуль, содержащий вспомогательные при
+тестировании YouGile клиента инструменты
+"""
+
+
+def make_tasks_response(limit: int, offset: int, count: int) -> dict:
+    """
+    Функция, формирующая ответ конечной точки задач
+
+    Args:
+        limit: Размер страницы
+        offset: Смещение страницы
+        count: Общее количество задач
+    """
+    return {
+        "paging": {
+            "count": count, "limit": limit, "offset": offset,
+            "next": offset + limit < count,
+        },
+        "content": [
+            {"completed": i % 2 == 0, "assigned": [f"employee {i % 3}"]}
+            for i in range(offset, min(offset + limit, count))
+        ],
+    }
@@ -0,0 +1,63 @@
+"""Модуль, содержащий тесты колоночного представления задач"""
+import random
+
+from django.test import SimpleTestCase
+
+from user.analytic.clients.yougile_client.schemas import Task
+from user.analytic.indexes.task_columns import TaskColumns
+
+
+class TestTaskColumns(SimpleTestCase):
+    """Тесты колоночного представления задач"""
+
+    def setUp(self):
+        rng = random.Random(0)
+        employers = [f"employee {i}" for i in range(20)]
+        self.tasks = [
+            Task(completed=rng.random() < 0.5, assigned=rng.sample(employers, rng.randint(0, 3)))
+            for _ in range(500)
+        ]
+        self.tasks.append(Task(completed=True, assigned="employee 0"))
+        self.tasks.append(Task(completed=False, assigned=["employee 1", "employee 1"]))
+        self.columns = TaskColumns.from_tasks(self.tasks)
+
+    def count(self, ref_id: str, completed: bool | None = None) -> int:
+        """Метод подсчета задач исполнителя по списку задач"""
+        return sum(
+            ref_id in ([task.assigned] if isinstance(task.assigned, str) else set(task.assigned))
+            and completed in (None, task.completed)
+            for task in self.tasks
+        )
+
+    def test_counts_match_scan(self):
+        """Проверяет, что векторный подсчет совпадает с проходом по задачам"""
+        ref_ids = [f"employee {i}" for i in range(21)]
+        self.assertEqual(
+            self.columns.count_for(ref_ids, self.columns.completed),
+            {ref_id: self.count(ref_id, completed=True) for ref_id in ref_ids},
+        )
+        self.assertEqual(
+            self.columns.count_for(ref_ids),
+            {ref_id: self.count(ref_id) for ref_id in ref_ids},
+        )
+
+    def test_rows(self):
+        """Проверяет строки задач исполнителя"""
+        columns = TaskColumns.from_tasks([
+            Task(completed=True, assigned=["employee 0", "employee 1"]),
+            Task(completed=False, assigned=["employee 1"]),
+            Task(completed=False, assigned="employee 0"),
+            Task(completed=True, assigned=[]),
+            Task(completed=True, assigned=["employee 0", "employee 0"]),
+        ])
+        rows = columns.get_rows("employee 0")
+        self.assertEqual(rows.tolist(), [0, 2, 4])
+        self.assertEqual(columns.completed[rows].tolist(), [True, False, True])
+        self.assertEqual(columns.get_rows("employee 1").tolist(), [0, 1])
+        self.assertEqual(columns.get_rows("unknown").tolist(), [])
+
+    def test_empty(self):
+        """Проверяет представление пустого списка задач"""
+        columns = TaskColumns.from_tasks([])
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(columns.count_for(["employee 0"], columns.completed), {"employee 0": 0})
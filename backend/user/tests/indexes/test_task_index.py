@@ -0,0 +1,78 @@
+"""Модуль, содержащий тесты индекса задач"""
+import time
+from unittest.mock import patch
+
+from user.analytic.clients.redis_client import background_refresher
+from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.indexes.task_index import TaskIndex, AssigneeTaskCounters
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+from user.tests.clients.yougile_test_pack import make_tasks_response
+
+
+class TestTaskIndex(FakeRedisTestCase):
+    """Тесты индекса задач проекта"""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(
+            YouGileClient, "_get_tasks",
+            side_effect=lambda **kwargs: make_tasks_response(
+                kwargs["limit"], kwargs["offset"], count=120,
+            ),
+        )
+        self.get_tasks = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.index = TaskIndex(YouGileClient("token"))
+
+    def test_counters(self):
+        """Проверяет счетчики, построенные за один проход по задачам"""
+        self.assertEqual(
+            self.index.get_many(["employee 0", "employee 1", "unknown"]),
+            {
+                "employee 0": AssigneeTaskCounters(completed=20, open=20, total=40),
+                "employee 1": AssigneeTaskCounters(completed=20, open=20, total=40),
+                "unknown": AssigneeTaskCounters(),
+            },
+        )
+        self.assertEqual(self.get_tasks.call_count, 3)
+
+    def test_key_by_project(self):
+        """Проверяет, что у проектов с общим токеном разные индексы"""
+        first = TaskIndex(YouGileClient("token", project_id=1))
+        second = TaskIndex(YouGileClient("token", project_id=2))
+        self.assertTrue(first.key.startswith("task-index:project:1:"))
+        self.assertNotEqual(first.key, second.key)
+        first.build()
+        self.assertTrue(self.redis_client.exists(first.key))
+        self.assertFalse(self.redis_client.exists(second.key))
+
+    def test_read_is_single_command(self):
+        """Проверяет, что чтение построенного индекса - одна команда Redis"""
+        self.index.build()
+        with patch.object(
+                self.redis_client, "execute_command", wraps=self.redis_client.execute_command,
+        ) as execute_command:
+            self.assertEqual(self.index.get("employee 2").total, 40)
+        self.assertEqual([call.args[0] for call in execute_command.call_args_list], ["HMGET"])
+
+    def test_stale_index_is_refreshed_in_background(self):
+        """Проверяет, что устаревший индекс отдается и перестраивается в фоне"""
+        self.index.build()
+        with patch("time.time", return_value=time.time() + self.index.life_time + 1), \
+                patch.object(background_refresher, "submit") as submit:
+            self.assertEqual(self.index.get("employee 0").completed, 20)
+        submit.assert_called_once()
+
+    async def test_async_read(self):
+        """Проверяет, что асинхронное чтение совпадает с синхронным и строит отсутствующий индекс"""
+        index = await TaskIndex.aopen(YouGileClient("token"))
+        self.assertEqual(index.key, self.index.key)
+        self.assertEqual(
+            await index.aget_many(["employee 0", "unknown"]),
+            {
+                "employee 0": AssigneeTaskCounters(completed=20, open=20, total=40),
+                "unknown": AssigneeTaskCounters(),
+            },
+        )
+        self.assertEqual((await index.aget("employee 1")).total, 40)
+        self.assertEqual(self.get_tasks.call_count, 3)
@@ -0,0 +1,156 @@
+"""Модуль, содержащий тесты очереди фоновых задач"""
+from functools import partial
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+
+from user.analytic.clients.yougile_client import YouGileClient, schemas
+from user.factories import ProjectFactory
+from user.jobs import JobQueue, JobStatus, job_queue, enqueue_sync_employers, enqueue_sync_project
+from user.jobs.backends import LocalJobBackend, RedisJobBackend
+from user.models import Employee, YouGileTypeService
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+
+
+class TestJobQueue(SimpleTestCase):
+    """Тесты очереди фоновых задач"""
+
+    def setUp(self):
+        self.queue = JobQueue(LocalJobBackend())
+
+        @self.queue.register("add")
+        def add(progress, left, right):
+            progress(step=1)
+            return {"sum": left + right}
+
+        @self.queue.register("fail")
+        def fail(progress):
+            raise ValueError("broken")
+
+    def test_run(self):
+        """Проверяет выполнение задачи и сохранение ее состояния"""
+        job = self.queue.enqueue("add", left=1, right=2)
+        self.assertEqual(self.queue.get(job.id).status, JobStatus.QUEUED)
+        self.assertEqual(self.queue.work(burst=True), 1)
+        job = self.queue.get(job.id)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.progress, {"step": 1})
+        self.assertEqual(job.result, {"sum": 3})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure(self):
+        """Проверяет, что ошибка обработчика сохраняется в задаче"""
+        job = self.queue.enqueue("fail")
+        with self.assertLogs("user.jobs.queue", "ERROR"):
+            self.queue.work(burst=True)
+        job = self.queue.get(job.id)
+        self.assertEqual(job.status, JobStatus.FAILED)
+        self.assertEqual(job.error, "ValueError: broken")
+
+    def test_coalesce(self):
+        """Проверяет объединение одинаковых задач, пока первая не завершилась"""
+        add = partial(self.queue.enqueue, "add", left=1, right=2)
+        first = add(coalesce_key="key")
+        self.assertEqual(add(coalesce_key="key").id, first.id)
+        self.assertNotEqual(add(coalesce_key="other").id, first.id)
+        self.assertEqual(self.queue.work(burst=True), 2)
+        self.assertNotEqual(add(coalesce_key="key").id, first.id)
+
+    def test_coalesce_during_save(self):
+        """Проверяет, что постановка во время сохранения первой задачи не создает дубль"""
+        nested = []
+        save = self.queue.save
+
+        def save_and_enqueue(job):
+            save(job)
+            if not nested:
+                nested.append(None)
+                nested[0] = self.queue.enqueue("add", coalesce_key="key", left=1, right=2)
+
+        with patch.object(self.queue, "save", side_effect=save_and_enqueue):
+            first = self.queue.enqueue("add", coalesce_key="key", left=1, right=2)
+        self.assertEqual(nested[0].id, first.id)
+        self.assertEqual(self.queue.work(burst=True), 1)
+
+    def test_eager(self):
+        """Проверяет выполнение задачи при постановке без воркера"""
+        queue = JobQueue(LocalJobBackend(), eager=True)
+        queue.register("add")(lambda progress, left, right: {"sum": left + right})
+        job = queue.enqueue("add", left=1, right=2)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(queue.get(job.id).result, {"sum": 3})
+        self.assertEqual(queue.work(burst=True), 0)
+
+    def test_unknown_handler(self):
+        """Проверяет отказ ставить задачу без обработчика"""
+        with self.assertRaises(KeyError):
+            self.queue.enqueue("unknown")
+
+
+class TestRedisJobBackend(FakeRedisTestCase):
+    """Тесты хранилища задач в Redis"""
+
+    def test_queue(self):
+        """Проверяет очередь и состояние задач в Redis"""
+        backend = RedisJobBackend()
+        backend.save("job", "data")
+        backend.push("job")
+        self.assertEqual(backend.load("job"), "data")
+        self.assertEqual(backend.pop(0), "job")
+        self.assertIsNone(backend.pop(0))
+
+    def test_claim(self):
+        """Проверяет закрепление ключа объединения"""
+        backend = RedisJobBackend()
+        self.assertIsNone(backend.claim("key", "first"))
+        self.assertEqual(backend.claim("key", "second"), "first")
+        backend.release("key", "second")
+        self.assertEqual(backend.claim("key", "second"), "first")
+        backend.release("key", "first")
+        self.assertIsNone(backend.claim("key", "second"))
+
+
+class TestSyncEmployersJob(TestCase):
+    """Тесты фоновых задач синхронизации"""
+
+    def setUp(self):
+        patcher = patch.object(job_queue, "backend", LocalJobBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sync_employers(self):
+        """Проверяет синхронизацию сотрудников фоновой задачей"""
+        project = ProjectFactory()
+        page = schemas.paginated(schemas.Employee)(**{
+            "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+            "content": [
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+            ],
+        })
+        job = enqueue_sync_employers(project)
+        self.assertEqual(enqueue_sync_employers(project).id, job.id)
+        with patch.object(YouGileClient, "get_employers", return_value=page):
+            job_queue.work(burst=True)
+        job = job_queue.get(job.id)
+        self.assertEqual(job.status, JobStatus.SUCCEEDED)
+        self.assertEqual(job.progress["batches"], 1)
+        self.assertEqual(job.result, {"inserted": 1, "updated": 0, "unchanged": 0, "skipped": 0})
+        self.assertEqual(Employee.objects.get().project, project)
+
+    def test_sync_project_invalidates_changed_project(self):
+        """Проверяет, что кэш проекта сбрасывается, только если сотрудники изменились"""
+        project = ProjectFactory()
+        page = schemas.paginated(schemas.Employee)(**{
+            "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+            "content": [
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+            ],
+        })
+        with patch.object(YouGileClient, "get_employers", return_value=page), \
+                patch.object(YouGileTypeService, "refresh_tasks") as refresh_tasks, \
+                patch("user.jobs.sync.invalidate_project") as invalidate:
+            for _ in range(2):
+                enqueue_sync_project(project.id)
+                job_queue.work(burst=True)
+        invalidate.assert_called_once_with(project)
+        self.assertEqual(refresh_tasks.call_count, 2)
@@ -0,0 +1,86 @@
+"""Модуль, содержащий тесты планировщика синхронизации проектов"""
+from unittest.mock import patch, Mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+from django.utils import timezone
+
+from user.factories import ProjectFactory
+from user.jobs import ProjectSyncScheduler, job_queue, get_scheduler_stats
+from user.jobs.backends import LocalJobBackend
+from user.models import Project, EmployeesSyncReport
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+
+
+class TestProjectSyncScheduler(TestCase):
+    """Тесты планировщика синхронизации проектов"""
+
+    def setUp(self):
+        self.now = 1000.0
+        for patcher in [
+            patch.object(job_queue, "backend", LocalJobBackend()),
+            patch.object(Project, "type_service", Mock(**{
+                "update_employers.return_value": EmployeesSyncReport(),
+            })),
+            patch("user.jobs.sync.invalidate_project"),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.scheduler = ProjectSyncScheduler(max_concurrency=2, jitter=0, clock=lambda: self.now)
+
+    def test_concurrency_and_priority(self):
+        """Проверяет ограничение одновременных синхронизаций и приоритет недавних проектов"""
+        first, second = ProjectFactory.create_batch(2)
+        active = ProjectFactory(last_accessed_at=timezone.now())
+        self.assertEqual(self.scheduler.tick()[0], active.id)
+        self.assertEqual(self.scheduler.stats.running, 2)
+        self.assertEqual(self.scheduler.stats.deferred, 1)
+
+        self.now += 1
+        self.assertEqual(self.scheduler.tick(), [])
+        job_queue.work(burst=True)
+        self.now += 1
+        self.assertEqual(self.scheduler.tick(), [second.id])
+        self.assertEqual(self.scheduler.stats.succeeded, 2)
+        self.assertEqual(self.scheduler.stats.lag, 2)
+        self.assertEqual(set(self.scheduler.stats.durations), {active.id, first.id})
+
+    def test_intervals(self):
+        """Проверяет повторную синхронизацию по интервалу проекта"""
+        project = ProjectFactory(sync_interval=30)
+        self.assertEqual(self.scheduler.tick(), [project.id])
+        job_queue.work(burst=True)
+        self.now += 29
+        self.assertEqual(self.scheduler.tick(), [])
+        self.now += 1
+        self.assertEqual(self.scheduler.tick(), [project.id])
+
+    def test_get_interval(self):
+        """Проверяет выбор интервала по последнему обращению к проекту"""
+        with patch("user.jobs.scheduler.SCHEDULER_ACTIVE_INTERVAL", 10), \
+                patch("user.jobs.scheduler.SCHEDULER_IDLE_INTERVAL", 100):
+            self.assertEqual(self.scheduler.get_interval(Project(sync_interval=5)), 5)
+            active = Project(last_accessed_at=timezone.now())
+            self.assertEqual(self.scheduler.get_interval(active), 10)
+            self.assertEqual(self.scheduler.get_interval(Project()), 100)
+
+    def test_run_survives_failed_tick(self):
+        """Проверяет, что ошибка прохода не останавливает планировщик"""
+        with patch.object(self.scheduler, "tick", side_effect=[DatabaseError, []]) as tick, \
+                patch.object(self.scheduler, "publish_stats"), \
+                patch("time.sleep"), \
+                self.assertLogs("user.jobs.scheduler", "ERROR"):
+            self.scheduler.run(tick=0, ticks=2)
+        self.assertEqual(tick.call_count, 2)
+
+
+class TestSchedulerStats(FakeRedisTestCase):
+    """Тесты метрик планировщика"""
+
+    def test_publish_stats(self):
+        """Проверяет публикацию метрик планировщика"""
+        scheduler = ProjectSyncScheduler()
+        self.assertIsNone(get_scheduler_stats())
+        scheduler.stats.durations[1] = 0.5
+        scheduler.publish_stats()
+        self.assertEqual(get_scheduler_stats(), scheduler.stats)
@@ -0,0 +1,137 @@
+"""Модуль, содержащий тесты аналитических метрик"""
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from user.analytic.clients.yougile_client import YouGileClient
+from user.analytic.metrics import MetricPlanner, metric_registry
+from user.analytic.metrics.base_metric import BaseMetric
+from user.analytic.metrics.count_of_complete_tasks import CountOfCompleteTasks, Employee
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
+from user.tests.clients.yougile_test_pack import make_tasks_response
+
+
+def make_project() -> Mock:
+    """Функция, создающая проект YouGile с клиентом по тестовому токену"""
+    project = Mock(type="Yougile")
+    project.type_service.get_client.return_value = YouGileClient("token")
+    return project
+
+
+class TestCountOfCompleteTasks(FakeRedisTestCase):
+    """Тесты метрики количества выполненных задач"""
+
+    def test_counts_tasks_on_all_pages(self):
+        """Проверяет, что метрика учитывает задачи со всех страниц"""
+        with patch.object(
+                YouGileClient, "_get_tasks",
+                side_effect=lambda **kwargs: make_tasks_response(
+                    kwargs["limit"], kwargs["offset"], count=120,
+                ),
+        ):
+            metric = CountOfCompleteTasks()
+            params = metric.get_yougile_params(
+                YouGileClient("token"), employee=Employee(ref_id="employee 0"),
+            )
+            # Задачи с номерами, кратными 6, выполнены и назначены на employee 0
+            self.assertEqual(metric.calculate(**params), 20)
+
+    def test_batch(self):
+        """Проверяет групповой расчет метрики по всем сотрудникам"""
+        with patch.object(
+                YouGileClient, "_get_tasks",
+                side_effect=lambda **kwargs: make_tasks_response(
+                    kwargs["limit"], kwargs["offset"], count=120,
+                ),
+        ) as get_tasks:
+            employees = [Employee(ref_id=f"employee {i}") for i in range(4)]
+            self.assertEqual(
+                MetricPlanner(make_project(), employees).evaluate([CountOfCompleteTasks]),
+                {"count_of_complete_tasks": {
+                    "employee 0": 20, "employee 1": 20, "employee 2": 20, "employee 3": 0,
+                }},
+            )
+            self.assertEqual(get_tasks.call_count, 3)
+
+    async def test_async(self):
+        """Проверяет асинхронный расчет метрики для сотрудника и группы"""
+        with patch.object(
+                YouGileClient, "_get_tasks",
+                side_effect=lambda **kwargs: make_tasks_response(
+                    kwargs["limit"], kwargs["offset"], count=120,
+                ),
+        ) as get_tasks:
+            project = make_project()
+            employee = Employee(ref_id="employee 0")
+            self.assertEqual(await CountOfCompleteTasks().acall(project, employee=employee), 20)
+            employees = [Employee(ref_id=f"employee {i}") for i in range(2)]
+            self.assertEqual(
+                await MetricPlanner(project, employees).aevaluate([CountOfCompleteTasks]),
+                {"count_of_complete_tasks": {"employee 0": 20, "employee 1": 20}},
+            )
+            self.assertEqual(get_tasks.call_count, 3)
+
+
+class CountOfTasks(BaseMetric):
+    """Тестовая метрика общего количества задач"""
+    NAME = "count_of_tasks"
+    DATASETS = ("tasks",)
+
+    def calculate(self, *args, **kwargs):
+        """Метод расчета метрики для одного сотрудника"""
+
+    # pylint: disable=W0221
+    def calculate_batch(self, employees, tasks) -> dict[str, int]:
+        return {employee.ref_id: len(tasks) for employee in employees}
+
+
+class CountOfAssignedTasks(CountOfTasks):
+    """Тестовая метрика количества задач сотрудника"""
+    NAME = "count_of_assigned_tasks"
+
+    # pylint: disable=W0221
+    def calculate_batch(self, employees, tasks) -> dict[str, int]:
+        return {
+            employee.ref_id: sum(employee.ref_id in task.assigned for task in tasks)
+            for employee in employees
+        }
+
+
+class TestMetricPlanner(SimpleTestCase):
+    """Тесты планировщика расчета метрик"""
+
+    def test_dataset_is_loaded_once(self):
+        """Проверяет, что метрики с общим набором данных загружают его один раз"""
+        with patch.object(
+                YouGileClient, "_get_tasks",
+                side_effect=lambda **kwargs: make_tasks_response(
+                    kwargs["limit"], kwargs["offset"], count=120,
+                ),
+        ) as get_tasks:
+            values = MetricPlanner(make_project(), [Employee(ref_id="employee 1")]).evaluate(
+                [CountOfTasks, CountOfAssignedTasks],
+            )
+        self.assertEqual(values, {
+            "count_of_tasks": {"employee 1": 120},
+            "count_of_assigned_tasks": {"employee 1": 40},
+        })
+        self.assertEqual(get_tasks.call_count, 3)
+
+    def test_registry(self):
+        """Проверяет, что метрики доступны в реестре по имени"""
+        self.assertIs(metric_registry.get("count_of_complete_tasks"), CountOfCompleteTasks)
+        with self.assertRaises(ValueError):
+            metric_registry.register("count_of_complete_tasks")(CountOfTasks)
+
+    def test_registry_rejects_abstract_metric(self):
+        """Проверяет отказ регистрировать метрику без группового расчета"""
+        class Incomplete(BaseMetric):
+            """Метрика без группового расчета"""
+
+            def calculate(self, *args, **kwargs):
+                """Метод расчета метрики для одного сотрудника"""
+
+        with self.assertRaises(ValueError):
+            metric_registry.register("incomplete")(Incomplete)
+        with self.assertRaises(KeyError):
+            metric_registry.get("incomplete")
@@ -0,0 +1,58 @@
+"""Модуль, содержащий тесты использования индексов горячими запросами"""
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+
+from user.factories import ProjectFactory, EmployeeFactory
+from user.models import Project, Employee
+
+
+class TestIndexes(TestCase):
+    """Тесты использования индексов горячими запросами"""
+
+    def setUp(self):
+        self.project = ProjectFactory()
+        Employee.objects.bulk_create(
+            EmployeeFactory.build(project=self.project) for _ in range(500)
+        )
+        EmployeeFactory.create_batch(3)
+        # На небольших таблицах планировщик всегда выбирает
+        # последовательное чтение, поэтому оно отключается до конца теста
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE user_employee")
+            cursor.execute("ANALYZE user_project")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assert_uses_index(self, queryset: QuerySet, index_name: str):
+        """
+        Метод, проверяющий, что план запроса использует индекс
+
+        Args:
+            queryset: Проверяемый запрос
+            index_name: Имя индекса
+        """
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_sync_lookup(self):
+        """Выборка сохраненных сотрудников при синхронизации"""
+        self.assert_uses_index(
+            Employee.objects
+            .filter(project_id=self.project.id, ref_id__in=["ref_id #1", "ref_id #2"])
+            .values_list('ref_id', 'email', 'name'),
+            'employee_project_ref_id_uniq',
+        )
+
+    def test_employee_list(self):
+        """Страница сотрудников проектов пользователя"""
+        self.assert_uses_index(
+            Employee.objects.filter(project__user_id=self.project.user_id).order_by('id')[:100],
+            'employee_project_id_idx',
+        )
+
+    def test_project_list(self):
+        """Страница проектов пользователя"""
+        self.assert_uses_index(
+            Project.objects.filter(user_id=self.project.user_id).order_by('id')[:100],
+            'project_user_id_idx',
+        )
@@ -1,11 +1,12 @@
 """Модуль, содержащий тесты моделей"""
 from unittest.mock import patch
 
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
 
-from user.analytic.clients.yougile_client import YouGileClient, schemas
+from user.analytic.clients.yougile_client import YouGileClient, AsyncYouGileClient, schemas
 from user.factories import ProjectFactory, EmployeeFactory
-from user.models import Project, Employee, YouGileTypeService, Services
+from user.models import Project, Employee, EmployeesSyncReport, YouGileTypeService, Services
 from user.tests.models.model_assert_pack import BaseModelFieldsTestPack, field_test_pack
 
 
@@ -35,7 +36,15 @@ class TestEmployeeFields(BaseModelFieldsTestPack):
             field_name=field_name,
             expected_max_length=255,
         )
-        self.assert_unique_value(field_name=field_name)
+
+    def test_ref_id_unique_per_project(self):
+        """Проверяет, что ref_id уникален только в пределах проекта"""
+        employee = self.factory(ref_id="non_unique_value")
+        self.factory(ref_id=employee.ref_id)
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                self.factory(ref_id=employee.ref_id, project=employee.project)
+        self.assertEqual(self.model.objects.filter(ref_id=employee.ref_id).count(), 2)
 
     @field_test_pack("name")
     def test_name(self, field_name: str):
@@ -64,6 +73,26 @@ class TestProject(TestCase):
                 project.delete()
 
 
+class TestProjectAccess(TestCase):
+    """Тесты отметки обращения к проекту"""
+
+    def test_mark_accessed(self):
+        """Проверяет, что дата обращения пишется не чаще PROJECT_ACCESS_RESOLUTION"""
+        project = ProjectFactory()
+        with self.assertNumQueries(1):
+            project.mark_accessed()
+        accessed_at = Project.objects.get(id=project.id).last_accessed_at
+        self.assertIsNotNone(accessed_at)
+        with self.assertNumQueries(0):
+            project.mark_accessed()
+        with self.assertNumQueries(1):
+            Project.objects.get(id=project.id).mark_accessed()
+        self.assertEqual(Project.objects.get(id=project.id).last_accessed_at, accessed_at)
+        with patch("user.models.PROJECT_ACCESS_RESOLUTION", 0):
+            project.mark_accessed()
+        self.assertGreater(Project.objects.get(id=project.id).last_accessed_at, accessed_at)
+
+
 # pylint: disable=missing-class-docstring
 class TestYouGileTypeService(TestCase):
 
@@ -103,6 +132,74 @@ class TestYouGileTypeService(TestCase):
             current_project.type_service.update_employers()
             self.assertEqual(Employee.objects.count(), 2)
 
+    def test_update_employers_diff(self):
+        """Проверяет, что синхронизация пишет только новых и изменившихся сотрудников"""
+        project: Project = ProjectFactory()
+        unchanged, changed = EmployeeFactory.create_batch(2, project=project)
+        foreign = EmployeeFactory()
+        page = schemas.paginated(schemas.Employee)(**{
+            "paging": {"count": 5, "limit": 50, "offset": 0, "next": False},
+            "content": [
+                {"id": unchanged.ref_id, "email": unchanged.email, "realName": unchanged.name},
+                {"id": changed.ref_id, "email": changed.email, "realName": "Renamed"},
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+                {"id": foreign.ref_id, "email": foreign.email, "realName": "Shared"},
+            ],
+        })
+        with patch.object(YouGileClient, "get_employers", return_value=page):
+            # Точка сохранения транзакции, выборка и upsert на каждую пачку
+            with self.assertNumQueries(8):
+                report = project.type_service.update_employers(batch_size=3)
+        self.assertEqual(
+            report, EmployeesSyncReport(inserted=2, updated=1, unchanged=1, skipped=1),
+        )
+        self.assertEqual(Employee.objects.get(ref_id=changed.ref_id).name, "Renamed")
+        self.assertEqual(Employee.objects.get(id=foreign.id).name, foreign.name)
+        shared = Employee.objects.get(ref_id=foreign.ref_id, project=project)
+        self.assertEqual(shared.name, "Shared")
+        self.assertEqual(Employee.objects.get(ref_id="fake_id").project, project)
+
+        with patch.object(YouGileClient, "get_employers", return_value=page):
+            with self.assertNumQueries(3):
+                report = project.type_service.update_employers()
+        self.assertEqual(report, EmployeesSyncReport(unchanged=4, skipped=1))
+
+    def test_update_employers_fetches_outside_transaction(self):
+        """Проверяет, что страницы сервиса запрашиваются вне транзакции записи пачки"""
+        project: Project = ProjectFactory()
+        page = schemas.paginated(schemas.Employee)(**{
+            "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+            "content": [
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+            ],
+        })
+        depth = len(connection.savepoint_ids)
+        depths = []
+
+        def get_employers(**_):
+            depths.append(len(connection.savepoint_ids))
+            return page
+
+        with patch.object(YouGileClient, "get_employers", side_effect=get_employers):
+            project.type_service.update_employers()
+        self.assertEqual(depths, [depth])
+        self.assertEqual(Employee.objects.get().ref_id, "fake_id")
+
+    def test_update_employers_async_pagination(self):
+        """Проверяет обновление сотрудников через асинхронную пагинацию"""
+        project: Project = ProjectFactory()
+        page = schemas.paginated(schemas.Employee)(**{
+            "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+            "content": [
+                {"id": "fake_id", "email": "fake_email@mail.ru", "realName": "Fake George"},
+            ],
+        })
+        with patch("user.models.YOUGILE_ASYNC_PAGINATION", True), \
+                patch.object(AsyncYouGileClient, "get_employers_pages", return_value=[page]):
+            project.type_service.update_employers()
+        self.assertEqual(Employee.objects.get().ref_id, "fake_id")
+
     def test_get_client(self):
         """Проверяет возможность получить клиент"""
         project = ProjectFactory()
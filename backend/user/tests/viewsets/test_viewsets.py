@@ -1,13 +1,24 @@
+import asyncio
 from unittest.mock import patch, Mock
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework.viewsets import ModelViewSet
 
+from user.analytic.clients.circuit_breaker import CircuitOpen
+from user.analytic.clients.rate_limiter import RateLimitExceeded
+from user.analytic.clients.staleness import mark_stale
+from user.analytic.metrics import MetricPlanner
 from user.analytic.metrics.count_of_complete_tasks import CountOfCompleteTasks
 from user.factories import UserFactory, ProjectFactory, EmployeeFactory
+from user.jobs import job_queue
+from user.jobs.backends import LocalJobBackend
 from user.models import Project, ExplicitModel
 from user.serializers import ProjectSerializer
+from user.tests.clients.redis_test_pack import FakeRedisTestCase
 from user.views import ProjectViewSet, UserViewSet, EmployeeViewSet
 
 
@@ -20,12 +31,111 @@ class TestEmployeeViewSet(APITestCase):
     def test_count_of_complete_tasks(self):
         response_value = 18
         employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
         with patch.object(self.viewset, 'get_permissions', return_value=[]):
-            with patch.object(CountOfCompleteTasks, '__call__', return_value=response_value):
+            with patch.object(CountOfCompleteTasks, 'acall', return_value=response_value):
                 response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
                 self.assertEqual(response.status_code, 200)
                 self.assertEqual(response.data, response_value)
 
+    def test_rate_limit_exceeded(self):
+        """Проверяет ответ 429 с Retry-After при исчерпании лимита запросов"""
+        employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        with patch.object(self.viewset, 'get_permissions', return_value=[]):
+            with patch.object(
+                    CountOfCompleteTasks, 'acall', side_effect=RateLimitExceeded("key", 2.5),
+            ):
+                response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
+                self.assertEqual(response.status_code, 429)
+                self.assertEqual(response['Retry-After'], '3')
+
+    def test_circuit_open(self):
+        """Проверяет ответ 503 с Retry-After при разомкнутом выключателе"""
+        employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        with patch.object(self.viewset, 'get_permissions', return_value=[]):
+            with patch.object(CountOfCompleteTasks, 'acall', side_effect=CircuitOpen("key", 2.5)):
+                response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response['Retry-After'], '3')
+
+    def test_stale_data_marker(self):
+        """Проверяет пометку ответа из устаревшего кэша заголовками"""
+        employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        with patch.object(self.viewset, 'get_permissions', return_value=[]):
+            with patch.object(
+                    CountOfCompleteTasks, 'acall', side_effect=lambda **kwargs: mark_stale(90.5),
+            ):
+                response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
+                self.assertEqual(response['X-Data-Stale-Age'], '91')
+                self.assertIn('Warning', response)
+            with patch.object(CountOfCompleteTasks, 'acall', return_value=1):
+                response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
+                self.assertNotIn('X-Data-Stale-Age', response)
+
+    def test_query_counts(self):
+        """Проверяет количество запросов к базе при чтении сотрудников"""
+        employee = self.factory()
+        self.factory(project=employee.project)
+        foreign = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.link)
+            self.assertEqual(len(response.data['results']), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f"{self.link}{employee.id}/").status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f"{self.link}{foreign.id}/").status_code, 404)
+        employee.project.mark_accessed()
+        with patch.object(CountOfCompleteTasks, 'acall', return_value=1):
+            with self.assertNumQueries(1):
+                response = self.client.get(f"{self.link}{employee.id}/count_of_complete_tasks/")
+                self.assertEqual(response.status_code, 200)
+
+    def test_async_routes(self):
+        """Проверяет, что только маршруты действий-корутин становятся асинхронными"""
+        self.assertTrue(asyncio.iscoroutinefunction(
+            self.viewset.as_view({'get': 'count_of_complete_tasks'}),
+        ))
+        self.assertFalse(asyncio.iscoroutinefunction(self.viewset.as_view({'get': 'list'})))
+        employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        response = self.client.post(f"{self.link}{employee.id}/count_of_complete_tasks/")
+        self.assertEqual(response.status_code, 405)
+
+    def test_cursor_pagination(self):
+        """Проверяет обход списка курсорной пагинацией"""
+        project = ProjectFactory()
+        employees = self.factory.create_batch(5, project=project)
+        self.factory()
+        self.client.force_authenticate(project.user)
+        ids, link = [], f"{self.link}?page_size=2"
+        while link:
+            with self.assertNumQueries(1):
+                response = self.client.get(link)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids += [item['id'] for item in response.data['results']]
+            link = response.data['next']
+        self.assertEqual(ids, [employee.id for employee in employees])
+
+    def test_sparse_fieldset(self):
+        """Проверяет выборку только запрошенных полей"""
+        employee = self.factory()
+        self.client.force_authenticate(employee.project.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"{self.link}?fields=id,name")
+        self.assertEqual(response.data['results'], [{'id': employee.id, 'name': employee.name}])
+        columns = queries[0]['sql'].split(' FROM ')[0]
+        self.assertIn('"name"', columns)
+        self.assertNotIn('"email"', columns)
+        self.assertNotIn('"user_project"', columns)
+        response = self.client.get(f"{self.link}{employee.id}/?fields=email")
+        self.assertEqual(response.data, {'email': employee.email})
+        response = self.client.get(f"{self.link}?fields=id,unknown")
+        self.assertEqual(response.status_code, 400)
+
 
 # pylint: disable=missing-class-docstring
 class TestProjectViewSet(APITestCase):
@@ -47,16 +157,78 @@ class TestProjectViewSet(APITestCase):
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
             self.assertEqual(self.model.objects.count(), 1)
 
+    def test_metrics(self):
+        """Проверяет групповой расчет метрик по сотрудникам проекта"""
+        project = self.factory()
+        self.client.force_authenticate(project.user)
+        employees = EmployeeFactory.create_batch(3, project=project)
+        EmployeeFactory()
+        values = {employee.ref_id: i for i, employee in enumerate(employees)}
+        with patch.object(self.viewset, 'get_permissions', return_value=[]):
+            with patch.object(
+                    MetricPlanner, 'aevaluate', return_value={'count_of_complete_tasks': values},
+            ) as evaluate:
+                response = self.client.get(
+                    f"{self.link}{project.id}/metrics/?names=count_of_complete_tasks",
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data, {
+                    employee.id: {'count_of_complete_tasks': i}
+                    for i, employee in enumerate(employees)
+                })
+                evaluate.assert_called_once()
+                response = self.client.get(f"{self.link}{project.id}/metrics/?names=unknown")
+                self.assertEqual(response.status_code, 400)
+
     def test_update_employers(self):
         project = self.factory()
-        with patch.object(self.model, 'type_service', return_value=Mock()):
-            with patch.object(self.viewset, 'get_permissions', return_value=[]):
-                response = self.client.get(f"{self.link}{project.id}/update_employers/")
+        self.client.force_authenticate(project.user)
+        with patch.object(job_queue, 'backend', LocalJobBackend()):
+            with patch.object(self.model, 'type_service', return_value=Mock()):
+                with patch.object(self.viewset, 'get_permissions', return_value=[]):
+                    response = self.client.get(f"{self.link}{project.id}/update_employers/")
+                    self.assertEqual(response.status_code, 202)
+                    self.assertEqual(response.data['status'], 'queued')
+                    job_id = response.data['id']
+
+                    response = self.client.get(f"{self.link}{project.id}/update_employers/")
+                    self.assertEqual(response.data['id'], job_id)
+
+                    response = self.client.get(f"{self.link}{project.id}/jobs/{job_id}/")
+                    self.assertEqual(response.status_code, 200)
+                    self.assertEqual(response.data['payload'], {'project_id': project.id})
+
+                    other = self.factory()
+                    response = self.client.get(f"{self.link}{other.id}/jobs/{job_id}/")
+                    self.assertEqual(response.status_code, 404)
+
+    def test_query_counts(self):
+        """Проверяет количество запросов к базе при чтении проектов"""
+        project = self.factory(last_accessed_at=timezone.now())
+        employees = EmployeeFactory.create_batch(2, project=project)
+        self.factory(user=project.user)
+        self.factory()
+        self.client.force_authenticate(project.user)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.link)
+            self.assertEqual(len(response.data['results']), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f"{self.link}{project.id}/").status_code, 200)
+        values = {'count_of_complete_tasks': {employee.ref_id: 1 for employee in employees}}
+        link = f"{self.link}{project.id}/"
+        with patch.object(MetricPlanner, 'aevaluate', return_value=values):
+            with self.assertNumQueries(2):
+                response = self.client.get(f"{link}metrics/?names=count_of_complete_tasks")
                 self.assertEqual(response.status_code, 200)
+        with patch.object(job_queue, 'backend', LocalJobBackend()):
+            with self.assertNumQueries(1):
+                job_id = self.client.get(f"{link}update_employers/").data['id']
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get(f"{link}jobs/{job_id}/").status_code, 200)
 
 
 # pylint: disable=missing-class-docstring
-class TestUserViewSet(APITestCase):
+class TestUserViewSet(FakeRedisTestCase, APITestCase):
     viewset = UserViewSet
 
     def test_student_login(self):
@@ -99,3 +271,14 @@ class TestUserViewSet(APITestCase):
         response = self.client.post('/api/v1/user/logout/', form_data, format='json',
                                     headers={"Authorization": f"Token {user.auth_token}"})
         self.assertEqual(response.status_code, 401)
+
+    def test_query_counts(self):
+        """Проверяет количество запросов к базе при чтении пользователей"""
+        user = UserFactory()
+        UserFactory()
+        self.client.force_authenticate(user)  # pylint: disable=E1101
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/user/')
+            self.assertEqual([item['username'] for item in response.data], [user.username])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f'/api/v1/user/{user.id}/').status_code, 200)
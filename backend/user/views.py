@@ -1,21 +1,130 @@
 """Модуль, содержащий viewsers данного проекта"""
+import asyncio
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.utils.decorators import classonlymethod
 from rest_framework import viewsets
 from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 from rest_framework.decorators import action
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated, SAFE_METHODS
 from rest_framework.response import Response
 
+from user.analytic.clients.redis_client import invalidate_project
+from user.analytic.metrics import metric_registry, MetricPlanner
 from user.analytic.metrics.count_of_complete_tasks import CountOfCompleteTasks
+from user.jobs import job_queue, enqueue_sync_employers
 from user.models import Employee, User, Project
+from user.pagination import IdCursorPagination
 from user.permissions import IsYourEmployeePermission, IsYourProjectPermission
 from user.serializers import EmployeeSerializer, UserSerializer, ProjectSerializer
 
 
+class SparseFieldsetMixin:
+    """
+    Примесь viewset, поддерживающая параметр fields
+
+    Note:
+        В параметре fields через запятую перечисляются поля,
+        которые нужно отдать. Сериализатор отдает только их,
+        а список загружает из базы только их колонки.
+        Запросы на запись параметр не учитывают
+    """
+
+    def get_sparse_fields(self) -> tuple[str, ...] | None:
+        """Метод получения запрошенных полей, None - все поля"""
+        param = self.request.query_params.get('fields')
+        if not param or self.request.method not in SAFE_METHODS:
+            return None
+        fields = tuple(dict.fromkeys(name for name in param.split(',') if name))
+        unknown = set(fields) - set(self.get_serializer_class()().fields)
+        if unknown:
+            raise ValidationError({'fields': [f"Неизвестные поля: {', '.join(sorted(unknown))}"]})
+        return fields
+
+    def filter_queryset(self, queryset):
+        """Список загружает только колонки запрошенных полей"""
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields is None or self.action != 'list':
+            return queryset
+        return queryset.select_related(None).only(*fields)
+
+    def get_serializer(self, *args, **kwargs):
+        """Сериализатор отдает только запрошенные поля"""
+        kwargs.setdefault('fields', self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class AsyncActionsMixin:
+    """
+    Примесь viewset, позволяющая объявлять действия корутинами
+
+    Note:
+        Маршрут, действие которого - корутина, становится
+        асинхронным представлением Django: под ASGI ожидание
+        внешних сервисов не занимает поток. Аутентификация
+        и проверка прав выполняются в пуле потоков, синхронные
+        действия на таком маршруте - тоже
+
+    Attributes:
+        async_route: Обслуживает ли экземпляр асинхронный маршрут
+    """
+    async_route = False
+
+    @classonlymethod
+    def as_view(cls, actions=None, **initkwargs):
+        """Метод создания представления маршрута"""
+        names = (actions or {}).values()
+        if not any(asyncio.iscoroutinefunction(getattr(cls, name)) for name in names):
+            return super().as_view(actions, **initkwargs)
+        view = super().as_view(actions, async_route=True, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        return update_wrapper(async_view, view)
+
+    def dispatch(self, request, *args, **kwargs):
+        """Метод обработки запроса, на асинхронном маршруте возвращающий корутину"""
+        if self.async_route:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        """Асинхронный аналог dispatch"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = self.http_method_not_allowed
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:  # pylint: disable=W0718
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
 # pylint: disable=C0115
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
 
+    def get_queryset(self):
+        """Пользователю доступна только его учетная запись"""
+        return super().get_queryset().filter(id=self.request.user.id)
+
     def get_serializer_class(self):
         """
         Определяет сериализатор в зависимости от метода
@@ -61,10 +170,23 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response({'message': 'Logged out successfully'}, status=204)
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(AsyncActionsMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsYourEmployeePermission]
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        """
+        Пользователю доступны только сотрудники его проектов
+
+        Note:
+            Проект загружается тем же запросом, он нужен
+            и для проверки прав, и для расчета метрик
+        """
+        return super().get_queryset()\
+            .filter(project__user_id=self.request.user.id)\
+            .select_related('project')
 
     # @swagger_auto_schema(
     #     query_serializer=None,
@@ -85,24 +207,90 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     # )
     # pylint: disable=W0613
     @action(detail=True, methods=['get'])
-    def count_of_complete_tasks(self, request, pk=None):
+    async def count_of_complete_tasks(self, request, pk=None):
         """Метод расчета метрики количества выполненных сотрудником задач"""
-        employee = self.get_object()
-        return Response(CountOfCompleteTasks()(
+        employee = await sync_to_async(self.get_object)()
+        await sync_to_async(employee.project.mark_accessed)()
+        return Response(await CountOfCompleteTasks().acall(
             project=employee.project,
             employee=employee
         ))
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(AsyncActionsMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsYourProjectPermission]
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        """Пользователю доступны только его проекты"""
+        return super().get_queryset().filter(user_id=self.request.user.id)
+
+    def perform_update(self, serializer):
+        """
+        Метод сохранения изменений проекта
+
+        Note:
+            При смене токена кэш проекта инвалидируется
+        """
+        token = serializer.instance.token
+        project = serializer.save()
+        if project.token != token:
+            invalidate_project(project)
 
     # pylint: disable=W0613
     @action(detail=True, methods=['get'])
-    def update_employers(self, request, pk=None):
-        """Метод обновления сотрудников проекта"""
+    async def update_employers(self, request, pk=None):
+        """
+        Метод обновления сотрудников проекта
+
+        Note:
+            Синхронизация ставится в очередь фоновых задач,
+            в ответе - поставленная задача. Повторный запрос,
+            пока синхронизация не завершилась, вернет ту же задачу
+        """
+        project = await sync_to_async(self.get_object)()
+        job = await sync_to_async(enqueue_sync_employers)(project)
+        return Response(job.model_dump(mode='json'), status=202)
+
+    # pylint: disable=W0613
+    @action(detail=True, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9a-f]+)')
+    def jobs(self, request, pk=None, job_id=None):
+        """Метод получения состояния фоновой задачи проекта"""
         project = self.get_object()
-        project.type_service.update_employers()
-        return Response("Success!!!")
+        job = job_queue.get(job_id)
+        if job is None or job.payload.get('project_id') != project.id:
+            raise NotFound()
+        return Response(job.model_dump(mode='json'))
+
+    # pylint: disable=W0613
+    @action(detail=True, methods=['get'])
+    async def metrics(self, request, pk=None):
+        """
+        Метод расчета метрик сразу для всех сотрудников проекта
+
+        Note:
+            Метрики перечисляются через запятую в параметре names,
+            по умолчанию рассчитываются все. Ответ - словарь
+            значений метрик по идентификаторам сотрудников
+        """
+        project = await sync_to_async(self.get_object)()
+        await sync_to_async(project.mark_accessed)()
+        names = [name for name in request.query_params.get('names', '').split(',') if name]
+        names = names or list(metric_registry)
+        unknown = [name for name in names if name not in metric_registry]
+        if unknown:
+            return Response({'names': [f"Неизвестные метрики: {', '.join(unknown)}"]}, status=400)
+
+        employees = [
+            employee
+            async for employee in Employee.objects.filter(project=project).only('id', 'ref_id')
+        ]
+        values = await MetricPlanner(project, employees).aevaluate(
+            metric_registry.get(name) for name in names
+        )
+        return Response({
+            employee.id: {name: values[name][employee.ref_id] for name in names}
+            for employee in employees
+        })